@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Micro-benchmark of the per-request view dispatch overhead.
+
+Compares the compiled dispatch (view instantiated and decorated once) with the
+per-request one on a no-op resource. The WSGI/routing cost is excluded by
+calling the view function directly within a request context.
+
+Usage::
+
+    python benchmarks/bench_dispatch.py
+"""
+
+import timeit
+
+from flask import Flask
+
+from flask_resources.resources import CollectionResource, ResourceConfig
+
+
+class NoopResource(CollectionResource):
+    """No-op resource."""
+
+    def read(self, *args, **kwargs):
+        """Read."""
+        return 200, {}
+
+
+def make_view(compiled):
+    """Create the item view function of a no-op resource."""
+
+    class Config(ResourceConfig):
+        compiled_dispatch = compiled
+
+    rules = NoopResource(config=Config).create_url_rules("noop")
+    return rules[0]["view_func"]
+
+
+def run(number=20000, repeat=5):
+    """Run the benchmark and print the per-request overhead."""
+    app = Flask(__name__)
+    headers = {"accept": "application/json"}
+    results = {}
+
+    for compiled in (False, True):
+        view = make_view(compiled)
+        with app.test_request_context("/resources/1", headers=headers):
+            timings = timeit.repeat(lambda: view(id="1"), number=number, repeat=repeat)
+        results[compiled] = min(timings) / number * 1e6
+
+    print("per-request dispatch: {:.2f} us".format(results[False]))
+    print("compiled dispatch:    {:.2f} us".format(results[True]))
+    print("speedup:              {:.2f}x".format(results[False] / results[True]))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmark suite of the request/response pipeline.
+
+The views are benchmarked end to end through the Flask test client, and the
+content negotiation, serialization and pagination building on their own.
+Each benchmark is calibrated to run for about 0.2s per round, and the
+results (in seconds per call) are written to a JSON report which can be
+compared with the report of a previous run.
+
+Usage::
+
+    python benchmarks/bench_pipeline.py --output report.json
+    python benchmarks/bench_pipeline.py --compare report.json --threshold 0.1
+    python benchmarks/bench_pipeline.py --filter list_get
+
+With ``--compare``, the exit status is 1 if a benchmark is slower than in the
+given report by more than the threshold (as a fraction of its duration).
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+
+from flask import Flask
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from flask_resources.args.paginate import build_pagination
+from flask_resources.content_negotiation import ContentNegotiator
+from flask_resources.context import resource_requestctx
+from flask_resources.resources import CollectionResource, ResourceConfig
+from flask_resources.serializers import CSVSerializer, JSONSerializer, NDJSONSerializer
+from flask_resources.version import __version__
+
+LIST_SIZES = (10, 100, 1000)
+"""Values of the ``size`` query argument of the list benchmarks."""
+
+ACCEPT_HEADERS = {
+    "browser": "text/html,application/xhtml+xml,application/xml;q=0.9,"
+    "image/webp,*/*;q=0.8",
+    "api": "application/json",
+    "qualities": "application/xml;q=0.9, application/json;q=0.8, text/plain;q=0.5",
+    "wildcard": "*/*",
+}
+"""Realistic ``Accept`` headers of the negotiation benchmarks."""
+
+
+def make_hit(i):
+    """Build a search hit."""
+    return {
+        "id": str(i),
+        "created": "2020-06-17T16:21:22",
+        "metadata": {
+            "title": "Record {}".format(i),
+            "creators": [{"name": "Doe, John"}, {"name": "Doe, Jane"}],
+            "keywords": ["physics", "benchmarks", "flask"],
+            "version": i % 7,
+        },
+    }
+
+
+class BenchResourceConfig(ResourceConfig):
+    """Benchmarked resource configuration."""
+
+    item_route = "/bench/<id>"
+    list_route = "/bench/"
+
+
+class BenchResource(CollectionResource):
+    """Benchmarked in-memory resource."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(BenchResource, self).__init__(config=BenchResourceConfig, *args, **kwargs)
+        self.hits = [make_hit(i) for i in range(max(LIST_SIZES))]
+
+    def search(self):
+        """Search."""
+        request_args = resource_requestctx.request_args
+        size = request_args["size"]
+        return 200, {
+            "hits": {"hits": self.hits[:size], "total": len(self.hits)},
+            "links": request_args["pagination"]["links"],
+        }
+
+    def create(self):
+        """Create."""
+        return 201, resource_requestctx.data
+
+    def read(self, id):
+        """Read."""
+        return 200, self.hits[int(id)]
+
+
+def create_client():
+    """Create a test client of an application serving the resource."""
+    app = Flask(__name__)
+    app.register_blueprint(BenchResource().as_blueprint("bench"))
+    return app.test_client()
+
+
+def view_benchmarks():
+    """Benchmarks of the views, through the test client."""
+    client = create_client()
+    headers = {"accept": "application/json"}
+    post_headers = dict(headers, **{"content-type": "application/json"})
+    body = json.dumps(make_hit(1))
+
+    def request(method, url, **kwargs):
+        def run():
+            response = getattr(client, method)(url, **kwargs)
+            assert response.status_code < 300, response.data
+
+        return run
+
+    benchmarks = {"item_get": request("get", "/bench/1", headers=headers)}
+    for size in LIST_SIZES:
+        benchmarks["list_get[size={}]".format(size)] = request(
+            "get", "/bench/?size={}".format(size), headers=headers
+        )
+    benchmarks["list_post"] = request(
+        "post", "/bench/", data=body, headers=post_headers
+    )
+    return benchmarks
+
+
+def negotiation_benchmarks():
+    """Benchmarks of ``ContentNegotiator.match_by_accept``."""
+    mimetypes = ["application/json", "application/xml"]
+    benchmarks = {}
+    for name, header in ACCEPT_HEADERS.items():
+        accept = parse_accept_header(header, MIMEAccept)
+
+        def run(accept=accept):
+            ContentNegotiator.match_by_accept(
+                mimetypes, accept, default="application/json"
+            )
+
+        benchmarks["match_by_accept[{}]".format(name)] = run
+    return benchmarks
+
+
+def serializer_benchmarks():
+    """Benchmarks of the serializers on large payloads."""
+    serializer = JSONSerializer()
+    csv_serializer = CSVSerializer(
+        ["id", "created", "metadata.title", "metadata.keywords", "metadata.version"]
+    )
+    ndjson_serializer = NDJSONSerializer()
+    hits = [make_hit(i) for i in range(10000)]
+    record = {"id": "1", "metadata": {"hits": hits[:1000]}}
+    return {
+        "serialize_object[1000 nested]": lambda: serializer.serialize_object(record),
+        "serialize_object_list[10000]": lambda: serializer.serialize_object_list(
+            {"hits": {"hits": hits}}
+        ),
+        "serialize_object_list_stream[10000]": lambda: b"".join(
+            serializer.serialize_object_list_stream({"hits": {"hits": hits}})
+        ),
+        "serialize_object_list_stream[10000 csv]": lambda: b"".join(
+            csv_serializer.serialize_object_list_stream(hits)
+        ),
+        "serialize_object_list_stream[10000 ndjson]": lambda: b"".join(
+            ndjson_serializer.serialize_object_list_stream(hits)
+        ),
+    }
+
+
+def pagination_benchmarks():
+    """Benchmarks of ``build_pagination``."""
+    return {
+        "build_pagination[page]": lambda: build_pagination({"page": 3, "size": 25}),
+        "build_pagination[from]": lambda: build_pagination({"from": 51, "size": 25}),
+    }
+
+
+SUITES = (
+    view_benchmarks,
+    negotiation_benchmarks,
+    serializer_benchmarks,
+    pagination_benchmarks,
+)
+"""Factories of the benchmarks, returning maps of names to callables."""
+
+
+def measure(func, repeat, min_time):
+    """Measure a callable, in seconds per call."""
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": repeat,
+        "iterations": number,
+    }
+
+
+def run(name_filter=None, repeat=5, min_time=0.2):
+    """Run the benchmarks and build the report."""
+    results = {}
+    for suite in SUITES:
+        for name, func in suite().items():
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = measure(func, repeat, min_time)
+            print("{:<40} {:>12.2f} us".format(name, results[name]["min"] * 1e6))
+    return {
+        "meta": {
+            "flask_resources": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    """Compare the minimums of two reports and return the regressions."""
+    regressions = []
+    print("\n{:<40} {:>12} {:>12} {:>8}".format("benchmark", "baseline", "current", ""))
+    for name, result in sorted(report["benchmarks"].items()):
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            continue
+        ratio = result["min"] / previous["min"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "SLOWER"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "faster"
+        print(
+            "{:<40} {:>9.2f} us {:>9.2f} us {:>7.2f}x {}".format(
+                name, previous["min"] * 1e6, result["min"] * 1e6, ratio, flag
+            )
+        )
+    return regressions
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="Path of the JSON report to write.")
+    parser.add_argument("--compare", help="Path of a JSON report to compare to.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Tolerated slowdown, as a fraction (default: 0.1).",
+    )
+    parser.add_argument("--filter", help="Only run benchmarks containing this.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of rounds.")
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="Minimum duration of a round."
+    )
+    args = parser.parse_args(argv)
+
+    report = run(args.filter, repeat=args.repeat, min_time=args.min_time)
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            regressions = compare(report, json.load(fp), args.threshold)
+        if regressions:
+            print("\nRegressions: {}".format(", ".join(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Sparse fieldsets.
+
+The ``fields`` query argument is a comma separated list of (dotted) keys,
+e.g. ``?fields=id,metadata.title``. It is parsed into a tree of keys, such as
+``{"id": None, "metadata": {"title": None}}`` where ``None`` selects the whole
+value, and made available as ``resource_requestctx.fields``.
+"""
+
+
+def parse_fields(value):
+    """Parse a ``fields`` query argument into a tree of keys."""
+    tree = {}
+    for path in value.split(","):
+        keys = [key.strip() for key in path.split(".")]
+        if not all(keys):
+            continue
+        node = tree
+        for key in keys[:-1]:
+            child = node.get(key, {})
+            if child is None:
+                # The whole value is already selected.
+                break
+            node = node.setdefault(key, child)
+        else:
+            node[keys[-1]] = None
+    return tree or None
+
+
+def build_fields(request_args):
+    """Parse the ``fields`` request argument, if given."""
+    if request_args.get("fields") is not None:
+        request_args["fields"] = parse_fields(request_args["fields"])
+
+
+def project(obj, fields):
+    """Keep only the selected keys of an object (or of a list of objects)."""
+    if fields is None:
+        return obj
+    if isinstance(obj, dict):
+        return {
+            key: project(obj[key], subfields)
+            for key, subfields in fields.items()
+            if key in obj
+        }
+    if isinstance(obj, (list, tuple)):
+        return [project(item, fields) for item in obj]
+    return obj
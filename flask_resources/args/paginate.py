@@ -9,25 +9,114 @@
 
 from functools import wraps
 
+from flask import current_app, request
+from itsdangerous import BadSignature, URLSafeSerializer
 from webargs import ValidationError as WebargsValidationError
 from webargs import fields, validate
 from webargs.flaskparser import parser
 from werkzeug.exceptions import BadRequest
+from werkzeug.urls import url_encode
 
 from ..errors import SearchPaginationRESTError
 
+CURSOR_SALT = "flask-resources-pagination-cursor"
+
+CURSOR_QUERY_ARGS = ("q", "sort")
+"""Query arguments which the cursors are bound to."""
+
+PAGINATION_ARGS = frozenset(["page", "from", "cursor"])
+"""Query arguments replaced in the pagination links."""
+
+
+def _cursor_serializer():
+    """Get the serializer signing the cursors with the app secret key."""
+    return URLSafeSerializer(current_app.secret_key, salt=CURSOR_SALT)
+
+
+def _cursor_query():
+    """Get the query arguments of the current request bound to its cursors."""
+    return {
+        name: request.args.getlist(name)
+        for name in CURSOR_QUERY_ARGS
+        if name in request.args
+    }
+
+
+def _invalid_cursor(message):
+    """Build the error of an invalid cursor."""
+    return SearchPaginationRESTError(
+        errors={"cursor": [message]},
+        description="Invalid pagination parameters.",
+    )
+
+
+def make_cursor(sort_values):
+    """Make an opaque signed cursor from the sort values of the last hit.
+
+    The cursor is bound to the query and sort of the current request (see
+    ``CURSOR_QUERY_ARGS``), so it cannot be replayed against another query.
+
+    :raises RuntimeError: If the app has no ``SECRET_KEY``.
+    """
+    if not current_app.secret_key:
+        raise RuntimeError("Cursor pagination requires the SECRET_KEY to be set.")
+    return _cursor_serializer().dumps(
+        {"query": _cursor_query(), "search_after": list(sort_values)}
+    )
+
+
+def load_cursor(cursor):
+    """Load the sort values of a cursor, validating its signature and query."""
+    if not current_app.secret_key:
+        raise _invalid_cursor("Cursor pagination is not enabled.")
+    try:
+        payload = _cursor_serializer().loads(cursor)
+    except BadSignature:
+        raise _invalid_cursor("Invalid cursor.")
+    if not isinstance(payload, dict) or payload.get("query") != _cursor_query():
+        raise _invalid_cursor("The cursor does not match the query.")
+    return payload["search_after"]
+
+
+def next_cursor_link(sort_values):
+    """Build the ``next`` link from the sort values of the last hit."""
+    return {"cursor": make_cursor(sort_values)}
+
 
 def build_pagination(request_args):
-    """Build pagination."""
+    """Build pagination.
+
+    Besides the ``page`` and ``from`` offsets, a ``cursor`` (see
+    :func:`make_cursor`) can be given to paginate with the sort values of the
+    last hit of the previous page (i.e. ``search_after``), whose cost does not
+    depend on the depth of the page. In this case the ``next`` link must be
+    built by the resource with :func:`next_cursor_link`.
+    """
     pagination = {}
     if request_args.get("page") and request_args.get("from"):
+        message = (
+            "The query parameters from and page must not be used at the same time."
+        )
         raise SearchPaginationRESTError(
-            messages="The query parameters from and page must not be "
-            "used at the same time.",
+            errors={"page": [message], "from": [message]},
             description="Invalid pagination parameters.",
-            field_names=["page", "from"],
         )
 
+    if request_args.get("cursor"):
+        if request_args.get("page") or request_args.get("from"):
+            message = "The query parameter cursor must not be used with page or from."
+            raise SearchPaginationRESTError(
+                errors={"cursor": [message]},
+                description="Invalid pagination parameters.",
+            )
+        request_args["pagination"] = dict(
+            search_after=load_cursor(request_args["cursor"]),
+            from_idx=0,
+            to_idx=request_args["size"],
+            links=dict(self={"cursor": request_args["cursor"]}),
+        )
+        return
+
     # Default if neither page nor from is specified
     if not (request_args.get("page") or request_args.get("from")):
         request_args["page"] = 1
@@ -59,3 +148,58 @@ def build_pagination(request_args):
 
     # Modify original dict
     request_args["pagination"] = pagination
+
+
+def links_template():
+    """Get the URL template of the pagination links of the current request.
+
+    It is the URL of the current request, with its query arguments other than
+    the pagination ones, to which the pagination arguments of each link are
+    appended. It is computed once per response instead of calling
+    ``url_for`` for each link.
+    """
+    args = [
+        (key, value)
+        for key, value in request.args.items(multi=True)
+        if key not in PAGINATION_ARGS
+    ]
+    if not args:
+        return request.base_url + "?"
+    return "{}?{}&".format(request.base_url, url_encode(args))
+
+
+def build_links(request_args, total=None):
+    """Build the full URLs of the pagination links.
+
+    The ``first`` link is always present. The ``prev`` link is omitted on the
+    first page. If the total number of hits is known, the ``last`` link is
+    added and the ``next`` link is omitted on the last page. With cursor
+    pagination, the ``next`` link is only present if set by the resource
+    (see :func:`next_cursor_link`).
+    """
+    size = request_args["size"]
+    links = dict(request_args["pagination"]["links"])
+    current = links["self"]
+
+    if "page" in current:
+        page = current["page"]
+        links["first"] = {"page": 1}
+        if page <= 1:
+            links.pop("prev", None)
+        if total is not None:
+            last = max(1, -(-total // size))
+            links["last"] = {"page": last}
+            if page >= last:
+                links.pop("next", None)
+    elif "from" in current:
+        from_idx = current["from"]
+        links["first"] = {"from": 1}
+        if from_idx <= 1:
+            links.pop("prev", None)
+        if total is not None:
+            links["last"] = {"from": max(0, total - 1) // size * size + 1}
+            if from_idx - 1 + size >= total:
+                links.pop("next", None)
+
+    template = links_template()
+    return {name: template + url_encode(args) for name, args in links.items()}
@@ -7,27 +7,141 @@
 
 """Library for easily implementing REST APIs."""
 
+import threading
+
 from flask import request
+from marshmallow import missing
 from marshmallow.validate import Range, Regexp
+from webargs import dict2schema
 from webargs.fields import Int, String
 from webargs.flaskparser import parser
 
+from flask_resources.args.fields import build_fields
 from flask_resources.args.paginate import build_pagination
 
+FAST_LOCATIONS = {
+    "querystring": lambda: request.args,
+    "query": lambda: request.args,
+    "view_args": lambda: request.view_args or {},
+}
+"""Locations supported by the fast path, and how to get their values."""
+
+
+def _string(value):
+    """Check that a value is a string."""
+    if not isinstance(value, str):
+        raise TypeError()
+    return value
+
+
+def compile_fast_field(name, field):
+    """Compile a primitive field for the fast path.
+
+    Only non-strict ``Int`` fields (optionally validated by ``Range``) and
+    ``String`` fields without validators are supported.
+
+    :returns: A tuple ``(name, data key, converter, validators, missing,
+        required)`` or ``None`` if the field is not supported.
+    """
+    if field.dump_only:
+        return None
+    if type(field) is Int and not getattr(field, "strict", False):
+        if not all(
+            isinstance(v, Range)
+            and getattr(v, "min_inclusive", True)
+            and getattr(v, "max_inclusive", True)
+            for v in field.validators
+        ):
+            return None
+        validators = [(v.min, v.max) for v in field.validators]
+        field_type = int
+    elif type(field) is String and not field.validators:
+        validators = []
+        field_type = _string
+    else:
+        return None
+
+    data_key = getattr(field, "data_key", None) or getattr(field, "load_from", None)
+    return name, data_key or name, field_type, validators, field.missing, field.required
+
 
 class RequestParser:
-    """RequestParser."""
+    """RequestParser.
+
+    The fields are compiled into a marshmallow schema once, at construction.
+    When all the fields are primitive (see :func:`compile_fast_field`) and
+    only the query string and view arguments are parsed, valid requests are
+    parsed without going through webargs and marshmallow. Invalid ones fall
+    back to webargs, so that the error responses are unchanged.
+    """
 
-    def __init__(self, fields=None, processors=None):
+    def __init__(self, fields=None, processors=None, locations=("view_args",)):
         """Constructor."""
         self.fields = fields or {}
         self.processors = processors or []
+        self.locations = locations
+        self.schema_class = dict2schema(self.fields, parser.schema_class)
+        self._local = threading.local()
+        self.fast_fields = self.compile_fast_fields()
+
+    @property
+    def schema(self):
+        """Schema instance of the current thread."""
+        schema = getattr(self._local, "schema", None)
+        if schema is None:
+            schema = self._local.schema = self.schema_class()
+        return schema
+
+    def compile_fast_fields(self):
+        """Compile the fields for the fast path, if they all support it."""
+        if not all(location in FAST_LOCATIONS for location in self.locations):
+            return None
+        fast_fields = [
+            compile_fast_field(name, field) for name, field in self.fields.items()
+        ]
+        if None in fast_fields:
+            return None
+        return fast_fields
+
+    def fast_parse(self):
+        """Parse the primitive fields, or return ``None`` on invalid values."""
+        sources = [FAST_LOCATIONS[location]() for location in self.locations]
+        result = {}
+        for fast_field in self.fast_fields:
+            name, data_key, field_type, validators, default, required = fast_field
+            for source in sources:
+                if data_key in source:
+                    value = source[data_key]
+                    break
+            else:
+                if required:
+                    return None
+                if default is not missing:
+                    result[name] = default() if callable(default) else default
+                continue
+
+            try:
+                value = field_type(value)
+            except (TypeError, ValueError):
+                return None
+            for min_, max_ in validators:
+                if (min_ is not None and value < min_) or (
+                    max_ is not None and value > max_
+                ):
+                    return None
+            result[name] = value
+        return result
 
     def parse(self):
         """Parse."""
-        return self.post_process(
-            parser.parse(self.fields, request, locations=["view_args"])
-        )
+        request_arguments = None
+        if self.fast_fields is not None:
+            request_arguments = self.fast_parse()
+        if request_arguments is None:
+            request_arguments = parser.parse(
+                self.schema, request, locations=self.locations
+            )
+        return self.post_process(request_arguments)
 
     def post_process(self, request_arguments):
         """Post process."""
@@ -42,10 +156,17 @@ search_request_parser = RequestParser(
         "from": Int(load_from="from", validate=Range(min=1),),
         "size": Int(validate=Range(min=1), missing=10,),
         "q": String(),  # TODO: allow getting it from "query" maybe a Function
+        "cursor": String(),
+        "fields": String(),
     },
-    processors=[build_pagination],
+    processors=[build_pagination, build_fields],
+    locations=("querystring",),
 )
 
 create_request_parser = RequestParser()
 
-item_request_parser = RequestParser(fields={"id": String(required=True)})
+item_request_parser = RequestParser(
+    fields={"id": String(), "fields": String()},
+    processors=[build_fields],
+    locations=("view_args", "querystring"),
+)
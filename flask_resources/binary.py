@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Binary serialization formats.
+
+MessagePack (``msgpack``) and CBOR (``cbor``) are used when the ``msgpack``
+and ``cbor2`` packages are installed. The objects are converted with the same
+:func:`flask_resources.json_backends.default` as the JSON backends, so that
+the serialized values (e.g. dates as ISO 8601 strings) are the same in every
+format.
+
+Only the values which JSON can represent are loaded: binary strings, CBOR
+tags, MessagePack extension types and non-string map keys are rejected, so
+that resources get the same objects whatever the format of the request.
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from importlib import import_module
+from uuid import UUID
+
+from . import json_backends
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def check_json_values(obj):
+    """Check that a loaded object only holds values which JSON can represent.
+
+    :raises ValueError: On any other value, or a non-string map key.
+    """
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key in value:
+                if not isinstance(key, str):
+                    raise ValueError("Map keys must be strings.")
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif not isinstance(value, _JSON_SCALARS):
+            raise ValueError("Unsupported value type: {}.".format(type(value)))
+    return obj
+
+
+def _default(obj):
+    """Convert the objects not natively supported, like in JSON."""
+    # ``json_backends`` may be partially imported when this module is.
+    return json_backends.default(obj)
+
+
+class MessagePackFormat(object):
+    """MessagePack format."""
+
+    name = "msgpack"
+
+    def __init__(self):
+        """Constructor."""
+        self.msgpack = import_module("msgpack")
+        self.decode_errors = (ValueError, self.msgpack.UnpackException)
+
+    def dumps(self, obj):
+        """Dump the object into MessagePack bytes."""
+        return self.msgpack.packb(obj, default=_default, use_bin_type=True)
+
+    def loads(self, data):
+        """Load MessagePack bytes."""
+        return check_json_values(
+            self.msgpack.unpackb(data, raw=False, ext_hook=_reject_ext_type)
+        )
+
+
+def _reject_ext_type(code, data):
+    """Reject the MessagePack extension types."""
+    raise ValueError("Unsupported extension type: {}.".format(code))
+
+
+def _encode_cbor(encoder, value):
+    """Encode a value converted like in JSON."""
+    encoder.encode(json_backends.default(value))
+
+
+class CBORFormat(object):
+    """CBOR format.
+
+    The values which CBOR encodes with tags (dates, UUIDs and decimals) are
+    converted like in JSON instead, and tagged values are rejected on load.
+    """
+
+    name = "cbor"
+
+    def __init__(self):
+        """Constructor."""
+        self.cbor2 = import_module("cbor2")
+        self.decode_errors = (ValueError, self.cbor2.CBORDecodeError)
+        self.encoders = {
+            cls: _encode_cbor for cls in (datetime, date, time, UUID, Decimal)
+        }
+
+    def dumps(self, obj):
+        """Dump the object into CBOR bytes."""
+        return self.cbor2.dumps(obj, default=_encode_cbor, encoders=self.encoders)
+
+    def loads(self, data):
+        """Load CBOR bytes."""
+        return check_json_values(self.cbor2.loads(data, tag_hook=_reject_tag))
+
+
+def _reject_tag(decoder, tag):
+    """Reject the CBOR tags which are not decoded natively."""
+    raise ValueError("Unsupported tag: {}.".format(tag.tag))
+
+
+BINARY_FORMATS = {
+    binary_format.name: binary_format
+    for binary_format in (MessagePackFormat, CBORFormat)
+}
+"""Available binary formats."""
+
+_formats = {}
+
+
+def get_binary_format(name):
+    """Get a binary format instance.
+
+    :raises ImportError: If the package of the format is not installed.
+    """
+    binary_format = _formats.get(name)
+    if binary_format is None:
+        binary_format = _formats[name] = BINARY_FORMATS[name]()
+    return binary_format
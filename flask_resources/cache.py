@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Serialized responses cache.
+
+The cache backends implement a subset of the Redis client interface
+(``get``, ``set`` and ``delete``) on ``bytes`` values, so that a ``redis.Redis``
+client (or any compatible fake) can be used instead of the in-process
+:class:`LRUCache`.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+from .compression import ENCODINGS
+
+
+class LRUCache(object):
+    """In-process least recently used cache with size-based eviction."""
+
+    def __init__(self, max_size=64 * 1024 * 1024):
+        """Constructor.
+
+        :param max_size: Maximum total size in bytes of the cached values.
+        """
+        self.max_size = max_size
+        self.size = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, name):
+        """Get a value, or ``None`` if it is not cached."""
+        with self._lock:
+            value = self._data.get(name)
+            if value is not None:
+                self._data.move_to_end(name)
+            return value
+
+    def set(self, name, value, ex=None):
+        """Set a value, evicting the least recently used ones if needed.
+
+        :param ex: Expiration in seconds (ignored, kept for compatibility).
+        """
+        if len(value) > self.max_size:
+            return False
+        with self._lock:
+            previous = self._data.pop(name, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._data[name] = value
+            self.size += len(value)
+            while self.size > self.max_size:
+                _, evicted = self._data.popitem(last=False)
+                self.size -= len(evicted)
+        return True
+
+    def delete(self, *names):
+        """Delete values."""
+        deleted = 0
+        with self._lock:
+            for name in names:
+                value = self._data.pop(name, None)
+                if value is not None:
+                    self.size -= len(value)
+                    deleted += 1
+        return deleted
+
+
+class ResponseCache(object):
+    """Cache of the serialized item responses.
+
+    Entries are keyed by blueprint name, item (see
+    :func:`flask_resources.response.get_cache_id`), item version, mimetype and
+    (for the compressed variants) content-coding. The version is stored along
+    with the serialized bytes (and checked on read) so that all the versions
+    of an item can be invalidated without knowing them.
+    """
+
+    def __init__(self, backend=None, prefix="flask-resources:", timeout=None):
+        """Constructor.
+
+        :param backend: A Redis compatible backend. Defaults to an
+            :class:`LRUCache`.
+        :param prefix: Prefix of the cache keys.
+        :param timeout: Expiration of the entries in seconds.
+        """
+        self.backend = LRUCache() if backend is None else backend
+        self.prefix = prefix
+        self.timeout = timeout
+
+    def make_key(self, bp_name, id, mimetype, encoding=None):
+        """Build the key of an item response."""
+        key = "{}{}:{}:{}".format(self.prefix, bp_name, id, mimetype)
+        return key if encoding is None else "{}:{}".format(key, encoding)
+
+    def get(self, bp_name, id, version, mimetype, encoding=None):
+        """Get the serialized response of a given item version."""
+        entry = self.backend.get(self.make_key(bp_name, id, mimetype, encoding))
+        if entry is None:
+            return None
+        cached_version, _, data = entry.partition(b"\n")
+        if cached_version.decode("utf-8") != str(version):
+            return None
+        return data
+
+    def set(self, bp_name, id, version, mimetype, data, encoding=None):
+        """Cache the serialized response of a given item version."""
+        entry = str(version).encode("utf-8") + b"\n" + data
+        key = self.make_key(bp_name, id, mimetype, encoding)
+        self.backend.set(key, entry, ex=self.timeout)
+
+    def invalidate(self, bp_name, id, mimetypes):
+        """Invalidate all the cached responses (and variants) of an item."""
+        self.backend.delete(
+            *[
+                self.make_key(bp_name, id, mimetype, encoding)
+                for mimetype in mimetypes
+                for encoding in (None,) + ENCODINGS
+            ]
+        )
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Response compression negotiated with the ``Accept-Encoding`` header.
+
+gzip is always available, brotli (``br``) and zstandard (``zstd``) are used
+when the ``brotli`` and ``zstandard`` packages are installed.
+"""
+
+import zlib
+from functools import lru_cache
+from importlib import import_module
+
+from flask import request
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+
+class GzipCodec(object):
+    """gzip content-coding."""
+
+    name = "gzip"
+    default_level = 6
+
+    def compressobj(self, level):
+        """Create a gzip compressor."""
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data, level):
+        """Compress data."""
+        compressor = self.compressobj(level)
+        return compressor.compress(data) + compressor.flush()
+
+    def compress_stream(self, chunks, level):
+        """Compress chunks, flushing the compressed data of each chunk."""
+        compressor = self.compressobj(level)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+class BrotliCodec(object):
+    """brotli content-coding."""
+
+    name = "br"
+    default_level = 4
+
+    def __init__(self):
+        """Constructor."""
+        self.brotli = import_module("brotli")
+
+    def compress(self, data, level):
+        """Compress data."""
+        return self.brotli.compress(data, quality=level)
+
+    def compress_stream(self, chunks, level):
+        """Compress chunks, flushing the compressed data of each chunk."""
+        compressor = self.brotli.Compressor(quality=level)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+
+
+class ZstdCodec(object):
+    """zstandard content-coding."""
+
+    name = "zstd"
+    default_level = 3
+
+    def __init__(self):
+        """Constructor."""
+        self.zstandard = import_module("zstandard")
+
+    def compress(self, data, level):
+        """Compress data."""
+        return self.zstandard.ZstdCompressor(level=level).compress(data)
+
+    def compress_stream(self, chunks, level):
+        """Compress chunks, flushing the compressed data of each chunk."""
+        compressor = self.zstandard.ZstdCompressor(level=level).compressobj()
+        flush_block = self.zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(flush_block)
+        yield compressor.flush()
+
+
+CODECS = (ZstdCodec, BrotliCodec, GzipCodec)
+"""Supported codecs, by order of preference."""
+
+ENCODINGS = tuple(codec.name for codec in CODECS)
+"""Names of the supported content-codings."""
+
+
+class Compression(object):
+    """Negotiated response compression.
+
+    The content-coding is selected from the ``Accept-Encoding`` header, by
+    client quality and then by order of the ``encodings``. The selection is
+    memoized per raw header value.
+    """
+
+    def __init__(self, encodings=ENCODINGS, min_size=1024, levels=None, cache_size=64):
+        """Constructor.
+
+        :param encodings: Enabled content-codings, by order of preference.
+            The ones whose library is not installed are ignored.
+        :param min_size: Minimum size in bytes of the compressed bodies.
+        :param levels: Map of content-codings to compression level.
+        :param cache_size: Maximum number of cached ``Accept-Encoding`` values.
+        """
+        self.codecs = {}
+        for codec_cls in CODECS:
+            if codec_cls.name in encodings:
+                try:
+                    self.codecs[codec_cls.name] = codec_cls()
+                except ImportError:
+                    continue
+        self.encodings = [e for e in encodings if e in self.codecs]
+        self.min_size = min_size
+        self.levels = {
+            name: (levels or {}).get(name, codec.default_level)
+            for name, codec in self.codecs.items()
+        }
+        self.match_encoding = lru_cache(maxsize=cache_size)(self._match_encoding)
+
+    def _match_encoding(self, accept_encoding):
+        """Select the content-coding for an ``Accept-Encoding`` header."""
+        accept = parse_accept_header(accept_encoding, Accept)
+        encoding, best_quality = None, 0
+        for name in self.encodings:
+            quality = accept[name]
+            if quality > best_quality:
+                encoding, best_quality = name, quality
+        return encoding
+
+    def negotiate(self):
+        """Select the content-coding of the current request."""
+        return self.match_encoding(request.headers.get("Accept-Encoding"))
+
+    def compress(self, data, encoding):
+        """Compress data, unless it is smaller than the minimum size.
+
+        :returns: A tuple with the data and the applied content-coding.
+        """
+        if encoding is None or len(data) < self.min_size:
+            return data, None
+        return self.codecs[encoding].compress(data, self.levels[encoding]), encoding
+
+    def compress_stream(self, chunks, encoding):
+        """Compress an iterable of chunks."""
+        return self.codecs[encoding].compress_stream(chunks, self.levels[encoding])
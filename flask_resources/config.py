@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Flask-Resources configuration."""
+
+FLASK_RESOURCES_JSON_BACKEND = None
+"""JSON backend used by the JSON serializers and loaders.
+
+One of ``"orjson"``, ``"rapidjson"``, ``"ujson"`` or ``"json"``. If ``None``,
+the fastest installed one is used.
+"""
+
+FLASK_RESOURCES_METRICS_ENABLED = False
+"""Whether to record the resource requests metrics and expose them."""
+
+FLASK_RESOURCES_METRICS_URL = "/metrics"
+"""URL of the metrics endpoint, in the Prometheus text format."""
+
+FLASK_RESOURCES_METRICS_DIR = None
+"""Directory where the processes of a pre-fork server share their metrics.
+
+If ``None``, only the metrics of the process serving the request are exposed.
+"""
+
+FLASK_RESOURCES_METRICS_FLUSH_INTERVAL = 1.0
+"""Minimum interval in seconds between two dumps of the metrics of a process."""
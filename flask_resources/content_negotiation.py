@@ -7,11 +7,13 @@
 
 """Content negotiation API."""
 
-from functools import wraps
+from functools import lru_cache, wraps
 
+from flask import request
 from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header, parse_options_header
 
-from .context import resource_requestctx
+from .context import get_resource_requestctx
 from .errors import UnsupportedMimetypeError
 
 
@@ -76,44 +78,110 @@ class ContentNegotiator(object):
         return formats_map.get(fmt)
 
 
+class CompiledNegotiator(object):
+    """Content negotiation compiled for a fixed set of mimetypes.
+
+    It is built once per view (i.e. when the blueprint is built) from the keys
+    of the view's response handlers and request loaders. The selected mimetype
+    is memoized per raw ``Accept``/``?format=`` and ``Content-Type`` value in a
+    bounded LRU cache, so that a repeated header costs a dictionary lookup
+    instead of parsing it and scanning the accepted mimetypes.
+    """
+
+    def __init__(
+        self,
+        response_mimetypes,
+        request_mimetypes,
+        formats_map=None,
+        default_accept=None,
+        default_content_type=None,
+        cache_size=128,
+    ):
+        """Constructor.
+
+        :param response_mimetypes: Iterable of the MIME types that can be
+            served (i.e. the keys of the response handlers).
+        :param request_mimetypes: Iterable of the MIME types that can be
+            loaded (i.e. the keys of the request loaders).
+        :param formats_map: Map of ``?format=`` values to MIME type.
+        :param default_accept: MIME type used on wildcard or empty "Accept".
+            Defaults to the first response MIME type.
+        :param default_content_type: MIME type used when no "Content-Type" is
+            sent. Defaults to the first request MIME type.
+        :param cache_size: Maximum number of cached header values.
+        """
+        self.response_mimetypes = tuple(response_mimetypes)
+        self.request_mimetypes = tuple(request_mimetypes)
+        self.formats_map = dict(formats_map or {})
+        self.default_accept = default_accept or next(
+            iter(self.response_mimetypes), None
+        )
+        self.default_content_type = default_content_type or next(
+            iter(self.request_mimetypes), None
+        )
+        self.match_accept = lru_cache(maxsize=cache_size)(self._match_accept)
+        self.match_content_type = lru_cache(maxsize=cache_size)(
+            self._match_content_type
+        )
+
+    def _match_accept(self, accept, fmt=None):
+        """Select the MIME type to respond with.
+
+        :param accept: The raw "Accept" header.
+        :param fmt: The client's selected format.
+        """
+        return ContentNegotiator.match(
+            self.response_mimetypes,
+            parse_accept_header(accept, MIMEAccept),
+            self.formats_map,
+            fmt,
+            default=self.default_accept,
+        )
+
+    def _match_content_type(self, content_type):
+        """Select the MIME type of the request payload.
+
+        :param content_type: The raw "Content-Type" header.
+        :returns: The MIME type if it can be loaded, otherwise ``None``.
+        """
+        if not content_type:
+            return self.default_content_type
+        mimetype = parse_options_header(content_type)[0]
+        return mimetype if mimetype in self.request_mimetypes else None
+
+
 def content_negotiation(f):
     """Decorator to perform content negotiation."""
 
     @wraps(f)
     def inner(self, *args, **kwargs):
-        # resource_requestctx.payload_mimetype = ContentNegotiator.match(
-        #     self.item_loaders.keys(),
-        #     request.content_type,
-        #     {},  # self.formats,
-        #     request.args.get("format", None),
-        #     None,  # self.default_mimetype,
-        # )
-
-        # FIXME: content negotiation
-        payload_mimetype = "application/json"  # Content-Type
-        accept_mimetype = "application/json"
-
-        # Check if content-type can be treated otherwise, fail fast
-        # Serialization is checked per function due to lack of
-        # knowledge at this point
-        allowed_mimetypes = self.request_loaders.keys()
-        if payload_mimetype not in allowed_mimetypes:
-            raise UnsupportedMimetypeError(
-                header="Content-Type",
-                received_mimetype=payload_mimetype,
-                allowed_mimetypes=allowed_mimetypes,
-            )
-
-        allowed_mimetypes = self.response_handlers.keys()
-        if accept_mimetype not in allowed_mimetypes:
-            raise UnsupportedMimetypeError(
-                header="Accept",
-                received_mimetype=accept_mimetype,
-                allowed_mimetypes=allowed_mimetypes,
+        ctx = get_resource_requestctx()
+        negotiator = self.negotiator
+        content_type = request.headers.get("Content-Type")
+        accept = request.headers.get("Accept")
+
+        with ctx.measure("negotiation"):
+            # Check if content-type can be treated otherwise, fail fast
+            payload_mimetype = negotiator.match_content_type(content_type)
+            if content_type and payload_mimetype is None:
+                raise UnsupportedMimetypeError(
+                    header="Content-Type",
+                    received_mimetype=content_type,
+                    allowed_mimetypes=negotiator.request_mimetypes,
+                )
+
+            accept_mimetype = negotiator.match_accept(
+                accept, request.args.get("format")
             )
-
-        resource_requestctx.payload_mimetype = payload_mimetype
-        resource_requestctx.accept_mimetype = accept_mimetype
+            if accept_mimetype not in negotiator.response_mimetypes:
+                raise UnsupportedMimetypeError(
+                    header="Accept",
+                    received_mimetype=accept_mimetype or accept,
+                    allowed_mimetypes=negotiator.response_mimetypes,
+                )
+
+        ctx.payload_mimetype = payload_mimetype
+        ctx.accept_mimetype = accept_mimetype
 
         return f(self, *args, **kwargs)
 
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Support of coroutine (``async def``) resource methods.
+
+The views run the coroutines returned by the resource methods to completion
+on an event loop owned by the current thread, within the request context. The
+resource methods can then overlap their I/O, e.g. by fanning out several
+backend queries with :func:`gather`.
+"""
+
+import asyncio
+import inspect
+import threading
+from functools import partial
+
+_local = threading.local()
+
+
+def get_event_loop():
+    """Get the event loop of the current thread, creating it if needed."""
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _local.loop = asyncio.new_event_loop()
+    return loop
+
+
+def run_coroutine(awaitable):
+    """Run an awaitable to completion and return its result."""
+    return get_event_loop().run_until_complete(awaitable)
+
+
+def call(method, *args, **kwargs):
+    """Call a (sync or async) method and return its result."""
+    result = method(*args, **kwargs)
+    if inspect.isawaitable(result):
+        return run_coroutine(result)
+    return result
+
+
+async def gather(*awaitables, limit=None):
+    """Run awaitables concurrently and return their results in order.
+
+    :param limit: Maximum number of awaitables running at the same time.
+    """
+    if limit is None:
+        return await asyncio.gather(*awaitables)
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def limited(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*[limited(aw) for aw in awaitables])
+
+
+async def run_in_executor(func, *args, executor=None, **kwargs):
+    """Run a blocking function in an executor, so it can be gathered.
+
+    Note that the function runs outside of the application and request
+    contexts.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Request deadlines.
+
+A resource config with a ``request_timeout`` gives each request a deadline,
+which the client can shorten with the ``request_timeout_header`` (e.g.
+``X-Request-Timeout: 2.5``). The deadline is available to the resource
+methods as ``resource_requestctx.deadline``, with helpers to pass the
+remaining budget to backend calls and to give up once it is exhausted::
+
+    def search(self):
+        timeout = resource_requestctx.remaining()
+        hits = self.search_backend.search(..., timeout=timeout)
+        resource_requestctx.check_deadline()
+
+The views shed the requests whose deadline passed before the resource was
+called (503), and time out the reads whose deadline passed during the call
+(504), instead of serializing a response which nobody waits for.
+
+The deadline is counted from the arrival of the request, not from the
+dispatch to the view, so that the time spent before (e.g. in the
+``before_request`` functions) is part of the budget:
+
+- With a ``request_start_header``, the arrival is the time at which the
+  front-end proxy received the request (e.g. ``X-Request-Start: t=<time>``
+  set by nginx), i.e. the time spent queued before a worker picked up the
+  request is included. The clocks of the proxy and of the workers must be in
+  sync.
+- Otherwise, it is the time at which the application started handling the
+  request, as marked by the ``FlaskResources`` extension in a
+  ``before_request`` function (see :func:`mark_arrival`).
+- Without the extension, the deadline starts at the dispatch to the view.
+"""
+
+from functools import wraps
+from time import monotonic, time
+
+from flask import request
+
+from .context import get_resource_requestctx
+from .errors import DeadlineExceededRESTError, ServiceUnavailableRESTError
+
+ARRIVAL_KEY = "flask_resources.arrival"
+"""Key of the (monotonic) arrival time of the request in the WSGI environ."""
+
+
+def mark_arrival():
+    """Mark the arrival of the current request (a ``before_request`` function)."""
+    request.environ.setdefault(ARRIVAL_KEY, monotonic())
+
+
+def parse_request_start(value):
+    """Parse a request start header into a UNIX timestamp in seconds.
+
+    The value may be prefixed with ``t=``, and be in seconds, milliseconds or
+    microseconds (e.g. ``t=1600000000.123``, ``1600000000123``).
+
+    :returns: The timestamp, or ``None`` if the value is invalid.
+    """
+    if value.startswith("t="):
+        value = value[2:]
+    try:
+        timestamp = float(value)
+    except ValueError:
+        return None
+    if timestamp > 1e14:
+        return timestamp / 1e6
+    if timestamp > 1e11:
+        return timestamp / 1e3
+    return timestamp
+
+
+class DeadlinePolicy(object):
+    """Deadline of the requests of a view."""
+
+    def __init__(self, timeout, header=None, start_header=None):
+        """Constructor.
+
+        :param timeout: Seconds allowed to handle a request.
+        :param header: Request header with which the client can shorten the
+            timeout, in seconds.
+        :param start_header: Request header with the time at which a front-end
+            proxy received the request (see :func:`parse_request_start`).
+        """
+        self.timeout = timeout
+        self.header = header
+        self.start_header = start_header
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the policy of a resource config, or ``None`` without timeout."""
+        if config.request_timeout is None:
+            return None
+        return cls(
+            config.request_timeout,
+            config.request_timeout_header,
+            config.request_start_header,
+        )
+
+    def get_timeout(self):
+        """Get the timeout of the current request."""
+        value = request.headers.get(self.header) if self.header else None
+        if value:
+            try:
+                timeout = float(value)
+            except ValueError:
+                pass
+            else:
+                if 0 < timeout < self.timeout:
+                    return timeout
+        return self.timeout
+
+    def get_elapsed(self, now):
+        """Get the seconds elapsed since the arrival of the current request."""
+        value = request.headers.get(self.start_header) if self.start_header else None
+        if value:
+            start = parse_request_start(value)
+            if start is not None:
+                return max(time() - start, 0)
+        arrival = request.environ.get(ARRIVAL_KEY)
+        if arrival is not None:
+            return now - arrival
+        return 0
+
+    def start(self):
+        """Get the deadline of the current request."""
+        now = monotonic()
+        return now - self.get_elapsed(now) + self.get_timeout()
+
+
+def with_deadline(f):
+    """Decorator to set the deadline of the request.
+
+    The deadline errors are returned through the response handler of the
+    view, like the other errors of the view.
+    """
+
+    @wraps(f)
+    def inner(self, *args, **kwargs):
+        if self.deadline_policy is None:
+            return f(self, *args, **kwargs)
+
+        ctx = get_resource_requestctx()
+        ctx.deadline = self.deadline_policy.start()
+        try:
+            return f(self, *args, **kwargs)
+        except (DeadlineExceededRESTError, ServiceUnavailableRESTError) as error:
+            handlers = getattr(self, "response_handlers", None)
+            if not handlers or ctx.accept_mimetype not in handlers:
+                raise
+            return handlers[ctx.accept_mimetype].make_error_response(error)
+
+    return inner
+
+
+def shed_expired(ctx):
+    """Reject the request if its deadline has passed.
+
+    :raises ServiceUnavailableRESTError: If the deadline has passed.
+    """
+    if ctx.deadline is not None and ctx.deadline <= monotonic():
+        raise ServiceUnavailableRESTError(
+            description="The request deadline was exceeded before it was handled."
+        )
@@ -8,6 +8,7 @@
 """Exceptions used in Flask Resources module."""
 
 import json
+import math
 
 from flask import g
 from werkzeug.exceptions import HTTPException
@@ -36,8 +37,11 @@ class RESTException(HTTPException):
         """Get the description."""
         return self.description
 
-    def get_body(self, environ=None):
-        """Get the request body."""
+    def to_dict(self, environ=None):
+        """Convert to dictionary.
+
+        :returns: A dictionary with the status, message and errors.
+        """
         body = dict(status=self.code, message=self.get_description(environ),)
 
         errors = self.get_errors()
@@ -49,6 +53,14 @@ class RESTException(HTTPException):
 
         return body
 
+    def get_body(self, environ=None):
+        """Get the request body."""
+        return json.dumps(self.to_dict(environ))
+
+    def get_headers(self, environ=None):
+        """Get a list of headers."""
+        return [("Content-Type", "application/json")]
+
 
 #
 # Loading/Serializing
@@ -73,6 +85,73 @@ class UnsupportedMimetypeError(RESTException):
         )
 
 
+class PayloadTooLargeRESTError(RESTException):
+    """The request payload is larger than allowed."""
+
+    code = 413
+    description = "The request payload is too large."
+
+
+class InvalidPayloadRESTError(RESTException):
+    """The request payload is not acceptable (e.g. too deeply nested)."""
+
+    code = 400
+    description = "Invalid request payload."
+
+
+#
+# Request limits
+#
+class RetryLaterRESTException(RESTException):
+    """Request rejected for now, with an optional ``Retry-After`` header."""
+
+    def __init__(self, retry_after=None, **kwargs):
+        """Constructor.
+
+        :param retry_after: Seconds after which the request can be retried.
+        """
+        super(RetryLaterRESTException, self).__init__(**kwargs)
+        self.retry_after = retry_after
+
+    def get_headers(self, environ=None):
+        """Get a list of headers."""
+        headers = super(RetryLaterRESTException, self).get_headers(environ)
+        if self.retry_after is not None:
+            headers.append(("Retry-After", str(max(1, math.ceil(self.retry_after)))))
+        return headers
+
+
+class TooManyRequestsRESTError(RetryLaterRESTException):
+    """The client exceeded its request rate."""
+
+    code = 429
+    description = "Too many requests."
+
+
+class ServiceUnavailableRESTError(RetryLaterRESTException):
+    """The server cannot handle the request right now."""
+
+    code = 503
+    description = "The service is temporarily unavailable."
+
+
+class DeadlineExceededRESTError(RESTException):
+    """The request deadline passed while handling the request."""
+
+    code = 504
+    description = "The request deadline was exceeded."
+
+
+#
+# Conditional requests
+#
+class PreconditionFailedRESTError(RESTException):
+    """The request preconditions (e.g. ``If-Match``) are not satisfied."""
+
+    code = 412
+    description = "The resource does not match the request preconditions."
+
+
 # FIXME: From here down need review
 
 
@@ -117,3 +196,29 @@ class SearchPaginationRESTError(RESTException):
             for field, messages in errors.items():
                 _errors.extend([FieldError(field, msg) for msg in messages])
         super(SearchPaginationRESTError, self).__init__(errors=_errors, **kwargs)
+
+
+#
+# Bulk
+#
+class BulkOperationsRESTError(RESTException):
+    """Invalid bulk operations."""
+
+    code = 400
+
+
+#
+# JSON Patch
+#
+class InvalidPatchRESTError(RESTException):
+    """Invalid JSON Patch document."""
+
+    code = 400
+    description = "Invalid JSON Patch document."
+
+
+class PatchConflictRESTError(RESTException):
+    """The JSON Patch cannot be applied to the current resource."""
+
+    code = 409
+    description = "The patch cannot be applied to the resource."
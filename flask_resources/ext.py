@@ -7,15 +7,95 @@
 
 """Library for easily implementing REST APIs."""
 
+from time import perf_counter
+
+from flask import current_app, g, request
+
+from . import config
+from .deadlines import mark_arrival
+from .metrics import CountedStream, Metrics
+from .views.base import BaseView
+
 
 class FlaskResources(object):
     """Flask-Resources extension."""
 
     def __init__(self, app=None):
         """Constructor."""
+        self.metrics = None
         if app:
             self.init_app(app)
 
     def init_app(self, app):
         """Flask application initialization."""
+        self.init_config(app)
+        app.before_request(mark_arrival)
+        if app.config["FLASK_RESOURCES_METRICS_ENABLED"]:
+            self.init_metrics(app)
         app.extensions["flask-resources"] = self
+
+    def init_metrics(self, app):
+        """Record the resource requests metrics and register their endpoint."""
+        self.metrics = Metrics(
+            directory=app.config["FLASK_RESOURCES_METRICS_DIR"],
+            flush_interval=app.config["FLASK_RESOURCES_METRICS_FLUSH_INTERVAL"],
+        )
+        self._resource_endpoints = {}
+        app.before_request(self._start_timer)
+        app.after_request(self._record_metrics)
+        app.add_url_rule(
+            app.config["FLASK_RESOURCES_METRICS_URL"],
+            "flask_resources_metrics",
+            self.metrics_view,
+        )
+
+    def is_resource_endpoint(self, endpoint):
+        """Check if an endpoint is served by a resource view."""
+        is_resource = self._resource_endpoints.get(endpoint)
+        if is_resource is None:
+            view_class = getattr(
+                current_app.view_functions.get(endpoint), "view_class", None
+            )
+            is_resource = isinstance(view_class, type) and issubclass(
+                view_class, BaseView
+            )
+            self._resource_endpoints[endpoint] = is_resource
+        return is_resource
+
+    def _start_timer(self):
+        g.flask_resources_start = perf_counter()
+
+    def _record_metrics(self, response):
+        start = g.pop("flask_resources_start", None)
+        if start is None or not self.is_resource_endpoint(request.endpoint):
+            return response
+
+        blueprint, method = request.blueprint, request.method
+        mimetype = response.mimetype if response.status_code != 415 else None
+        self.metrics.record_request(
+            blueprint, method, response.status_code, perf_counter() - start, mimetype
+        )
+        if not response.is_streamed:
+            self.metrics.record_size(
+                blueprint, method, response.calculate_content_length() or 0, mimetype
+            )
+        else:
+            response.response = CountedStream(
+                response.response,
+                lambda size: self.metrics.record_size(
+                    blueprint, method, size, mimetype
+                ),
+            )
+        return response
+
+    def metrics_view(self):
+        """Expose the metrics in the Prometheus text format."""
+        return current_app.response_class(
+            self.metrics.render(), mimetype="text/plain; version=0.0.4"
+        )
+
+    def init_config(self, app):
+        """Initialize configuration."""
+        for k in dir(config):
+            if k.startswith("FLASK_RESOURCES_"):
+                app.config.setdefault(k, getattr(config, k))
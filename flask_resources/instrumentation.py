@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Per-request timing instrumentation of the resource views.
+
+When a resource config sets an :class:`Instrumentation`, the views record the
+duration of the request stages in ``resource_requestctx.timings``:
+
+- ``negotiation``: the content negotiation.
+- ``parse``: the parsing of the request arguments.
+- ``load``: the loading of the request payload.
+- ``handler``: the resource methods.
+- ``serialize``: the serialization of the content.
+- ``response``: the building of the response (including ``serialize``).
+
+The timings, along with the ``total`` duration, are passed to the sinks
+at the end of each request, and optionally sent back in a ``Server-Timing``
+header. Note that the serialization of streamed responses happens after the
+view returns, so it is not measured.
+"""
+
+import logging
+import socket
+from collections import namedtuple
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+
+from flask import request
+from werkzeug.exceptions import HTTPException
+
+from .context import get_resource_requestctx
+
+STAGES = ("negotiation", "parse", "load", "handler", "serialize", "response")
+"""Names of the measured request stages, in pipeline order."""
+
+TimingSample = namedtuple("TimingSample", ["endpoint", "method", "status", "timings"])
+"""Timings of a request, as passed to the sinks."""
+
+
+def sorted_timings(timings):
+    """Get the timings items, by pipeline order of the stages."""
+    known = [(stage, timings[stage]) for stage in STAGES if stage in timings]
+    others = [item for item in timings.items() if item[0] not in STAGES]
+    return known + others
+
+
+class Instrumentation(object):
+    """Instrumentation of the resource views."""
+
+    def __init__(self, sinks=None, server_timing=False):
+        """Constructor.
+
+        :param sinks: List of sinks receiving a :class:`TimingSample` per
+            request, through their ``emit`` method.
+        :param server_timing: Whether to send the timings in a
+            ``Server-Timing`` response header.
+        """
+        self.sinks = list(sinks or [])
+        self.server_timing = server_timing
+
+    def instrument(self, f, view, *args, **kwargs):
+        """Call the view function, recording the timings of the request."""
+        ctx = get_resource_requestctx()
+        timings = ctx.timings = {}
+        start = perf_counter()
+        try:
+            response = f(view, *args, **kwargs)
+        except HTTPException as error:
+            self.emit(error.code, timings, perf_counter() - start)
+            raise
+        except Exception:
+            self.emit(500, timings, perf_counter() - start)
+            raise
+
+        timings["total"] = perf_counter() - start
+        if self.server_timing and hasattr(response, "headers"):
+            response.headers["Server-Timing"] = self.format_server_timing(timings)
+        self.emit(getattr(response, "status_code", 200), timings)
+        return response
+
+    def emit(self, status, timings, total=None):
+        """Pass the timings of the current request to the sinks."""
+        if total is not None:
+            timings["total"] = total
+        sample = TimingSample(request.endpoint, request.method, status, timings)
+        for sink in self.sinks:
+            sink.emit(sample)
+
+    @staticmethod
+    def format_server_timing(timings):
+        """Format the timings as a ``Server-Timing`` header value."""
+        return ", ".join(
+            "{};dur={:.3f}".format(stage, duration * 1000)
+            for stage, duration in sorted_timings(timings)
+        )
+
+
+def instrumentation(f):
+    """Decorator to record the timings of the request stages."""
+
+    @wraps(f)
+    def inner(self, *args, **kwargs):
+        if self.instrumentation is None:
+            return f(self, *args, **kwargs)
+        return self.instrumentation.instrument(f, self, *args, **kwargs)
+
+    return inner
+
+
+#
+# Sinks
+#
+class LoggingSink(object):
+    """Log the timings of each request."""
+
+    def __init__(self, logger=None, level=logging.INFO):
+        """Constructor."""
+        self.logger = logger or logging.getLogger("flask_resources.timings")
+        self.level = level
+
+    def emit(self, sample):
+        """Log a sample."""
+        if not self.logger.isEnabledFor(self.level):
+            return
+        self.logger.log(
+            self.level,
+            "%s %s %s %s",
+            sample.endpoint,
+            sample.method,
+            sample.status,
+            " ".join(
+                "{}={:.3f}ms".format(stage, duration * 1000)
+                for stage, duration in sorted_timings(sample.timings)
+            ),
+        )
+
+
+class StatsDSink(object):
+    """Send the timings as StatsD timers over UDP.
+
+    The metrics are named ``<prefix>.<endpoint>.<method>.<stage>``. All the
+    timings of a request are sent in a single datagram, and send errors are
+    ignored so that an absent listener does not affect the requests.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8125, prefix="flask_resources"):
+        """Constructor."""
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def format(self, sample):
+        """Format a sample as StatsD lines."""
+        name = ".".join(
+            [self.prefix, str(sample.endpoint).replace(":", "_"), sample.method]
+        )
+        return "\n".join(
+            "{}.{}:{:.3f}|ms".format(name, stage, duration * 1000)
+            for stage, duration in sorted_timings(sample.timings)
+        )
+
+    def emit(self, sample):
+        """Send a sample."""
+        try:
+            self.socket.sendto(self.format(sample).encode("utf-8"), self.address)
+        except OSError:
+            pass
+
+
+def escape_label(value):
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    """Format a sequence of ``(name, value)`` pairs as Prometheus labels."""
+    return ",".join(
+        '{}="{}"'.format(name, escape_label(value)) for name, value in labels
+    )
+
+
+def new_histogram(buckets):
+    """Create an empty histogram: bucket counts (non cumulative), sum and count."""
+    return [[0] * len(buckets), 0.0, 0]
+
+
+def observe(histogram, buckets, value):
+    """Add a value to a histogram."""
+    for i, bound in enumerate(buckets):
+        if value <= bound:
+            histogram[0][i] += 1
+            break
+    histogram[1] += value
+    histogram[2] += 1
+
+
+def format_histogram(name, labels, buckets, histogram):
+    """Format a histogram as Prometheus samples lines."""
+    counts, total, count = histogram
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, counts):
+        cumulative += bucket_count
+        lines.append(
+            '{}_bucket{{{},le="{}"}} {}'.format(name, labels, bound, cumulative)
+        )
+    lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(name, labels, count))
+    lines.append("{}_sum{{{}}} {}".format(name, labels, total))
+    lines.append("{}_count{{{}}} {}".format(name, labels, count))
+    return lines
+
+
+class PrometheusSink(object):
+    """Aggregate the timings in histograms, rendered in Prometheus text format.
+
+    The histograms are labelled by endpoint, method and stage. Use
+    :meth:`render` to expose them, e.g. from a metrics view.
+    """
+
+    name = "flask_resources_stage_duration_seconds"
+
+    default_buckets = (
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+    )
+
+    def __init__(self, buckets=None):
+        """Constructor.
+
+        :param buckets: Upper bounds in seconds of the histogram buckets.
+        """
+        self.buckets = tuple(sorted(buckets or self.default_buckets))
+        self.histograms = {}
+        self._lock = Lock()
+
+    def emit(self, sample):
+        """Add a sample to the histograms."""
+        with self._lock:
+            for stage, duration in sample.timings.items():
+                key = (sample.endpoint, sample.method, stage)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = new_histogram(self.buckets)
+                observe(histogram, self.buckets, duration)
+
+    def render(self):
+        """Render the histograms in the Prometheus text exposition format."""
+        lines = [
+            "# HELP {} Duration of the resource request stages.".format(self.name),
+            "# TYPE {} histogram".format(self.name),
+        ]
+        with self._lock:
+            histograms = sorted(
+                (tuple(str(k) for k in key), [list(counts), total, count])
+                for key, (counts, total, count) in self.histograms.items()
+            )
+        for (endpoint, method, stage), histogram in histograms:
+            labels = format_labels(
+                [("endpoint", endpoint), ("method", method), ("stage", stage)]
+            )
+            lines.extend(format_histogram(self.name, labels, self.buckets, histogram))
+        return "\n".join(lines) + "\n"
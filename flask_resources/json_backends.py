@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Pluggable JSON encoding/decoding backends.
+
+The backend used by the JSON serializers and loaders is selected with the
+``FLASK_RESOURCES_JSON_BACKEND`` configuration variable. By default the fastest
+installed library among orjson, python-rapidjson and ujson is used, falling
+back to the standard library ``json`` module.
+
+All backends return ``bytes`` from ``dumps``, encode ``SerializableMixin``
+objects as their ``object`` property, iterators (e.g. generators of hits) as
+arrays and encode datetimes, dates and times in ISO 8601 format, UUIDs in
+their canonical form and decimals as strings, to not lose precision. Since
+ujson natively encodes decimals as numbers, the objects are converted before
+being encoded by it, which makes it the slowest of the optional backends.
+"""
+
+import json
+from collections.abc import Iterator
+from datetime import date, datetime, time
+from decimal import Decimal
+from importlib import import_module
+from uuid import UUID
+
+from flask import current_app
+
+from .serializers.serializers import SerializableMixin
+
+
+def default(obj):
+    """Convert the objects not natively supported by JSON."""
+    if isinstance(obj, SerializableMixin):
+        return obj.object
+    if isinstance(obj, Iterator):
+        return list(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj)))
+
+
+def _convert_decimals(obj):
+    """Convert the decimals of an object (and of its items) to strings."""
+    if isinstance(obj, dict):
+        return {key: _convert_decimals(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_convert_decimals(value) for value in obj]
+    if isinstance(obj, (Decimal, SerializableMixin, Iterator)):
+        return _convert_decimals(default(obj))
+    return obj
+
+
+class StdlibJSONBackend(object):
+    """Standard library ``json`` backend."""
+
+    name = "json"
+
+    def __init__(self):
+        """Constructor."""
+        self.encoder = json.JSONEncoder(
+            default=default, ensure_ascii=False, separators=(",", ":")
+        )
+
+    def dumps(self, obj):
+        """Dump the object into JSON bytes."""
+        return self.encoder.encode(obj).encode("utf-8")
+
+    def loads(self, data):
+        """Load JSON from bytes or a string."""
+        return json.loads(data)
+
+
+class OrjsonBackend(object):
+    """orjson backend."""
+
+    name = "orjson"
+
+    def __init__(self):
+        """Constructor."""
+        self.orjson = import_module("orjson")
+        self.option = self.orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj):
+        """Dump the object into JSON bytes."""
+        return self.orjson.dumps(obj, default=default, option=self.option)
+
+    def loads(self, data):
+        """Load JSON from bytes or a string."""
+        return self.orjson.loads(data)
+
+
+class UjsonBackend(object):
+    """ujson backend."""
+
+    name = "ujson"
+
+    def __init__(self):
+        """Constructor."""
+        self.ujson = import_module("ujson")
+
+    def dumps(self, obj):
+        """Dump the object into JSON bytes."""
+        return self.ujson.dumps(
+            _convert_decimals(obj), default=default, ensure_ascii=False
+        ).encode("utf-8")
+
+    def loads(self, data):
+        """Load JSON from bytes or a string."""
+        return self.ujson.loads(data)
+
+
+class RapidJSONBackend(object):
+    """python-rapidjson backend."""
+
+    name = "rapidjson"
+
+    def __init__(self):
+        """Constructor."""
+        self.rapidjson = import_module("rapidjson")
+
+    def dumps(self, obj):
+        """Dump the object into JSON bytes."""
+        return self.rapidjson.dumps(obj, default=default, ensure_ascii=False).encode(
+            "utf-8"
+        )
+
+    def loads(self, data):
+        """Load JSON from bytes or a string."""
+        return self.rapidjson.loads(data)
+
+
+JSON_BACKENDS = {
+    backend.name: backend
+    for backend in (OrjsonBackend, RapidJSONBackend, UjsonBackend, StdlibJSONBackend)
+}
+"""Available backends, by order of preference."""
+
+_backends = {}
+
+
+def get_json_backend(name=None):
+    """Get a JSON backend instance.
+
+    :param name: Name of the backend. If ``None``, the one configured in
+        ``FLASK_RESOURCES_JSON_BACKEND`` is used, or if not configured the
+        fastest installed one.
+    :raises RuntimeError: If the requested backend is unknown.
+    :raises ImportError: If the requested backend is not installed.
+    """
+    if name is None and current_app:
+        name = current_app.config.get("FLASK_RESOURCES_JSON_BACKEND")
+
+    backend = _backends.get(name)
+    if backend is None:
+        backend = _backends[name] = _load_json_backend(name)
+    return backend
+
+
+def _load_json_backend(name):
+    """Instantiate a backend, or the first installed one if no name is given."""
+    if name is not None:
+        if name not in JSON_BACKENDS:
+            raise RuntimeError(
+                "Unknown JSON backend {!r} (FLASK_RESOURCES_JSON_BACKEND), must be "
+                "one of: {}.".format(name, ", ".join(JSON_BACKENDS))
+            )
+        return JSON_BACKENDS[name]()
+
+    for backend_cls in JSON_BACKENDS.values():
+        try:
+            return backend_cls()
+        except ImportError:
+            continue
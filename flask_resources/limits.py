@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Request payload limits, checked before the payload is loaded."""
+
+import io
+import operator
+import re
+from itertools import accumulate, count
+
+from flask import request
+
+from .errors import InvalidPayloadRESTError, PayloadTooLargeRESTError
+
+# Bytes which are neither quotes nor structural characters.
+_NON_STRUCTURAL = bytes(c for c in range(256) if c not in b'"[]{},')
+# Opening brackets count for 2 and closing ones for 0, so that the depth after
+# the n-th bracket is the running sum minus n.
+_DEPTH_STEPS = bytes.maketrans(b"[{]}", b"\x02\x02\x00\x00")
+# Innermost (already stripped) arrays and objects.
+_INNERMOST = re.compile(rb"\[,*\]|\{,*\}")
+
+
+def check_json_structure(data, max_depth=None, max_array_length=None):
+    """Check the nesting depth and array lengths of a JSON document.
+
+    The document is not parsed. Escaped quotes and backslashes are removed,
+    everything but the quotes and structural characters is deleted and the
+    (now empty) strings are dropped, so that the checks run as bytes
+    operations instead of a loop in Python. Invalid JSON is left for the
+    loader to reject.
+
+    The array lengths are checked by removing the innermost arrays and objects
+    level by level, i.e. in as many passes as the document is deep: set
+    ``max_depth`` as well to bound them.
+
+    :raises InvalidPayloadRESTError: If a limit is exceeded.
+    """
+    if b"\\" in data:
+        data = data.replace(b"\\\\", b"").replace(b'\\"', b"")
+    structure = b"".join(data.translate(None, _NON_STRUCTURAL).split(b'"')[::2])
+
+    if max_depth is not None:
+        steps = structure.translate(_DEPTH_STEPS, b",")
+        depth = max(map(operator.sub, accumulate(steps), count(1)), default=0)
+        if depth > max_depth:
+            raise InvalidPayloadRESTError(
+                description="The payload must not be nested deeper than {} "
+                "levels.".format(max_depth)
+            )
+
+    if max_array_length is None:
+        return
+    # An array with more items than allowed has as many commas at its level.
+    too_long = b"[" + b"," * max_array_length
+    while structure.count(b",") >= max_array_length:
+        if too_long in structure:
+            raise InvalidPayloadRESTError(
+                description="Arrays must not have more than {} items.".format(
+                    max_array_length
+                )
+            )
+        stripped = _INNERMOST.sub(b"", structure)
+        if stripped == structure:
+            return
+        structure = stripped
+
+
+def is_json_mimetype(mimetype):
+    """Check if a mimetype is a (single document) JSON one."""
+    return mimetype == "application/json" or (
+        mimetype is not None and mimetype.endswith("+json")
+    )
+
+
+class PayloadLimits(object):
+    """Limits of the request payloads of a view."""
+
+    def __init__(self, max_content_length=None, max_depth=None, max_array_length=None):
+        """Constructor.
+
+        :param max_content_length: Maximum size in bytes of the body.
+        :param max_depth: Maximum nesting depth of JSON bodies.
+        :param max_array_length: Maximum number of items of JSON arrays.
+        """
+        self.max_content_length = max_content_length
+        self.max_depth = max_depth
+        self.max_array_length = max_array_length
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the limits of a resource config, or ``None`` if there are none."""
+        limits = cls(
+            max_content_length=config.max_content_length,
+            max_depth=config.max_json_depth,
+            max_array_length=config.max_json_array_length,
+        )
+        if (
+            limits.max_content_length is None
+            and limits.max_depth is None
+            and limits.max_array_length is None
+        ):
+            return None
+        return limits
+
+    def check(self, mimetype):
+        """Check the payload of the current request.
+
+        The declared ``Content-Length`` is checked before reading the body. A
+        body without one (e.g. chunked) is read up to the maximum length. JSON
+        bodies are then read (and cached for the loader) to check their
+        structure.
+
+        :raises PayloadTooLargeRESTError: If the body is too large.
+        :raises InvalidPayloadRESTError: If the JSON structure limits are
+            exceeded.
+        """
+        max_length = self.max_content_length
+        if max_length is not None:
+            content_length = request.content_length
+            if content_length is None:
+                self.read_body(max_length)
+            elif content_length > max_length:
+                raise PayloadTooLargeRESTError()
+
+        if self.max_depth is None and self.max_array_length is None:
+            return
+        if not is_json_mimetype(mimetype):
+            return
+
+        data = request.get_data(cache=True)
+        if max_length is not None and len(data) > max_length:
+            raise PayloadTooLargeRESTError()
+        check_json_structure(data, self.max_depth, self.max_array_length)
+
+    @staticmethod
+    def read_body(max_length):
+        """Read a body of undeclared length, up to the maximum length.
+
+        At most one byte more than the maximum length is read. The request
+        stream is then replaced by the body read, for the loaders.
+
+        :raises PayloadTooLargeRESTError: If the body is too large.
+        """
+        stream = request.stream
+        chunks = []
+        size = 0
+        while size <= max_length:
+            chunk = stream.read(max_length + 1 - size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        if size > max_length:
+            raise PayloadTooLargeRESTError()
+        request.stream = io.BytesIO(b"".join(chunks))
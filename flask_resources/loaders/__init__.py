@@ -7,7 +7,19 @@
 
 """Loaders."""
 
+from .binary import BinaryLoader, CBORLoader, MessagePackLoader
 from .json import JSONLoader
+from .json_patch import JSONPatch, JSONPatchLoader
 from .loaders import LoaderMixin
+from .ndjson import NDJSONLoader
 
-__all__ = ("JSONLoader", "LoaderMixin")
+__all__ = (
+    "BinaryLoader",
+    "CBORLoader",
+    "JSONLoader",
+    "JSONPatch",
+    "JSONPatchLoader",
+    "LoaderMixin",
+    "MessagePackLoader",
+    "NDJSONLoader",
+)
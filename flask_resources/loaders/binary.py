@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""MessagePack and CBOR loaders."""
+
+from flask import request
+
+from ..binary import get_binary_format
+from ..errors import InvalidPayloadRESTError
+from .loaders import LoaderMixin
+
+
+class BinaryLoader(LoaderMixin):
+    """Loader of a binary format (see :mod:`flask_resources.binary`)."""
+
+    format_name = None
+
+    def __init__(self):
+        """Constructor.
+
+        :raises ImportError: If the package of the format is not installed.
+        """
+        self.format = get_binary_format(self.format_name)
+
+    def load_request(self, *args, **kwargs):
+        """Load the body of the request.
+
+        :raises InvalidPayloadRESTError: If the body cannot be decoded, or
+            holds values which JSON cannot represent.
+        """
+        try:
+            return self.format.loads(request.get_data())
+        except self.format.decode_errors:
+            raise InvalidPayloadRESTError(
+                description="Failed to decode {} object.".format(self.label)
+            )
+
+
+class MessagePackLoader(BinaryLoader):
+    """MessagePack (``application/msgpack``) loader."""
+
+    format_name = "msgpack"
+    label = "MessagePack"
+
+
+class CBORLoader(BinaryLoader):
+    """CBOR (``application/cbor``) loader."""
+
+    format_name = "cbor"
+    label = "CBOR"
@@ -8,13 +8,30 @@
 """JSON loader."""
 
 from flask import request
+from werkzeug.exceptions import BadRequest
 
+from ..json_backends import get_json_backend
 from .loaders import LoaderMixin
 
 
 class JSONLoader(LoaderMixin):
-    """JSON loader."""
+    """JSON loader.
+
+    The body is decoded by the JSON backend (see
+    :mod:`flask_resources.json_backends`).
+    """
+
+    def __init__(self, backend=None):
+        """Constructor.
+
+        :param backend: Name of the JSON backend. Defaults to the one
+            configured for the application.
+        """
+        self.backend = backend
 
     def load_request(self, *args, **kwargs):
         """Load the body of the request."""
-        return request.get_json()
+        try:
+            return get_json_backend(self.backend).loads(request.get_data())
+        except ValueError:
+            raise BadRequest("Failed to decode JSON object.")
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""JSON Patch (RFC 6902) loader.
+
+The patch is validated and compiled once when the request is loaded, so that
+applying it does not parse JSON Pointers or check the operations again::
+
+    def partial_update(self, id):
+        record = self.get_record(id)
+        record = resource_requestctx.data.apply(record)
+"""
+
+import re
+from collections import namedtuple
+
+from ..errors import FieldError, InvalidPatchRESTError, PatchConflictRESTError
+from .json import JSONLoader
+
+PatchOperation = namedtuple("PatchOperation", ["op", "path", "value", "from_path"])
+"""A compiled operation. The paths are tuples of reference tokens."""
+
+# Members required by each operation, besides ``op`` and ``path``.
+_REQUIRED_MEMBERS = {
+    "add": ("value",),
+    "remove": (),
+    "replace": ("value",),
+    "move": ("from",),
+    "copy": ("from",),
+    "test": ("value",),
+}
+
+_INVALID_ESCAPE = re.compile(r"~(?![01])")
+_ARRAY_INDEX = re.compile(r"(?:0|[1-9][0-9]*)\Z")
+
+
+def parse_pointer(pointer):
+    """Parse a JSON Pointer (RFC 6901) into a tuple of reference tokens.
+
+    :raises ValueError: If the pointer is invalid.
+    """
+    if not isinstance(pointer, str):
+        raise ValueError("Must be a string.")
+    if not pointer:
+        return ()
+    if pointer[0] != "/":
+        raise ValueError("Must be empty or start with '/'.")
+    tokens = pointer[1:].split("/")
+    if "~" in pointer:
+        if _INVALID_ESCAPE.search(pointer):
+            raise ValueError("Invalid '~' escape.")
+        tokens = [token.replace("~1", "/").replace("~0", "~") for token in tokens]
+    return tuple(tokens)
+
+
+def format_pointer(path):
+    """Format a tuple of reference tokens as a JSON Pointer."""
+    return "".join("/" + token.replace("~", "~0").replace("/", "~1") for token in path)
+
+
+def json_equal(a, b):
+    """Compare two JSON values as the ``test`` operation does (RFC 6902).
+
+    Unlike ``==``, literals are only equal to identical literals (e.g.
+    ``true`` is not equal to ``1``), also within arrays and objects.
+    """
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a is b
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(map(json_equal, a, b))
+    if isinstance(a, dict):
+        return (
+            isinstance(b, dict)
+            and a.keys() == b.keys()
+            and all(json_equal(value, b[key]) for key, value in a.items())
+        )
+    return a == b
+
+
+def compile_operation(operation):
+    """Compile an operation.
+
+    :returns: A tuple of the :class:`PatchOperation` (``None`` if invalid) and
+        of a list of ``(member, message)`` errors.
+    """
+    if not isinstance(operation, dict):
+        return None, [("", "The operation must be an object.")]
+    op = operation.get("op")
+    if op not in _REQUIRED_MEMBERS:
+        return None, [("op", "Unknown operation.")]
+
+    errors = []
+    for member in ("path",) + _REQUIRED_MEMBERS[op]:
+        if member not in operation:
+            errors.append((member, "Missing member."))
+    paths = {}
+    for member in ("path", "from"):
+        if member in operation and (member == "path" or op in ("move", "copy")):
+            try:
+                paths[member] = parse_pointer(operation[member])
+            except ValueError as error:
+                errors.append((member, "Invalid JSON Pointer. {}".format(error)))
+    if errors:
+        return None, errors
+
+    path, from_path = paths["path"], paths.get("from")
+    if op == "remove" and not path:
+        errors.append(("path", "The document root cannot be removed."))
+    if op == "move" and path[: len(from_path)] == from_path and path != from_path:
+        errors.append(("from", "A value cannot be moved into one of its children."))
+    if errors:
+        return None, errors
+    return PatchOperation(op, path, operation.get("value"), from_path), []
+
+
+class JSONPatch(object):
+    """A validated and compiled JSON Patch.
+
+    Applying the patch does not modify the patched document: the containers
+    along the patched paths are (shallowly) copied, at most once per
+    application, and everything else is shared between the documents.
+    Therefore, patching a single field of a large document only copies the
+    objects from the root to that field.
+    """
+
+    def __init__(self, operations):
+        """Constructor.
+
+        :param operations: The list of operations (i.e. the decoded patch).
+        :raises InvalidPatchRESTError: If the patch is invalid. All the
+            invalid operations are reported.
+        """
+        if not isinstance(operations, list):
+            raise InvalidPatchRESTError(
+                description="The patch must be a list of operations."
+            )
+        self.operations = []
+        errors = []
+        for index, operation in enumerate(operations):
+            compiled, operation_errors = compile_operation(operation)
+            self.operations.append(compiled)
+            errors.extend(
+                FieldError("/{}/{}".format(index, member).rstrip("/"), message)
+                for member, message in operation_errors
+            )
+        if errors:
+            raise InvalidPatchRESTError(errors=errors)
+
+    def __len__(self):
+        """Number of operations."""
+        return len(self.operations)
+
+    def __iter__(self):
+        """Iterate over the compiled operations."""
+        return iter(self.operations)
+
+    def apply(self, doc):
+        """Apply the patch to a document.
+
+        :returns: The patched document. ``doc`` itself is not modified.
+        :raises PatchConflictRESTError: If an operation cannot be applied
+            (e.g. its path does not exist, or a ``test`` fails).
+        """
+        # Containers copied during this application, which can be modified in
+        # place by the next operations. They are kept (and not only their id)
+        # so that an id is not reused while applying the patch.
+        owned = {}
+        for index, operation in enumerate(self.operations):
+            try:
+                doc = _APPLY[operation.op](doc, operation, owned)
+            except _Conflict as conflict:
+                raise PatchConflictRESTError(
+                    description="Operation {} ({} {}): {}".format(
+                        index,
+                        operation.op,
+                        format_pointer(operation.path),
+                        conflict.args[0],
+                    )
+                )
+        return doc
+
+
+class _Conflict(Exception):
+    """An operation cannot be applied."""
+
+
+def _own(container, owned):
+    """Get a copy of a container which can be modified in place."""
+    if id(container) in owned:
+        return container
+    if isinstance(container, dict):
+        container = dict(container)
+    elif isinstance(container, list):
+        container = list(container)
+    else:
+        raise _Conflict("The path goes through a scalar value.")
+    owned[id(container)] = container
+    return container
+
+
+def _array_index(array, token, allow_end=False):
+    """Resolve an array index reference token."""
+    if allow_end and token == "-":
+        return len(array)
+    if not _ARRAY_INDEX.match(token):
+        raise _Conflict("'{}' is not an array index.".format(token))
+    index = int(token)
+    if index > len(array) or (index == len(array) and not allow_end):
+        raise _Conflict("The index {} is out of range.".format(index))
+    return index
+
+
+def _child_key(container, token):
+    """Resolve the key (or index) of an existing child of a container."""
+    if isinstance(container, dict):
+        if token not in container:
+            raise _Conflict("The member '{}' does not exist.".format(token))
+        return token
+    if isinstance(container, list):
+        return _array_index(container, token)
+    raise _Conflict("The path goes through a scalar value.")
+
+
+def _get(doc, path):
+    """Get the value of a path."""
+    for token in path:
+        doc = doc[_child_key(doc, token)]
+    return doc
+
+
+def _owned_parent(doc, path, owned):
+    """Copy the containers from the root to the parent of a path.
+
+    :returns: A tuple of the new root and of the parent, both owned.
+    """
+    root = parent = _own(doc, owned)
+    for token in path[:-1]:
+        key = _child_key(parent, token)
+        parent[key] = _own(parent[key], owned)
+        parent = parent[key]
+    return root, parent
+
+
+def _add(doc, path, value, owned):
+    """Add (or replace) the value of a path."""
+    if not path:
+        return value
+    root, parent = _owned_parent(doc, path, owned)
+    if isinstance(parent, list):
+        parent.insert(_array_index(parent, path[-1], allow_end=True), value)
+    else:
+        parent[path[-1]] = value
+    return root
+
+
+def _remove(doc, path, owned):
+    """Remove the value of a path."""
+    root, parent = _owned_parent(doc, path, owned)
+    del parent[_child_key(parent, path[-1])]
+    return root
+
+
+def _apply_add(doc, operation, owned):
+    """Apply an ``add`` operation."""
+    return _add(doc, operation.path, operation.value, owned)
+
+
+def _apply_remove(doc, operation, owned):
+    """Apply a ``remove`` operation."""
+    return _remove(doc, operation.path, owned)
+
+
+def _apply_replace(doc, operation, owned):
+    """Apply a ``replace`` operation."""
+    if not operation.path:
+        return operation.value
+    root, parent = _owned_parent(doc, operation.path, owned)
+    parent[_child_key(parent, operation.path[-1])] = operation.value
+    return root
+
+
+def _apply_move(doc, operation, owned):
+    """Apply a ``move`` operation."""
+    value = _get(doc, operation.from_path)
+    if operation.from_path == operation.path:
+        return doc
+    return _add(_remove(doc, operation.from_path, owned), operation.path, value, owned)
+
+
+def _apply_copy(doc, operation, owned):
+    """Apply a ``copy`` operation."""
+    doc = _add(doc, operation.path, _get(doc, operation.from_path), owned)
+    # The copied value may be an owned container, which is now shared.
+    owned.clear()
+    return doc
+
+
+def _apply_test(doc, operation, owned):
+    """Apply a ``test`` operation."""
+    if not json_equal(_get(doc, operation.path), operation.value):
+        raise _Conflict("The value does not match.")
+    return doc
+
+
+_APPLY = {
+    "add": _apply_add,
+    "remove": _apply_remove,
+    "replace": _apply_replace,
+    "move": _apply_move,
+    "copy": _apply_copy,
+    "test": _apply_test,
+}
+
+
+class JSONPatchLoader(JSONLoader):
+    """JSON Patch (``application/json-patch+json``) loader.
+
+    The loaded data is a :class:`JSONPatch`, to be applied by the resource.
+    """
+
+    def load_request(self, *args, **kwargs):
+        """Load and compile the patch of the request."""
+        return JSONPatch(super(JSONPatchLoader, self).load_request(*args, **kwargs))
@@ -14,3 +14,12 @@ class LoaderMixin:
     def load_request(self, *args, **kwargs):
         """Load the body of the request."""
         raise NotImplementedError()
+
+    def load_request_stream(self, *args, **kwargs):
+        """Load the items of the body of the request incrementally.
+
+        Returns an iterator of the loaded items. By default, the whole body is
+        loaded, and its items are iterated if it is a list.
+        """
+        data = self.load_request(*args, **kwargs)
+        return iter(data if isinstance(data, list) else [data])
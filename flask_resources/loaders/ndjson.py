@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Newline delimited JSON loader."""
+
+from flask import request
+
+from ..errors import InvalidPayloadRESTError, PayloadTooLargeRESTError
+from ..json_backends import get_json_backend
+from .loaders import LoaderMixin
+
+
+class NDJSONLoader(LoaderMixin):
+    """Newline delimited JSON (``application/x-ndjson``) loader.
+
+    The items are parsed one line at a time from the request stream, so the
+    loaded data is an iterator and the body is never fully held in memory.
+    Since the items are loaded while the resource iterates over them, the
+    decoding and size errors are raised from the iteration.
+    """
+
+    def __init__(self, backend=None, max_body_size=None, max_item_size=1024 * 1024):
+        """Constructor.
+
+        :param backend: Name of the JSON backend. Defaults to the one
+            configured for the application.
+        :param max_body_size: Maximum size in bytes of the body, or ``None``.
+        :param max_item_size: Maximum size in bytes of an item (i.e. line).
+        """
+        self.backend = backend
+        self.max_body_size = max_body_size
+        self.max_item_size = max_item_size
+
+    def load_request(self, *args, **kwargs):
+        """Load the items of the body of the request, as an iterator."""
+        return self.load_request_stream(*args, **kwargs)
+
+    def load_request_stream(self, *args, **kwargs):
+        """Load the items of the body of the request incrementally."""
+        if (
+            self.max_body_size is not None
+            and request.content_length is not None
+            and request.content_length > self.max_body_size
+        ):
+            raise PayloadTooLargeRESTError()
+        return self._iter_items(request.stream, get_json_backend(self.backend))
+
+    def _iter_items(self, stream, backend):
+        """Generate the items of a stream."""
+        body_size = 0
+        line_number = 0
+        while True:
+            line = stream.readline(self.max_item_size + 1)
+            if not line:
+                return
+            line_number += 1
+            body_size += len(line)
+            if self.max_body_size is not None and body_size > self.max_body_size:
+                raise PayloadTooLargeRESTError()
+            if len(line) > self.max_item_size and not line.endswith(b"\n"):
+                raise PayloadTooLargeRESTError(
+                    description="Item on line {} is too large.".format(line_number)
+                )
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield backend.loads(line)
+            except ValueError:
+                raise InvalidPayloadRESTError(
+                    description="Failed to decode JSON object on line {}.".format(
+                        line_number
+                    )
+                )
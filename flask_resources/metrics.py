@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Prometheus metrics of the resource requests.
+
+The metrics are recorded by the ``FlaskResources`` extension for the requests
+served by the resource views, and exposed in the Prometheus text format by
+its metrics endpoint (see :mod:`flask_resources.config`).
+
+Each process keeps its own counters. With a pre-fork server, set a shared
+directory: every process then periodically dumps its counters to a file of
+that directory, and the metrics endpoint sums the files of all the processes.
+"""
+
+import atexit
+import json
+import os
+from threading import Lock, get_ident
+from time import monotonic
+
+from .instrumentation import format_histogram, format_labels, new_histogram, observe
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Upper bounds in seconds of the request duration buckets."""
+
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+"""Upper bounds in bytes of the response size buckets."""
+
+METRICS = {
+    "flask_resources_requests_total": (
+        "counter",
+        "Number of resource requests.",
+        ("blueprint", "method", "status"),
+    ),
+    "flask_resources_request_duration_seconds": (
+        "histogram",
+        "Duration of the resource requests.",
+        ("blueprint", "method"),
+    ),
+    "flask_resources_response_size_bytes": (
+        "histogram",
+        "Size of the resource responses bodies.",
+        ("blueprint", "method"),
+    ),
+    "flask_resources_negotiations_total": (
+        "counter",
+        "Content negotiation outcomes (response mimetype or 'unsupported').",
+        ("blueprint", "outcome"),
+    ),
+    "flask_resources_serialized_bytes_total": (
+        "counter",
+        "Number of bytes of the resource responses bodies, as sent.",
+        ("blueprint", "mimetype"),
+    ),
+}
+"""Type, help and label names of the metrics."""
+
+BUCKETS = {
+    "flask_resources_request_duration_seconds": DURATION_BUCKETS,
+    "flask_resources_response_size_bytes": SIZE_BUCKETS,
+}
+"""Buckets of the histograms."""
+
+
+class Metrics(object):
+    """Registry of the resource requests metrics."""
+
+    def __init__(self, directory=None, flush_interval=1.0):
+        """Constructor.
+
+        :param directory: Directory shared by the processes of the server, or
+            ``None`` for a single process.
+        :param flush_interval: Minimum interval in seconds between two dumps
+            of the counters to the shared directory.
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = Lock()
+        self.reset()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            atexit.register(self.flush)
+
+    def reset(self):
+        """Reset the metrics, e.g. in a forked process."""
+        self.pid = os.getpid()
+        self.counters = {}
+        self.histograms = {}
+        self.last_flush = monotonic()
+        self._flush_lock = Lock()
+
+    def record_request(self, blueprint, method, status, duration, mimetype):
+        """Record a resource request."""
+        with self._lock:
+            if os.getpid() != self.pid:
+                self.reset()
+            self._inc("flask_resources_requests_total", (blueprint, method, status))
+            self._observe(
+                "flask_resources_request_duration_seconds",
+                (blueprint, method),
+                duration,
+            )
+            outcome = "unsupported" if status == 415 else mimetype
+            if outcome:
+                self._inc("flask_resources_negotiations_total", (blueprint, outcome))
+        self.maybe_flush()
+
+    def record_size(self, blueprint, method, size, mimetype):
+        """Record the size of a response body."""
+        with self._lock:
+            self._observe(
+                "flask_resources_response_size_bytes", (blueprint, method), size
+            )
+            if mimetype:
+                self._inc(
+                    "flask_resources_serialized_bytes_total",
+                    (blueprint, mimetype),
+                    size,
+                )
+
+    def _inc(self, name, labels, value=1):
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def _observe(self, name, labels, value):
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = new_histogram(BUCKETS[name])
+        observe(histogram, BUCKETS[name], value)
+
+    #
+    # Multiprocess aggregation
+    #
+    def snapshot(self):
+        """Get a JSON serializable copy of the metrics."""
+        with self._lock:
+            return {
+                "counters": [
+                    [name, list(labels), value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                "histograms": [
+                    [name, list(labels), list(counts), total, count]
+                    for (name, labels), (
+                        counts,
+                        total,
+                        count,
+                    ) in self.histograms.items()
+                ],
+            }
+
+    @property
+    def path(self):
+        """Path of the file of the current process in the shared directory."""
+        return os.path.join(self.directory, "metrics-{}.json".format(self.pid))
+
+    def maybe_flush(self):
+        """Dump the metrics, if the flush interval has elapsed.
+
+        The dump is skipped if another thread is already dumping the metrics.
+        """
+        if self.directory is not None:
+            if monotonic() - self.last_flush >= self.flush_interval:
+                if self._flush_lock.acquire(blocking=False):
+                    try:
+                        self._flush()
+                    finally:
+                        self._flush_lock.release()
+
+    def flush(self):
+        """Dump the metrics of the current process to the shared directory."""
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        if self.directory is None or os.getpid() != self.pid:
+            return
+        self.last_flush = monotonic()
+        tmp_path = "{}.{}.tmp".format(self.path, get_ident())
+        with open(tmp_path, "w") as fp:
+            json.dump(self.snapshot(), fp)
+        os.replace(tmp_path, self.path)
+
+    def load_snapshots(self):
+        """Load the snapshots of the other processes from the shared directory."""
+        if self.directory is None:
+            return []
+        snapshots = []
+        own = os.path.basename(self.path)
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json") or filename == own:
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as fp:
+                    snapshots.append(json.load(fp))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def collect(self):
+        """Collect the metrics of all the processes."""
+        counters = {}
+        histograms = {}
+        for snapshot in [self.snapshot()] + self.load_snapshots():
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, counts, total, count in snapshot["histograms"]:
+                key = (name, tuple(labels))
+                histogram = histograms.get(key)
+                if histogram is None:
+                    histogram = histograms[key] = new_histogram(BUCKETS[name])
+                histogram[0] = [a + b for a, b in zip(histogram[0], counts)]
+                histogram[1] += total
+                histogram[2] += count
+        return counters, histograms
+
+    def render(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        counters, histograms = self.collect()
+        lines = []
+        for name, (type_, help_, label_names) in METRICS.items():
+            lines.append("# HELP {} {}".format(name, help_))
+            lines.append("# TYPE {} {}".format(name, type_))
+            samples = counters if type_ == "counter" else histograms
+            for key in sorted(k for k in samples if k[0] == name):
+                labels = format_labels(zip(label_names, key[1]))
+                if type_ == "counter":
+                    lines.append("{}{{{}}} {}".format(name, labels, samples[key]))
+                else:
+                    lines.extend(
+                        format_histogram(name, labels, BUCKETS[name], samples[key])
+                    )
+        return "\n".join(lines) + "\n"
+
+
+class CountedStream(object):
+    """Streamed body counting its bytes, and passing the total to a callback.
+
+    The callback is called once the body is exhausted or closed (i.e. by the
+    WSGI server), but not when it is garbage collected, so that it never runs
+    while the metrics lock is held by the collecting thread.
+    """
+
+    def __init__(self, chunks, callback):
+        """Constructor."""
+        self.chunks = chunks
+        self.iterator = iter(chunks)
+        self.callback = callback
+        self.size = 0
+        self.counted = False
+
+    def __iter__(self):
+        """Iterate over the chunks."""
+        return self
+
+    def __next__(self):
+        """Get the next chunk."""
+        try:
+            chunk = next(self.iterator)
+        except StopIteration:
+            self.count()
+            raise
+        self.size += len(chunk)
+        return chunk
+
+    def count(self):
+        """Pass the size of the body to the callback, once."""
+        if not self.counted:
+            self.counted = True
+            self.callback(self.size)
+
+    def close(self):
+        """Close the body."""
+        try:
+            close = getattr(self.chunks, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self.count()
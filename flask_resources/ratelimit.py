@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Rate limiting and concurrency limiting.
+
+The limits are configured per resource action (``search``, ``create``,
+``read``, ``update``, ``partial_update``, ``delete`` and ``bulk``), e.g. to
+keep expensive searches from starving cheap reads::
+
+    class RecordResourceConfig(ResourceConfig):
+        rate_limits = {"search": RateLimit(rate=5, burst=20)}
+        concurrency_limits = {"search": ConcurrencyLimit(4)}
+
+The state of the limits is kept by a backend. :class:`MemoryBackend` keeps it
+in the process (i.e. per worker), and :class:`RedisBackend` shares it between
+workers. A backend only needs the ``take``, ``acquire`` and ``release``
+methods of :class:`MemoryBackend`.
+"""
+
+from functools import wraps
+from threading import Lock
+from time import monotonic
+
+from flask import request
+
+from .errors import ServiceUnavailableRESTError, TooManyRequestsRESTError
+
+
+def client_key():
+    """Identify the client of the current request by its address."""
+    return request.remote_addr
+
+
+class MemoryBackend(object):
+    """In-process backend.
+
+    The limits are enforced per process: with several workers, each worker
+    enforces them independently.
+    """
+
+    def __init__(self, max_buckets=10000, clock=monotonic):
+        """Constructor.
+
+        :param max_buckets: Number of token buckets after which the full ones
+            (i.e. of the clients which have been idle long enough) are pruned.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.max_buckets = max_buckets
+        self.clock = clock
+        self._lock = Lock()
+        # Key to (tokens, last update, time at which the bucket is full).
+        self._buckets = {}
+        self._slots = {}
+
+    def take(self, key, rate, burst, cost=1):
+        """Take tokens from a token bucket.
+
+        :param rate: Tokens added to the bucket per second.
+        :param burst: Capacity of the bucket.
+        :returns: ``0`` if the tokens were taken, otherwise the number of
+            seconds after which they will be available.
+        """
+        with self._lock:
+            now = self.clock()
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = burst
+                if len(self._buckets) >= self.max_buckets:
+                    self._prune(now)
+            else:
+                tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            wait = 0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            return wait
+
+    def _prune(self, now):
+        """Remove the full buckets."""
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if bucket[2] > now
+        }
+
+    def acquire(self, key, limit):
+        """Acquire one of the ``limit`` slots of a key.
+
+        :returns: ``True`` if a slot was acquired.
+        """
+        with self._lock:
+            count = self._slots.get(key, 0)
+            if count >= limit:
+                return False
+            self._slots[key] = count + 1
+            return True
+
+    def release(self, key):
+        """Release a slot of a key."""
+        with self._lock:
+            count = self._slots.pop(key, 1) - 1
+            if count > 0:
+                self._slots[key] = count
+
+
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "last")
+local tokens = tonumber(bucket[1]) or burst
+local last = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - last) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call("HMSET", KEYS[1], "tokens", tostring(tokens), "last", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+_ACQUIRE_SCRIPT = """
+local count = redis.call("INCR", KEYS[1])
+redis.call("EXPIRE", KEYS[1], ARGV[2])
+if count > tonumber(ARGV[1]) then
+    redis.call("DECR", KEYS[1])
+    return 0
+end
+return 1
+"""
+
+
+_RELEASE_SCRIPT = """
+local count = tonumber(redis.call("GET", KEYS[1])) or 0
+if count > 1 then
+    return redis.call("DECR", KEYS[1])
+end
+redis.call("DEL", KEYS[1])
+return 0
+"""
+
+
+class RedisBackend(object):
+    """Backend shared by the workers through Redis.
+
+    Each check is a single atomic script call, timed by the Redis server's
+    clock.
+
+    .. note::
+
+        The Lua scripts are only exercised by the test suite against a Python
+        reimplementation of the Redis commands they use, not against a Redis
+        server.
+    """
+
+    def __init__(self, client, prefix="flask-resources:limits:", slot_ttl=300):
+        """Constructor.
+
+        :param client: Redis client (e.g. ``redis.Redis``).
+        :param prefix: Prefix of the Redis keys.
+        :param slot_ttl: Seconds after which the slots of a key are reset if
+            no request acquires one, so that the slots leaked by a killed
+            worker are eventually recovered.
+        """
+        self.client = client
+        self.prefix = prefix
+        self.slot_ttl = slot_ttl
+
+    def take(self, key, rate, burst, cost=1):
+        """Take tokens from a token bucket (see :meth:`MemoryBackend.take`)."""
+        wait = self.client.eval(
+            _TAKE_SCRIPT, 1, self.prefix + "rate:" + key, rate, burst, cost
+        )
+        return float(wait)
+
+    def acquire(self, key, limit):
+        """Acquire one of the ``limit`` slots of a key."""
+        acquired = self.client.eval(
+            _ACQUIRE_SCRIPT, 1, self.prefix + "slots:" + key, limit, self.slot_ttl
+        )
+        return bool(int(acquired))
+
+    def release(self, key):
+        """Release a slot of a key.
+
+        The count never goes below zero, e.g. if the slots of the key expired
+        (see ``slot_ttl``) while the request was served.
+        """
+        self.client.eval(_RELEASE_SCRIPT, 1, self.prefix + "slots:" + key)
+
+
+class RateLimit(object):
+    """Token bucket rate limit, per client."""
+
+    def __init__(self, rate, burst=None, key_func=client_key, backend=None):
+        """Constructor.
+
+        :param rate: Requests allowed per second, on average.
+        :param burst: Requests allowed at once. Defaults to ``rate`` (at
+            least 1).
+        :param key_func: Function identifying the client of the current
+            request. Defaults to its address.
+        :param backend: Backend of the buckets. Defaults to a new
+            :class:`MemoryBackend`.
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate)
+        self.key_func = key_func
+        self.backend = backend if backend is not None else MemoryBackend()
+
+    def check(self, scope):
+        """Take a token for the current request.
+
+        :param scope: Key of the limited action.
+        :raises TooManyRequestsRESTError: If the client exceeded the rate.
+        """
+        key = "{}:{}".format(scope, self.key_func())
+        wait = self.backend.take(key, self.rate, self.burst)
+        if wait > 0:
+            raise TooManyRequestsRESTError(retry_after=wait)
+
+
+class ConcurrencyLimit(object):
+    """Maximum number of requests in flight, for all the clients."""
+
+    def __init__(self, limit, backend=None, retry_after=1):
+        """Constructor.
+
+        :param limit: Maximum number of requests in flight.
+        :param backend: Backend of the slots. Defaults to a new
+            :class:`MemoryBackend`, i.e. the limit is per worker process.
+        :param retry_after: ``Retry-After`` of the rejected requests.
+        """
+        self.limit = limit
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.retry_after = retry_after
+
+    def acquire(self, scope):
+        """Acquire a slot for the current request.
+
+        :raises ServiceUnavailableRESTError: If there are no slots left.
+        """
+        if not self.backend.acquire(scope, self.limit):
+            raise ServiceUnavailableRESTError(retry_after=self.retry_after)
+
+    def release(self, scope):
+        """Release the slot of the current request."""
+        self.backend.release(scope)
+
+
+def build_request_limits(config, actions):
+    """Build the limits of each request method of a view.
+
+    :param actions: Map of the request methods to the resource actions.
+    :returns: Map of the request methods to the ``(action, rate limit,
+        concurrency limit)`` of their action. Methods without limits are left
+        out.
+    """
+    limits = {}
+    for method, action in actions.items():
+        rate_limit = config.rate_limits.get(action)
+        concurrency_limit = config.concurrency_limits.get(action)
+        if rate_limit is not None or concurrency_limit is not None:
+            limits[method] = (action, rate_limit, concurrency_limit)
+    if "GET" in limits:
+        limits.setdefault("HEAD", limits["GET"])
+    return limits
+
+
+def request_limiting(f):
+    """Decorator to enforce the request limits of a view.
+
+    The limits are kept per endpoint and action, so that e.g. ``HEAD`` and
+    ``GET`` requests share them. The concurrency slot is held while the view
+    runs, i.e. a streamed response releases it before the body is sent.
+    """
+
+    @wraps(f)
+    def inner(self, *args, **kwargs):
+        limits = self.request_limits.get(request.method)
+        if limits is None:
+            return f(self, *args, **kwargs)
+
+        action, rate_limit, concurrency_limit = limits
+        scope = "{}:{}".format(request.endpoint, action)
+        if rate_limit is not None:
+            rate_limit.check(scope)
+        if concurrency_limit is None:
+            return f(self, *args, **kwargs)
+        concurrency_limit.acquire(scope)
+        try:
+            return f(self, *args, **kwargs)
+        finally:
+            concurrency_limit.release(scope)
+
+    return inner
@@ -14,8 +14,9 @@ from .args import create_request_parser, item_request_parser, search_request_par
 from .loaders import JSONLoader, JSONPatchLoader
 from .response import ItemResponse, ListResponse
 from .serializers import JSONSerializer
-from .views import ItemView, ListView, SingletonView
+from .views import BulkView, ItemView, ListView, SingletonView
 
+BULK_VIEW_SUFFIX = "_bulk"
 ITEM_VIEW_SUFFIX = "_item"
 LIST_VIEW_SUFFIX = "_list"
 
@@ -26,10 +27,26 @@ class ResourceConfig:
     item_request_loaders = {
         "application/json": JSONLoader(),
     }
+    item_patch_loaders = {"application/json-patch+json": JSONPatchLoader()}
     item_response_handlers = {"application/json": ItemResponse(JSONSerializer())}
     item_route = "/resources/<id>"
     list_response_handlers = {"application/json": ListResponse(JSONSerializer())}
     list_route = "/resources/"
+    bulk_route = None
+    bulk_max_operations = 1000
+    bulk_max_workers = None
+    response_formats = {"json": "application/json"}
+    negotiation_cache_size = 128
+    compiled_dispatch = True
+    instrumentation = None
+    max_content_length = None
+    max_json_depth = None
+    max_json_array_length = None
+    rate_limits = {}
+    concurrency_limits = {}
+    request_timeout = None
+    request_timeout_header = "X-Request-Timeout"
+    request_start_header = None
     create_request_parser = create_request_parser
     item_request_parser = item_request_parser
     search_request_parser = search_request_parser
@@ -70,6 +87,23 @@ class ResourceView:
         """Delete an item."""
         raise MethodNotAllowed()
 
+    # Bulk interface
+    def bulk_create(self, data):
+        """Create an item from a bulk operation."""
+        raise MethodNotAllowed()
+
+    def bulk_read(self, id):
+        """Read an item from a bulk operation."""
+        raise MethodNotAllowed()
+
+    def bulk_update(self, id, data):
+        """Update an item from a bulk operation."""
+        raise MethodNotAllowed()
+
+    def bulk_delete(self, id):
+        """Delete an item from a bulk operation."""
+        raise MethodNotAllowed()
+
     # Secondary interface
     def as_blueprint(self, name, **bp_kwargs):
         """Create blueprint and register rules only for the RecordResource."""
@@ -87,7 +121,7 @@ class ResourceView:
             {
                 "rule": self.config.item_route,
                 "view_func": ItemView.as_view(
-                    name="{}{}".format(bp_name), resource=self,
+                    name=bp_name, resource=self,
                 ),
             }
         ]
@@ -97,12 +131,19 @@ class ResourceView:
         return []
 
 
+# Alias kept for the public API (see ``flask_resources.__init__``).
+Resource = ResourceView
+
+
 class CollectionResource(Resource):
     """CollectionResource."""
 
     def create_url_rules(self, bp_name):
-        """Create url rules."""
-        return [
+        """Create url rules.
+
+        The bulk route is only registered if ``bulk_route`` is configured.
+        """
+        rules = [
             {
                 "rule": self.config.item_route,
                 "view_func": ItemView.as_view(
@@ -116,6 +157,16 @@ class CollectionResource(Resource):
                 ),
             },
         ]
+        if self.config.bulk_route:
+            rules.append(
+                {
+                    "rule": self.config.bulk_route,
+                    "view_func": BulkView.as_view(
+                        name="{}{}".format(bp_name, BULK_VIEW_SUFFIX), resource=self,
+                    ),
+                }
+            )
+        return rules
 
 
 class SingletonResource(Resource):
@@ -127,7 +178,7 @@ class SingletonResource(Resource):
             {
                 "rule": self.config.list_route,
                 "view_func": SingletonView.as_view(
-                    name="{}{}".format(bp_name), resource=self,
+                    name=bp_name, resource=self,
                 ),
             }
         ]
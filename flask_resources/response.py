@@ -7,21 +7,114 @@
 
 """Response module."""
 
-from flask import make_response
+from datetime import timezone
 
-from .context import resource_requestctx
+from flask import current_app, make_response, request, stream_with_context
+from werkzeug.http import http_date, is_resource_modified, quote_etag, unquote_etag
+
+from .context import get_resource_requestctx
+from .serializers import SerializableMixin
+
+
+def get_etag(content):
+    """Get the (unquoted) strong ETag of a ``SerializableMixin`` content."""
+    if isinstance(content, SerializableMixin):
+        try:
+            version = content.version
+        except NotImplementedError:
+            return None
+        if version is not None:
+            return str(version)
+    return None
+
+
+def get_cache_id():
+    """Get the cache identifier of the item of the current request.
+
+    It is built from all the URL arguments of the item route (e.g.
+    ``pid_type=recid,pid_value=1``), so that any route can be cached. It is
+    ``None`` when the route has no arguments.
+    """
+    if not request.view_args:
+        return None
+    return ",".join(
+        "{}={}".format(name, value) for name, value in sorted(request.view_args.items())
+    )
+
+
+def variant_etag(etag, encoding):
+    """Get the (unquoted) strong ETag of a content-coding of a representation.
+
+    Strong validators must differ across content-codings (RFC 7232), so the
+    ETag of a compressed body is suffixed with its content-coding.
+    """
+    return "{}-{}".format(etag, encoding)
+
+
+def get_last_modified(content):
+    """Get the last modification date (naive UTC) of a serializable content."""
+    if isinstance(content, SerializableMixin):
+        try:
+            last_modified = content.last_modified
+        except NotImplementedError:
+            return None
+        if last_modified is not None and last_modified.tzinfo is not None:
+            last_modified = last_modified.astimezone(timezone.utc).replace(tzinfo=None)
+        return last_modified
+    return None
 
 
 class ResponseMixin:
     """Response interface."""
 
+    compression = None
+    """Optional ``flask_resources.compression.Compression`` of the bodies."""
+
     def make_header(self, content=None):
-        """Build response headers."""
-        return {
-            "content-type": resource_requestctx.payload_mimetype,
-            # todo: should etag and last modified be set from here somehow as
-            #       well as link headers.
-        }
+        """Build response headers.
+
+        The ``ETag`` and ``Last-Modified`` headers are set from the content if
+        it implements ``SerializableMixin``.
+        """
+        # todo: link headers.
+        headers = {"content-type": get_resource_requestctx().accept_mimetype}
+
+        etag = get_etag(content)
+        if etag is not None:
+            headers["ETag"] = quote_etag(etag)
+        last_modified = get_last_modified(content)
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified)
+
+        return headers
+
+    def negotiate_encoding(self, headers):
+        """Select the content-coding of the response, if compression is enabled."""
+        if self.compression is None:
+            return None
+        headers["Vary"] = "Accept-Encoding"
+        return self.compression.negotiate()
+
+    def compress(self, data, encoding, headers):
+        """Compress the body with the given content-coding.
+
+        Bodies smaller than the compression minimum size are not compressed.
+        """
+        if encoding is None:
+            return data
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        data, encoding = self.compression.compress(data, encoding)
+        if encoding is not None:
+            self.set_content_encoding(headers, encoding)
+        return data
+
+    def set_content_encoding(self, headers, encoding):
+        """Set the content-coding of the body, and the ETag of the variant."""
+        headers["Content-Encoding"] = encoding
+        if "ETag" in headers:
+            etag, _ = unquote_etag(headers["ETag"])
+            headers["ETag"] = quote_etag(variant_etag(etag, encoding))
 
     def make_response(self, code, content):
         """Builds a response."""
@@ -36,20 +129,109 @@ class ItemResponse(ResponseMixin):
     """Item response representation.
 
     Builds up a reponse for a single object.
+
+    If a ``ResponseCache`` is given, the serialized item (if it implements
+    ``SerializableMixin``) is cached per version and reused by the following
+    ``GET`` requests, along with its compressed variants. The views invalidate
+    it on update and delete.
     """
 
-    def __init__(self, serializer=None):
-        """Constructor."""
+    def __init__(self, serializer=None, cache=None, compression=None):
+        """Constructor.
+
+        :param serializer: The serializer of the object.
+        :param cache: A ``flask_resources.cache.ResponseCache``.
+        :param compression: A ``flask_resources.compression.Compression``.
+        """
         self.serializer = serializer
+        self.cache = cache
+        self.compression = compression
 
     def make_response(self, code, content):
-        """Builds a response for a single object."""
+        """Builds a response for a single object.
+
+        Conditional ``GET``/``HEAD`` requests (``If-None-Match`` and
+        ``If-Modified-Since``) matching the content are answered with a
+        ``304 Not Modified`` without serializing the content. Projected
+        (``?fields=``) representations have no ``ETag`` (which is the one of
+        the full representation) and are neither validated nor cached.
+        """
         # https://flask.palletsprojects.com/en/1.1.x/api/#flask.Flask.make_response
         # (body, status, header)
+        headers = self.make_header(content)
+        encoding = self.negotiate_encoding(headers)
+        projected = get_resource_requestctx().fields is not None
+        if projected:
+            headers.pop("ETag", None)
 
-        return make_response(
-            self.serializer.serialize_object(content), code, self.make_header(),
-        )
+        if code == 200 and request.method in ("GET", "HEAD") and not projected:
+            etag = self.get_validator(headers, encoding)
+            if not is_resource_modified(
+                request.environ,
+                etag=etag,
+                last_modified=get_last_modified(content),
+            ):
+                if etag is not None:
+                    headers["ETag"] = etag
+                return make_response(b"", 304, headers)
+
+            if self.cache is not None:
+                return make_response(
+                    self.serialize_cached_object(content, encoding, headers),
+                    code,
+                    headers,
+                )
+
+        with get_resource_requestctx().measure("serialize"):
+            data = self.serializer.serialize_object(content)
+        return make_response(self.compress(data, encoding, headers), code, headers)
+
+    def get_validator(self, headers, encoding):
+        """Get the (quoted) ETag which ``If-None-Match`` is matched against.
+
+        The client may hold either the compressed variant of the negotiated
+        content-coding, or the identity one (e.g. if the body was smaller than
+        the compression minimum size).
+        """
+        etag = headers.get("ETag")
+        if etag is None or encoding is None:
+            return etag
+        variant = variant_etag(unquote_etag(etag)[0], encoding)
+        if request.if_none_match.contains(variant):
+            return quote_etag(variant)
+        return etag
+
+    def serialize_cached_object(self, content, encoding, headers):
+        """Serialize (and compress) the object, going through the response cache.
+
+        The compressed variant is cached as well, so it is not recompressed.
+        """
+        id_ = get_cache_id()
+        version = get_etag(content)
+        if id_ is None or version is None:
+            with get_resource_requestctx().measure("serialize"):
+                data = self.serializer.serialize_object(content)
+            return self.compress(data, encoding, headers)
+
+        key = (request.blueprint, id_, version, headers["content-type"])
+        if encoding is not None:
+            data = self.cache.get(*key, encoding=encoding)
+            if data is not None:
+                self.set_content_encoding(headers, encoding)
+                return data
+
+        data = self.cache.get(*key)
+        if data is None:
+            with get_resource_requestctx().measure("serialize"):
+                data = self.serializer.serialize_object(content)
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            self.cache.set(*key, data)
+
+        compressed = self.compress(data, encoding, headers)
+        if "Content-Encoding" in headers:
+            self.cache.set(*key, compressed, encoding=encoding)
+        return compressed
 
     def make_error_response(self, error):
         """Builds an error response."""
@@ -62,19 +244,56 @@ class ListResponse(ResponseMixin):
     """List response representation.
 
     Builds up a reponse for a list of objects.
+
+    In streaming mode, the list is serialized incrementally (see
+    ``SerializerMixin.serialize_object_list_stream``) and sent as a chunked
+    response, so the content can be an iterator of objects and the worker
+    memory stays flat for large lists. Note that errors raised while streaming
+    can no longer change the response status.
     """
 
-    def __init__(self, serializer=None):
-        """Constructor."""
+    def __init__(
+        self, serializer=None, stream=False, chunk_size=64 * 1024, compression=None
+    ):
+        """Constructor.
+
+        :param serializer: The serializer of the list.
+        :param stream: Whether to stream the response.
+        :param chunk_size: Minimum size in bytes of the streamed chunks.
+        :param compression: A ``flask_resources.compression.Compression``.
+            Streamed responses are compressed incrementally.
+        """
         self.serializer = serializer
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.compression = compression
 
     def make_response(self, code, content):
         """Builds a response for a list of objects."""
         # https://flask.palletsprojects.com/en/1.1.x/api/#flask.Flask.make_response
         # (body, status, header)
+        if self.stream:
+            return self.make_stream_response(code, content)
 
-        return make_response(
-            self.serializer.serialize_object_list(content), code, self.make_header(),
+        headers = self.make_header()
+        encoding = self.negotiate_encoding(headers)
+        with get_resource_requestctx().measure("serialize"):
+            data = self.serializer.serialize_object_list(content)
+        return make_response(self.compress(data, encoding, headers), code, headers)
+
+    def make_stream_response(self, code, content):
+        """Builds a chunked response streaming the list of objects."""
+        headers = self.make_header()
+        encoding = self.negotiate_encoding(headers)
+        chunks = buffer_chunks(
+            self.serializer.serialize_object_list_stream(content), self.chunk_size
+        )
+        if encoding is not None:
+            chunks = self.compression.compress_stream(chunks, encoding)
+            self.set_content_encoding(headers, encoding)
+
+        return current_app.response_class(
+            stream_with_context(chunks), status=code, headers=headers
         )
 
     def make_error_response(self, error):
@@ -84,3 +303,18 @@ class ListResponse(ResponseMixin):
         return make_response(
             self.serializer.serialize_error(error), error.code, self.make_header()
         )
+
+
+def buffer_chunks(chunks, size):
+    """Join small chunks of bytes into chunks of at least ``size`` bytes."""
+    buffer = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
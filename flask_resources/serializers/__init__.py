@@ -7,7 +7,26 @@
 
 """Serializers."""
 
+from .binary import BinarySerializer, CBORSerializer, MessagePackSerializer
+from .csv import CSVSerializer
 from .json import JSONSerializer
-from .serializers import SerializableMixin, SerializerMixin
+from .ndjson import NDJSONSerializer
+from .serializers import (
+    SearchResult,
+    SearchResultMixin,
+    SerializableMixin,
+    SerializerMixin,
+)
 
-__all__ = ("JSONSerializer", "SerializableMixin", "SerializerMixin")
+__all__ = (
+    "BinarySerializer",
+    "CBORSerializer",
+    "CSVSerializer",
+    "JSONSerializer",
+    "MessagePackSerializer",
+    "NDJSONSerializer",
+    "SearchResult",
+    "SearchResultMixin",
+    "SerializableMixin",
+    "SerializerMixin",
+)
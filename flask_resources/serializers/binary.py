@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""MessagePack and CBOR serializers.
+
+Meant for internal consumers, negotiated next to JSON::
+
+    item_response_handlers = {
+        "application/json": Response(JSONSerializer()),
+        "application/msgpack": Response(MessagePackSerializer()),
+        "application/cbor": Response(CBORSerializer()),
+    }
+"""
+
+from collections.abc import Iterator, Mapping
+
+from .. import binary
+from .serializers import SerializerMixin
+
+
+class BinarySerializer(SerializerMixin):
+    """Serializer of a binary format (see :mod:`flask_resources.binary`).
+
+    The objects are rendered like by the ``JSONSerializer`` (same envelope,
+    sparse fieldsets and value conversions), only the encoding differs.
+    """
+
+    format_name = None
+
+    def __init__(self, envelope=None):
+        """Constructor.
+
+        :param envelope: Parts of the search results envelope to render.
+        :raises ImportError: If the package of the format is not installed.
+        """
+        self.format = binary.get_binary_format(self.format_name)
+        if envelope is not None:
+            self.envelope = tuple(envelope)
+
+    def dumps(self, obj):
+        """Dump an object into bytes."""
+        return self.format.dumps(obj)
+
+    def serialize_object(self, object, response_ctx=None, *args, **kwargs):
+        """Dump the object into bytes.
+
+        Only the fields requested with ``?fields=`` are dumped.
+        """
+        fields = self.get_fields()
+        if fields is not None:
+            object = self.project(object, fields)
+        return self.dumps(object)
+
+    def serialize_object_list(self, object_list, response_ctx=None, *args, **kwargs):
+        """Dump the object list into bytes."""
+        return self.dumps(self.prepare_list(object_list))
+
+    def serialize_object_list_stream(
+        self, object_list, response_ctx=None, *args, **kwargs
+    ):
+        """Dump the object list into a single bytes chunk.
+
+        The length of the arrays must be known before their items are encoded,
+        so the list is fully loaded.
+        """
+        return [self.serialize_object_list(object_list)]
+
+    def serialize_error(self, error, response_ctx=None, *args, **kwargs):
+        """Serialize an error reponse according to the response ctx."""
+        return self.dumps(self.get_error_body(error))
+
+
+class MessagePackSerializer(BinarySerializer):
+    """MessagePack (``application/msgpack``) serializer."""
+
+    format_name = "msgpack"
+
+
+class CBORSerializer(BinarySerializer):
+    """CBOR (``application/cbor``) serializer.
+
+    Streamed lists are encoded as indefinite-length arrays, one object at a
+    time.
+    """
+
+    format_name = "cbor"
+
+    def serialize_object_list_stream(
+        self, object_list, response_ctx=None, *args, **kwargs
+    ):
+        """Dump the object list into bytes chunks, one object at a time.
+
+        As for the ``JSONSerializer``, the iterator values of an envelope
+        (e.g. the hits) are streamed too.
+        """
+        object_list = self.prepare_list(object_list)
+        if isinstance(object_list, Mapping):
+            return self._stream_mapping(object_list)
+        return self._stream_list(object_list)
+
+    def _stream_list(self, object_list):
+        """Generate the chunks of an indefinite-length array."""
+        yield b"\x9f"
+        for obj in object_list:
+            yield self.dumps(obj)
+        yield b"\xff"
+
+    def _stream_mapping(self, mapping):
+        """Generate the chunks of an indefinite-length map."""
+        yield b"\xbf"
+        for key, value in mapping.items():
+            yield self.dumps(key)
+            if isinstance(value, Iterator):
+                yield from self._stream_list(value)
+            elif isinstance(value, Mapping):
+                yield from self._stream_mapping(value)
+            else:
+                yield self.dumps(value)
+        yield b"\xff"
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""CSV serializer.
+
+Meant for data exports, e.g. with a streamed list response::
+
+    list_response_handlers = {
+        "application/json": ListResponse(JSONSerializer()),
+        "text/csv": ListResponse(
+            CSVSerializer(["id", ("Title", "metadata.title")]), stream=True
+        ),
+    }
+"""
+
+import csv
+import io
+from collections.abc import Mapping
+from itertools import islice
+from operator import methodcaller
+
+from .. import json_backends
+from .serializers import SerializableMixin, SerializerMixin
+
+_PLAIN_TYPES = frozenset([str, int, float, type(None)])
+
+_FORMULA_PREFIXES = ("=", "+", "-", "@")
+
+
+def compile_column(path):
+    """Compile a dotted path (e.g. ``metadata.title``) into a getter.
+
+    The getter returns ``None`` if a key of the path is missing.
+    """
+    keys = path.split(".")
+    if len(keys) == 1:
+        return methodcaller("get", keys[0])
+
+    def getter(obj):
+        try:
+            for key in keys:
+                obj = obj.get(key)
+        except AttributeError:
+            # Not a mapping (e.g. a missing key gave ``None``)
+            return None
+        return obj
+
+    return getter
+
+
+def format_value(value, dumps):
+    """Format a value which the CSV writer does not handle as expected.
+
+    Booleans are written as ``true``/``false``, lists and objects as JSON
+    (dumped by the given JSON backend ``dumps``).
+    """
+    if value is True or value is False:
+        return "true" if value else "false"
+    if not isinstance(value, (list, tuple, Mapping)):
+        try:
+            value = json_backends.default(value)
+        except TypeError:
+            return value
+        if not isinstance(value, (list, Mapping)):
+            return value
+    return dumps(value).decode("utf-8")
+
+
+def escape_formula(value):
+    """Escape a string which a spreadsheet would evaluate as a formula.
+
+    The string is prefixed with ``'``, so that it is displayed as text
+    (i.e. against CSV injection).
+    """
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class CSVSerializer(SerializerMixin):
+    """CSV serializer of object lists.
+
+    The columns are compiled once, when the serializer is created. Each row is
+    extracted from an object by the column getters, and the rows are written
+    incrementally, so a streamed list is never held in memory. Search results
+    are written as their hits only (i.e. the total is not counted).
+    """
+
+    envelope = ("hits",)
+
+    def __init__(
+        self,
+        columns,
+        backend=None,
+        header=True,
+        batch_size=500,
+        escape_formulas=True,
+        **fmtparams
+    ):
+        """Constructor.
+
+        :param columns: List of the columns, either a dotted path (also used
+            as the column header), a ``(header, dotted path)`` tuple, or a
+            ``(header, callable)`` tuple where the callable gets the object.
+        :param backend: Name of the JSON backend of the list and object
+            values. Defaults to the one configured for the application.
+        :param header: Whether to write the header row.
+        :param batch_size: Number of rows written per chunk.
+        :param escape_formulas: Whether to escape the values starting with
+            ``=``, ``+``, ``-`` or ``@`` (see :func:`escape_formula`).
+        :param fmtparams: Formatting parameters of the CSV writer (see
+            :func:`csv.writer`).
+        """
+        self.headers = []
+        getters = []
+        for column in columns:
+            if isinstance(column, str):
+                column = (column, column)
+            name, getter = column
+            self.headers.append(name)
+            getters.append(
+                compile_column(getter) if isinstance(getter, str) else getter
+            )
+        self.getters = tuple(getters)
+        self.backend = backend
+        self.header = header
+        self.batch_size = batch_size
+        self.escape_formulas = escape_formulas
+        self.fmtparams = fmtparams
+
+    def extract_row(self, obj, dumps):
+        """Extract the row of an object."""
+        if isinstance(obj, SerializableMixin):
+            obj = obj.object
+        row = [getter(obj) for getter in self.getters]
+        if not _PLAIN_TYPES.issuperset(map(type, row)):
+            row = [
+                value if type(value) in _PLAIN_TYPES else format_value(value, dumps)
+                for value in row
+            ]
+        if self.escape_formulas:
+            row = [escape_formula(value) for value in row]
+        return row
+
+    def write_rows(self, rows):
+        """Write rows into CSV bytes chunks, ``batch_size`` rows at a time."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, **self.fmtparams)
+        if self.header:
+            writer.writerow(self.headers)
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if batch:
+                writer.writerows(batch)
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+            if len(batch) < self.batch_size:
+                return
+
+    def serialize_object(self, object, response_ctx=None, *args, **kwargs):
+        """Dump the object into a CSV row (with the header row)."""
+        dumps = json_backends.get_json_backend(self.backend).dumps
+        return b"".join(self.write_rows([self.extract_row(object, dumps)]))
+
+    def serialize_object_list(self, object_list, response_ctx=None, *args, **kwargs):
+        """Dump the object list into CSV bytes."""
+        return b"".join(self.serialize_object_list_stream(object_list))
+
+    def serialize_object_list_stream(
+        self, object_list, response_ctx=None, *args, **kwargs
+    ):
+        """Dump the object list into CSV bytes chunks."""
+        dumps = json_backends.get_json_backend(self.backend).dumps
+        objects = self.get_hits(object_list)
+        return self.write_rows(self.extract_row(obj, dumps) for obj in objects)
+
+    def serialize_error(self, error, response_ctx=None, *args, **kwargs):
+        """Serialize an error reponse according to the response ctx."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, **self.fmtparams)
+        writer.writerows([["message"], [error.description]])
+        return buffer.getvalue().encode("utf-8")
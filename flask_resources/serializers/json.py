@@ -7,24 +7,96 @@
 
 """JSON serializer."""
 
-import json
+from collections.abc import Iterator, Mapping
 
+from .. import json_backends
 from .serializers import SerializerMixin
 
 
 class JSONSerializer(SerializerMixin):
-    """JSON serializer implementation."""
+    """JSON serializer implementation.
+
+    The serialized output is returned as ``bytes``, encoded by the JSON backend
+    (see :mod:`flask_resources.json_backends`).
+    """
+
+    def __init__(self, backend=None, envelope=None):
+        """Constructor.
+
+        :param backend: Name of the JSON backend. Defaults to the one
+            configured for the application.
+        :param envelope: Parts of the search results envelope to render.
+        """
+        self.backend = backend
+        if envelope is not None:
+            self.envelope = tuple(envelope)
+
+    def dumps(self, obj):
+        """Dump an object into JSON bytes."""
+        return json_backends.get_json_backend(self.backend).dumps(obj)
 
     def serialize_object(self, object, response_ctx=None, *args, **kwargs):
-        """Dump the object into a json string."""
-        return json.dumps(object)
+        """Dump the object into json bytes.
+
+        Only the fields requested with ``?fields=`` are dumped.
+        """
+        fields = self.get_fields()
+        if fields is not None:
+            object = self.project(object, fields)
+        return self.dumps(object)
 
     def serialize_object_list(self, object_list, response_ctx=None, *args, **kwargs):
-        """Dump the object list into a json string."""
-        return json.dumps(object_list)
+        """Dump the object list into json bytes.
+
+        A ``SearchResultMixin`` is dumped as its envelope. Only the fields
+        requested with ``?fields=`` of the objects are dumped (unless the
+        object list is a custom mapping).
+        """
+        return self.dumps(self.prepare_list(object_list))
+
+    def serialize_object_list_stream(
+        self, object_list, response_ctx=None, *args, **kwargs
+    ):
+        """Dump the object list into json bytes chunks, one object at a time.
+
+        The object list can either be an iterable of objects, a mapping (the
+        envelope) in which the iterator values (e.g. the hits), possibly
+        nested, are streamed as JSON arrays, or a ``SearchResultMixin``.
+        """
+        dumps = json_backends.get_json_backend(self.backend).dumps
+        object_list = self.prepare_list(object_list)
+        if isinstance(object_list, Mapping):
+            return self._stream_mapping(dumps, object_list)
+        return self._stream_list(dumps, object_list)
+
+    def _stream_list(self, dumps, object_list):
+        """Generate the chunks of a JSON array."""
+        yield b"["
+        separator = b""
+        for obj in object_list:
+            yield separator
+            yield dumps(obj)
+            separator = b","
+        yield b"]"
+
+    def _stream_mapping(self, dumps, mapping):
+        """Generate the chunks of a JSON object, streaming its iterators."""
+        separator = b"{"
+        for key, value in mapping.items():
+            yield separator
+            yield dumps(key)
+            yield b":"
+            if isinstance(value, Iterator):
+                yield from self._stream_list(dumps, value)
+            elif isinstance(value, Mapping):
+                yield from self._stream_mapping(dumps, value)
+            else:
+                yield dumps(value)
+            separator = b","
+        yield b"}" if mapping else b"{}"
 
     def serialize_error(self, error, response_ctx=None, *args, **kwargs):
         """Serialize an error reponse according to the response ctx."""
         # NOTE: In non-overwritten exceptions (i.e. coming from Werkzeug)
         # `get_description` returns HTML tags.
-        return json.dumps(error.description)
+        return self.dumps(self.get_error_body(error))
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Newline delimited JSON serializer."""
+
+from .. import json_backends
+from .serializers import SerializerMixin
+
+
+class NDJSONSerializer(SerializerMixin):
+    """Newline delimited JSON (``application/x-ndjson``) serializer.
+
+    Each object of a list is dumped on its own line, so that the list can be
+    streamed and consumed one object at a time. Search results are dumped as
+    their hits only (i.e. the total is not counted).
+    """
+
+    envelope = ("hits",)
+
+    def __init__(self, backend=None):
+        """Constructor.
+
+        :param backend: Name of the JSON backend. Defaults to the one
+            configured for the application.
+        """
+        self.backend = backend
+
+    def dumps(self, obj):
+        """Dump an object into a JSON line."""
+        return json_backends.get_json_backend(self.backend).dumps(obj) + b"\n"
+
+    def serialize_object(self, object, response_ctx=None, *args, **kwargs):
+        """Dump the object into a JSON line.
+
+        Only the fields requested with ``?fields=`` are dumped.
+        """
+        fields = self.get_fields()
+        if fields is not None:
+            object = self.project(object, fields)
+        return self.dumps(object)
+
+    def serialize_object_list(self, object_list, response_ctx=None, *args, **kwargs):
+        """Dump the object list into JSON lines."""
+        return b"".join(self.serialize_object_list_stream(object_list))
+
+    def serialize_object_list_stream(
+        self, object_list, response_ctx=None, *args, **kwargs
+    ):
+        """Dump the object list into JSON lines, one object at a time."""
+        dumps = json_backends.get_json_backend(self.backend).dumps
+        objects = self.get_hits(object_list)
+        fields = self.get_fields()
+        if fields is not None:
+            objects = self.project_list(objects, fields)
+        return (dumps(obj) + b"\n" for obj in objects)
+
+    def serialize_error(self, error, response_ctx=None, *args, **kwargs):
+        """Serialize an error reponse according to the response ctx."""
+        return self.dumps(self.get_error_body(error))
@@ -7,6 +7,13 @@
 
 """Serializers required interfaces."""
 
+from collections.abc import Iterator, Mapping
+
+from ..args.fields import project
+from ..args.paginate import build_links
+from ..context import get_resource_requestctx
+from ..errors import RESTException
+
 
 class SerializableMixin:
     """Serializable Interface.
@@ -15,29 +22,197 @@ class SerializableMixin:
     """
 
     @property
-    def object():
+    def object(self):
         """Returns the object itself."""
         raise NotImplementedError()
 
     @property
-    def id():
+    def id(self):
         """Returns the object id."""
         raise NotImplementedError()
 
     @property
-    def version():
+    def version(self):
         """Returns the object version or revision."""
         raise NotImplementedError()
 
     @property
-    def last_modified():
+    def last_modified(self):
         """Returns the date of the last modification."""
         raise NotImplementedError()
 
 
+class SearchResultMixin:
+    """Search result interface.
+
+    Resources can return it from ``search`` so that the serializers render it
+    in an envelope. The total and the aggregations should only be computed
+    when accessed, since some serializers do not render them.
+    """
+
+    @property
+    def hits(self):
+        """Returns the (iterable of) hits."""
+        raise NotImplementedError()
+
+    @property
+    def total(self):
+        """Returns the total number of hits, or ``None``."""
+        raise NotImplementedError()
+
+    @property
+    def aggregations(self):
+        """Returns the aggregations, or ``None``."""
+        raise NotImplementedError()
+
+    @property
+    def links(self):
+        """Returns the links, or ``None``."""
+        raise NotImplementedError()
+
+
+class SearchResult(SearchResultMixin):
+    """Search result with lazily evaluated total and aggregations.
+
+    The total and aggregations can be given as callables (e.g. issuing the
+    count or aggregation query to the backend), which are called at most
+    once, on first access. The links default to the full URLs built by
+    ``build_links`` from the pagination of the request.
+    """
+
+    def __init__(self, hits, total=None, aggregations=None, links=None):
+        """Constructor."""
+        self._hits = hits
+        self._total = total
+        self._aggregations = aggregations
+        self._links = links
+
+    @property
+    def hits(self):
+        """Returns the (iterable of) hits."""
+        return self._hits
+
+    @property
+    def total(self):
+        """Returns the total number of hits, or ``None``."""
+        if callable(self._total):
+            self._total = self._total()
+        return self._total
+
+    @property
+    def aggregations(self):
+        """Returns the aggregations, or ``None``."""
+        if callable(self._aggregations):
+            self._aggregations = self._aggregations()
+        return self._aggregations
+
+    @property
+    def links(self):
+        """Returns the links, or ``None``."""
+        if self._links is None:
+            try:
+                request_args = get_resource_requestctx().request_args or {}
+            except RuntimeError:
+                return None
+            if "pagination" not in request_args:
+                return None
+            # Only use the total if it is already known.
+            total = None if callable(self._total) else self._total
+            return build_links(request_args, total=total)
+        return self._links
+
+
 class SerializerMixin:
     """Serializer Interface."""
 
+    envelope = ("hits", "total", "aggregations", "links")
+    """Parts of the search results envelope rendered by the serializer."""
+
+    def get_fields(self):
+        """Get the sparse fieldset of the current request, if any."""
+        try:
+            return get_resource_requestctx().fields
+        except RuntimeError:
+            return None
+
+    def project(self, obj, fields):
+        """Keep only the given fields of an object."""
+        if isinstance(obj, SerializableMixin):
+            obj = obj.object
+        return project(obj, fields)
+
+    def project_list(self, object_list, fields):
+        """Keep only the given fields of the objects of a list.
+
+        Iterators are projected lazily, so that they can still be streamed.
+        """
+        if isinstance(object_list, Iterator):
+            return (self.project(obj, fields) for obj in object_list)
+        return [self.project(obj, fields) for obj in object_list]
+
+    def get_error_body(self, error):
+        """Get the body of an error response.
+
+        REST errors are rendered with their status, message and field errors,
+        other HTTP errors (i.e. coming from Werkzeug) with their description.
+        """
+        if isinstance(error, RESTException):
+            return error.to_dict()
+        return error.description
+
+    def get_hits(self, object_list):
+        """Get the objects of an object list, without the search envelope."""
+        if isinstance(object_list, SearchResultMixin):
+            return object_list.hits
+        return object_list
+
+    def make_envelope(self, search_result, fields=None):
+        """Build the envelope of a search result.
+
+        Only the parts listed in ``envelope`` are evaluated, so e.g. the total
+        is not counted if the serializer does not render it::
+
+            {
+                "hits": {"hits": [...], "total": 10},
+                "aggregations": {...},
+                "links": {...}
+            }
+
+        ``None`` parts are left out. If a sparse fieldset is given, it is
+        applied to the hits, and the total and the aggregations are left out
+        (i.e. not computed) of such lightweight requests.
+        """
+        parts = self.envelope
+        if fields is not None:
+            parts = [part for part in parts if part not in ("total", "aggregations")]
+        envelope = {}
+        hits = {}
+        if "hits" in parts:
+            hits["hits"] = search_result.hits
+            if fields is not None:
+                hits["hits"] = self.project_list(hits["hits"], fields)
+        if "total" in parts:
+            total = search_result.total
+            if total is not None:
+                hits["total"] = total
+        if hits:
+            envelope["hits"] = hits
+        for part in ("aggregations", "links"):
+            if part in parts:
+                value = getattr(search_result, part)
+                if value is not None:
+                    envelope[part] = value
+        return envelope
+
+    def prepare_list(self, object_list):
+        """Build the envelope and apply the sparse fieldset of an object list."""
+        fields = self.get_fields()
+        if isinstance(object_list, SearchResultMixin):
+            return self.make_envelope(object_list, fields)
+        if fields is not None and not isinstance(object_list, Mapping):
+            return self.project_list(object_list, fields)
+        return object_list
+
     def serialize_object(self, object, response_ctx=None, *args, **kwargs):
         """Serialize a single object according to the response ctx.
 
@@ -52,6 +227,16 @@ class SerializerMixin:
         """
         raise NotImplementedError()
 
+    def serialize_object_list_stream(
+        self, object_list, response_ctx=None, *args, **kwargs
+    ):
+        """Serialize a list of objects incrementally, one object at a time.
+
+        Returns an iterable of ``bytes`` chunks, so that the list (which can be
+        an iterator) never has to be fully loaded or serialized in memory.
+        """
+        raise NotImplementedError()
+
     def serialize_error(self, error, response_ctx=None, *args, **kwargs):
         """Serialize an error reponse according to the response ctx."""
         raise NotImplementedError()
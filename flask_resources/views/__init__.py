@@ -7,7 +7,8 @@
 
 """Views."""
 
+from .bulk import BulkView
 from .collections import ItemView, ListView
 from .singleton import SingletonView
 
-__all__ = ("ItemView", "ListView", "SingletonView")
+__all__ = ("BulkView", "ItemView", "ListView", "SingletonView")
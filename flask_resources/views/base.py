@@ -12,30 +12,150 @@ The views responsabilities are:
 - Build a request context for the resource.
 """
 
+from flask import request
 from flask.views import MethodView
 
-from ..content_negotiation import content_negotiation
+from ..content_negotiation import CompiledNegotiator, content_negotiation
 from ..context import with_resource_requestctx
+from ..coroutines import call
+from ..deadlines import DeadlinePolicy, shed_expired, with_deadline
+from ..instrumentation import instrumentation
+from ..limits import PayloadLimits
+from ..ratelimit import build_request_limits, request_limiting
 
 
 class BaseView(MethodView):
     """Base view."""
 
-    resource_decorators = [content_negotiation, with_resource_requestctx]
+    resource_decorators = [
+        with_deadline,
+        content_negotiation,
+        request_limiting,
+        instrumentation,
+        with_resource_requestctx,
+    ]
     """Resource-specific decorators to be applied to the views."""
     # todo: can https://flask.palletsprojects.com/en/1.1.x/api/#flask.views.View.decorators
     # be used instead?
 
-    def __init__(self, resource, *args, **kwargs):
+    actions = {}
+    """Map of request methods to resource actions (e.g. for the limits)."""
+
+    def __init__(self, resource, negotiator=None, *args, **kwargs):
         """Constructor."""
         super(BaseView, self).__init__(*args, **kwargs)
         self.resource = resource
+        self.negotiator = negotiator
+        self.instrumentation = resource.config.instrumentation
+        self.payload_limits = PayloadLimits.from_config(resource.config)
+        self.request_limits = build_request_limits(resource.config, self.actions)
+        self.deadline_policy = DeadlinePolicy.from_config(resource.config)
+        self.method_handlers = {
+            method: getattr(self, method.lower()) for method in self.methods or ()
+        }
+        self.decorated_dispatch = self.build_dispatch()
 
-    def dispatch_request(self, *args, **kwargs):
-        """Dispatch request after applying resource decorators."""
-        view = MethodView.dispatch_request
+    @classmethod
+    def as_view(cls, name, resource, *class_args, **class_kwargs):
+        """Create the view function.
+
+        The content negotiation is compiled here, once per URL rule, so that
+        it is shared by all the requests served by the view.
+
+        If the resource config enables ``compiled_dispatch``, the view is also
+        instantiated only once and reused across requests, instead of being
+        instantiated on every request. Views must therefore not keep
+        per-request state on ``self`` (use the resource request context).
+        """
+        class_kwargs.setdefault("negotiator", cls.create_negotiator(resource))
+        if not resource.config.compiled_dispatch:
+            return super(BaseView, cls).as_view(
+                name, resource=resource, *class_args, **class_kwargs
+            )
+
+        instance = cls(resource, *class_args, **class_kwargs)
+
+        def view(*args, **kwargs):
+            return instance.dispatch_request(*args, **kwargs)
+
+        # Same as ``flask.views.View.as_view``
+        if cls.decorators:
+            view.__name__ = name
+            view.__module__ = cls.__module__
+            for decorator in cls.decorators:
+                view = decorator(view)
+
+        view.view_class = cls
+        view.view_instance = instance
+        view.__name__ = name
+        view.__doc__ = cls.__doc__
+        view.__module__ = cls.__module__
+        view.methods = cls.methods
+        view.provide_automatic_options = cls.provide_automatic_options
+        return view
+
+    @classmethod
+    def create_negotiator(cls, resource):
+        """Create the content negotiator of the view."""
+        return cls.compile_negotiator(resource, resource.config.item_response_handlers)
+
+    @staticmethod
+    def compile_negotiator(resource, response_handlers, request_loaders=None):
+        """Compile the content negotiation of the given response handlers.
+
+        The request loaders default to the item request loaders.
+        """
+        config = resource.config
+        if request_loaders is None:
+            request_loaders = config.item_request_loaders
+        return CompiledNegotiator(
+            response_handlers.keys(),
+            request_loaders.keys(),
+            formats_map=config.response_formats,
+            cache_size=config.negotiation_cache_size,
+        )
+
+    def build_dispatch(self):
+        """Apply the resource decorators to the method dispatch."""
+        view = BaseView.dispatch_method
 
         for decorator in self.resource_decorators:
             view = decorator(view)
 
-        return view(self, *args, **kwargs)
+        return view
+
+    def check_payload(self, ctx):
+        """Check the request payload limits, before loading the payload."""
+        if self.payload_limits is not None:
+            self.payload_limits.check(ctx.payload_mimetype)
+
+    def call_resource(self, ctx, method, *args, **kwargs):
+        """Call a resource method, within the deadline of the request.
+
+        The request is rejected (503) if its deadline passed before the call.
+        A read (``GET``/``HEAD``) whose deadline passed during the call times
+        out (504) rather than serializing the response, while a write is
+        answered since it has been applied.
+        """
+        shed_expired(ctx)
+        with ctx.measure("handler"):
+            response = call(method, *args, **kwargs)
+        if request.method in ("GET", "HEAD"):
+            ctx.check_deadline()
+        return response
+
+    def dispatch_method(self, *args, **kwargs):
+        """Dispatch to the handler of the request method."""
+        method = self.method_handlers.get(request.method)
+
+        # If the request method is HEAD and we don't have a handler for it
+        # retry with GET.
+        if method is None and request.method == "HEAD":
+            method = self.method_handlers.get("GET")
+
+        assert method is not None, "Unimplemented method %r" % request.method
+        return method(*args, **kwargs)
+
+    def dispatch_request(self, *args, **kwargs):
+        """Dispatch request after applying resource decorators."""
+        return self.decorated_dispatch(self, *args, **kwargs)
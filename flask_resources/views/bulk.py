@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Flask Resources module to create REST APIs."""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from flask import copy_current_request_context
+from werkzeug.exceptions import HTTPException
+
+from ..context import get_resource_requestctx
+from ..coroutines import call
+from ..deadlines import shed_expired
+from ..errors import BulkOperationsRESTError, FieldError, RESTException
+from .base import BaseView
+
+
+class BulkView(BaseView):
+    """Bulk view representation.
+
+    Allows to create, read, update and delete several items in one request.
+    The payload is a list of operations such as::
+
+        [
+            {"op": "create", "data": {...}},
+            {"op": "read", "id": "1"},
+            {"op": "update", "id": "1", "data": {...}},
+            {"op": "delete", "id": "1"}
+        ]
+
+    Each operation is dispatched to the corresponding ``bulk_*`` method of the
+    resource, optionally in a thread pool. The response is the list of the
+    operations results, i.e. ``{"status": ..., "data": ...}`` on success or the
+    body of the ``RESTException`` on error.
+    """
+
+    operations = {
+        "create": ("bulk_create", ("data",)),
+        "read": ("bulk_read", ("id",)),
+        "update": ("bulk_update", ("id", "data")),
+        "delete": ("bulk_delete", ("id",)),
+    }
+    """Map of operation names to resource method and arguments keys."""
+
+    actions = {"POST": "bulk"}
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(BulkView, self).__init__(*args, **kwargs)
+        self.response_handlers = self.resource.config.list_response_handlers
+        self.request_loaders = self.resource.config.item_request_loaders
+        self.max_operations = self.resource.config.bulk_max_operations
+        self.max_workers = self.resource.config.bulk_max_workers
+
+    @classmethod
+    def create_negotiator(cls, resource):
+        """Create the content negotiator of the view."""
+        return cls.compile_negotiator(resource, resource.config.list_response_handlers)
+
+    def post(self, *args, **kwargs):
+        """Run the operations."""
+        ctx = get_resource_requestctx()
+        _response_handler = self.response_handlers[ctx.accept_mimetype]
+        _response_loader = self.request_loaders[ctx.payload_mimetype]
+
+        try:
+            self.check_payload(ctx)
+            with ctx.measure("load"):
+                operations = _response_loader.load_request()
+            self.validate_operations(operations)
+        except HTTPException as error:
+            return _response_handler.make_error_response(error)
+
+        with ctx.measure("handler"):
+            if self.max_workers and len(operations) > 1:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    # Each operation runs in a copy of the current context, so
+                    # that the resource request context is available.
+                    futures = [
+                        pool.submit(
+                            copy_context().run,
+                            copy_current_request_context(self.run_operation),
+                            op,
+                        )
+                        for op in operations
+                    ]
+                    results = [future.result() for future in futures]
+            else:
+                results = [self.run_operation(op) for op in operations]
+
+        with ctx.measure("response"):
+            return _response_handler.make_response(200, results)
+
+    def validate_operations(self, operations):
+        """Validate the list of operations."""
+        if not isinstance(operations, list):
+            raise BulkOperationsRESTError(
+                description="The payload must be a list of operations."
+            )
+        if len(operations) > self.max_operations:
+            raise BulkOperationsRESTError(
+                description="Too many operations (maximum {}).".format(
+                    self.max_operations
+                )
+            )
+
+    def run_operation(self, operation):
+        """Run a single operation and return its result.
+
+        The operations which are not started before the request deadline are
+        not run.
+        """
+        try:
+            shed_expired(get_resource_requestctx())
+            method, args = self.parse_operation(operation)
+            code, content = call(method, *args)
+        except RESTException as error:
+            return error.to_dict()
+        except HTTPException as error:
+            return dict(status=error.code, message=error.description)
+
+        return dict(status=code, data=content)
+
+    def parse_operation(self, operation):
+        """Get the resource method and its arguments for an operation."""
+        if (
+            not isinstance(operation, dict)
+            or operation.get("op") not in self.operations
+        ):
+            raise BulkOperationsRESTError(
+                errors=[FieldError("op", "Unknown operation.")],
+                description="Invalid operation.",
+            )
+
+        method_name, keys = self.operations[operation["op"]]
+        missing = [key for key in keys if operation.get(key) is None]
+        if missing:
+            raise BulkOperationsRESTError(
+                errors=[
+                    FieldError(key, "Missing data for required field.")
+                    for key in missing
+                ],
+                description="Invalid operation.",
+            )
+
+        return getattr(self.resource, method_name), [operation[key] for key in keys]
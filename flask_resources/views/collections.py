@@ -7,6 +7,7 @@
 
 """Flask Resources module to create REST APIs."""
 
+from flask import request
 from werkzeug.exceptions import HTTPException
 
 from ..args.parsers import (
@@ -14,7 +15,11 @@ from ..args.parsers import (
     item_request_parser,
     search_request_parser,
 )
-from ..context import resource_requestctx
+from ..compression import ENCODINGS
+from ..context import get_resource_requestctx
+from ..coroutines import call
+from ..errors import PreconditionFailedRESTError, UnsupportedMimetypeError
+from ..response import get_cache_id, get_etag, variant_etag
 from .base import BaseView
 
 
@@ -24,6 +29,8 @@ class ListView(BaseView):
     Allows searching and creating an item in the list.
     """
 
+    actions = {"GET": "search", "POST": "create"}
+
     def __init__(self, *args, **kwargs):
         """Constructor."""
         super(ListView, self).__init__(*args, **kwargs)
@@ -32,24 +39,38 @@ class ListView(BaseView):
         self.response_handlers = self.resource.config.list_response_handlers
         self.request_loaders = self.resource.config.item_request_loaders
 
+    @classmethod
+    def create_negotiator(cls, resource):
+        """Create the content negotiator of the view."""
+        return cls.compile_negotiator(resource, resource.config.list_response_handlers)
+
     def get(self, *args, **kwargs):
         """Search the collection."""
-        resource_requestctx.request_args = self.search_parser.parse()
-        _response_handler = self.response_handlers[resource_requestctx.accept_mimetype]
+        ctx = get_resource_requestctx()
+        with ctx.measure("parse"):
+            ctx.request_args = self.search_parser.parse()
+        ctx.fields = ctx.request_args.get("fields")
+        _response_handler = self.response_handlers[ctx.accept_mimetype]
 
-        return _response_handler.make_response(*self.resource.search(*args, **kwargs))
+        response = self.call_resource(ctx, self.resource.search, *args, **kwargs)
+        with ctx.measure("response"):
+            return _response_handler.make_response(*response)
 
     def post(self, *args, **kwargs):
         """Create an item in the collection."""
-        _response_handler = self.response_handlers[resource_requestctx.accept_mimetype]
-        _response_loader = self.request_loaders[resource_requestctx.payload_mimetype]
+        ctx = get_resource_requestctx()
+        _response_handler = self.response_handlers[ctx.accept_mimetype]
+        _response_loader = self.request_loaders[ctx.payload_mimetype]
 
-        resource_requestctx.request_args = self.create_parser.parse()
-        resource_requestctx.data = _response_loader.load_request()
+        with ctx.measure("parse"):
+            ctx.request_args = self.create_parser.parse()
+        self.check_payload(ctx)
+        with ctx.measure("load"):
+            ctx.data = _response_loader.load_request()
 
-        return _response_handler.make_response(
-            *self.resource.create(*args, **kwargs)
-        )
+        response = self.call_resource(ctx, self.resource.create, *args, **kwargs)
+        with ctx.measure("response"):
+            return _response_handler.make_response(*response)
 
 
 class ItemView(BaseView):
@@ -58,19 +79,86 @@ class ItemView(BaseView):
     Allows reading, (partial) updating and deleting an item.
     """
 
+    actions = {
+        "GET": "read",
+        "PUT": "update",
+        "PATCH": "partial_update",
+        "DELETE": "delete",
+    }
+
     def __init__(self, *args, **kwargs):
         """Constructor."""
         super(ItemView, self).__init__(*args, **kwargs)
         self.item_parser = self.resource.config.item_request_parser
         self.response_handlers = self.resource.config.item_response_handlers
         self.request_loaders = self.resource.config.item_request_loaders
+        self.patch_loaders = dict(
+            self.request_loaders, **self.resource.config.item_patch_loaders
+        )
+
+    @classmethod
+    def create_negotiator(cls, resource):
+        """Create the content negotiator of the view.
+
+        The patch loaders are accepted besides the item request loaders.
+        """
+        config = resource.config
+        loaders = dict(config.item_request_loaders, **config.item_patch_loaders)
+        return cls.compile_negotiator(resource, config.item_response_handlers, loaders)
+
+    @staticmethod
+    def get_loader(loaders, mimetype):
+        """Get the loader of a payload MIME type among the method's loaders."""
+        loader = loaders.get(mimetype)
+        if loader is None:
+            raise UnsupportedMimetypeError(
+                header="Content-Type",
+                received_mimetype=mimetype,
+                allowed_mimetypes=loaders.keys(),
+            )
+        return loader
+
+    def check_preconditions(self, *args, **kwargs):
+        """Check the ``If-Match`` precondition against the current item.
+
+        The item is only read if the request has an ``If-Match`` header. The
+        ETags of the compressed variants of the item match as well.
+        """
+        if not request.if_match:
+            return
+
+        with get_resource_requestctx().measure("handler"):
+            _, content = call(self.resource.read, *args, **kwargs)
+        etag = get_etag(content)
+        etags = [etag or ""]
+        if etag is not None:
+            etags.extend(variant_etag(etag, encoding) for encoding in ENCODINGS)
+        if not any(request.if_match.contains(etag) for etag in etags):
+            raise PreconditionFailedRESTError()
+
+    def invalidate_cache(self):
+        """Invalidate the cached responses of the item."""
+        id_ = get_cache_id()
+        if id_ is None:
+            return
+
+        for mimetype, handler in self.response_handlers.items():
+            cache = getattr(handler, "cache", None)
+            if cache is not None:
+                cache.invalidate(request.blueprint, id_, [mimetype])
 
     def get(self, *args, **kwargs):
         """Get."""
-        _response_handler = self.response_handlers[resource_requestctx.accept_mimetype]
+        ctx = get_resource_requestctx()
+        _response_handler = self.response_handlers[ctx.accept_mimetype]
 
         try:
-            return _response_handler.make_response(*self.resource.read(*args, **kwargs))
+            with ctx.measure("parse"):
+                ctx.request_args = self.item_parser.parse()
+            ctx.fields = ctx.request_args.get("fields")
+            response = self.call_resource(ctx, self.resource.read, *args, **kwargs)
+            with ctx.measure("response"):
+                return _response_handler.make_response(*response)
         except HTTPException as error:
             # TODO: 1) should this be here, or we use the blueprint error handlers?
             #       records rest have something here.
@@ -80,42 +168,59 @@ class ItemView(BaseView):
 
     def put(self, *args, **kwargs):
         """Put."""
-        _response_handler = self.response_handlers[resource_requestctx.accept_mimetype]
+        ctx = get_resource_requestctx()
+        _response_handler = self.response_handlers[ctx.accept_mimetype]
         # TODO: If application/json is used for both put and post, then they have to
         #       use the same response handler. Possibly this is ok, but need to be
         #       checked. Probably the problems is delegated to partial_update()
-        _response_loader = self.request_loaders[resource_requestctx.payload_mimetype]
 
         try:
-            resource_requestctx.data = _response_loader.load_request()
-            return _response_handler.make_response(
-                *self.resource.update(*args, **kwargs)
+            _response_loader = self.get_loader(
+                self.request_loaders, ctx.payload_mimetype
             )
+            self.check_payload(ctx)
+            self.check_preconditions(*args, **kwargs)
+            with ctx.measure("load"):
+                ctx.data = _response_loader.load_request()
+            response = self.call_resource(ctx, self.resource.update, *args, **kwargs)
+            self.invalidate_cache()
+            with ctx.measure("response"):
+                return _response_handler.make_response(*response)
         except HTTPException as error:
             return _response_handler.make_error_response(error)
 
     def patch(self, *args, **kwargs):
         """Patch."""
-        _response_handler = self.response_handlers[resource_requestctx.accept_mimetype]
-        _response_loader = self.request_loaders[resource_requestctx.payload_mimetype]
+        ctx = get_resource_requestctx()
+        _response_handler = self.response_handlers[ctx.accept_mimetype]
 
         try:
-            resource_requestctx.data = _response_loader.load_request()
-            return _response_handler.make_response(
-                *self.resource.partial_update(*args, **kwargs)
+            _response_loader = self.get_loader(self.patch_loaders, ctx.payload_mimetype)
+            self.check_payload(ctx)
+            self.check_preconditions(*args, **kwargs)
+            with ctx.measure("load"):
+                ctx.data = _response_loader.load_request()
+            response = self.call_resource(
+                ctx, self.resource.partial_update, *args, **kwargs
             )
+            self.invalidate_cache()
+            with ctx.measure("response"):
+                return _response_handler.make_response(*response)
         except HTTPException as error:
             return _response_handler.make_error_response(error)
 
     def delete(self, *args, **kwargs):
         """Delete."""
-        _response_handler = self.response_handlers[resource_requestctx.accept_mimetype]
+        ctx = get_resource_requestctx()
+        _response_handler = self.response_handlers[ctx.accept_mimetype]
         # TODO: Delete can potentially have a body - e.g. the tombstone messages.
         #       HTTP spec seems to allow this, but not that common.
 
         try:
-            return _response_handler.make_response(
-                *self.resource.delete(*args, **kwargs)
-            )
+            self.check_preconditions(*args, **kwargs)
+            response = self.call_resource(ctx, self.resource.delete, *args, **kwargs)
+            self.invalidate_cache()
+            with ctx.measure("response"):
+                return _response_handler.make_response(*response)
         except HTTPException as error:
             return _response_handler.make_error_response(error)
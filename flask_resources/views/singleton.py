@@ -8,6 +8,7 @@
 """Flask Resources module to create REST APIs."""
 
 from ..args.parsers import item_request_parser
+from ..context import get_resource_requestctx
 from .base import BaseView
 
 
@@ -17,6 +18,14 @@ class SingletonView(BaseView):
     Note that the resource route should contain the `<id>` param.
     """
 
+    actions = {
+        "POST": "create",
+        "GET": "read",
+        "PUT": "update",
+        "PATCH": "partial_update",
+        "DELETE": "delete",
+    }
+
     def __init__(self, resource=None, item_parser=item_request_parser, *args, **kwargs):
         """Constructor."""
         super(SingletonView, self).__init__(resource=resource, *args, **kwargs)
@@ -24,20 +33,22 @@ class SingletonView(BaseView):
 
     def post(self, *args, **kwargs):
         """Post."""
-        return self.resource.create()
+        return self.call_resource(get_resource_requestctx(), self.resource.create)
 
     def get(self, *args, **kwargs):
         """Get."""
-        return self.resource.read()
+        return self.call_resource(get_resource_requestctx(), self.resource.read)
 
     def put(self, *args, **kwargs):
         """Put."""
-        return self.resource.update()
+        return self.call_resource(get_resource_requestctx(), self.resource.update)
 
     def patch(self, *args, **kwargs):
         """Patch."""
-        return self.resource.partial_update()
+        return self.call_resource(
+            get_resource_requestctx(), self.resource.partial_update
+        )
 
     def delete(self, *args, **kwargs):
         """Delete."""
-        return self.resource.delete()
+        return self.call_resource(get_resource_requestctx(), self.resource.delete)
@@ -28,7 +28,14 @@ tests_require = [
 ]
 
 extras_require = {
+    "brotli": ["brotli>=1.0.0"],
+    "cbor": ["cbor2>=5.0.0"],
     "docs": ["Sphinx>=1.5.1,<3",],
+    "msgpack": ["msgpack>=1.0.0"],
+    "orjson": ["orjson>=3.0.0"],
+    "rapidjson": ["python-rapidjson>=0.9.0"],
+    "ujson": ["ujson>=5.0.0"],
+    "zstd": ["zstandard>=0.13.0"],
     "tests": tests_require,
 }
 
@@ -39,6 +46,7 @@ for reqs in extras_require.values():
 setup_requires = ["Babel>=1.3"]
 
 install_requires = [
+    "contextvars>=2.4;python_version<'3.7'",
     "Flask~=1.1.2",
     "webargs~=5.5.0",
 ]
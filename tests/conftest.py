@@ -11,11 +11,51 @@ See https://pytest-invenio.readthedocs.io/ for documentation on which test
 fixtures are available.
 """
 
+import asyncio
+from datetime import date, datetime, timezone
+from threading import Event
+
 import pytest
 from flask import Flask
+from marshmallow.validate import Range
+from webargs.fields import Int
+from werkzeug.exceptions import NotFound
 
+from flask_resources.args.parsers import RequestParser, search_request_parser
+from flask_resources.cache import ResponseCache
+from flask_resources.compression import Compression
 from flask_resources.context import resource_requestctx
+from flask_resources.coroutines import gather
+from flask_resources.instrumentation import Instrumentation
+from flask_resources.ratelimit import ConcurrencyLimit, MemoryBackend, RateLimit
 from flask_resources.resources import CollectionResource, Resource, ResourceConfig
+from flask_resources.response import ItemResponse, ListResponse
+from flask_resources.serializers import (
+    CSVSerializer,
+    JSONSerializer,
+    NDJSONSerializer,
+    SearchResult,
+    SerializableMixin,
+)
+
+
+class Clock(object):
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Constructor."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the time."""
+        self.now += seconds
+
+
+deadline_clock = Clock()
 
 
 class CustomResourceConfig(ResourceConfig):
@@ -45,8 +85,9 @@ class CustomResource(CollectionResource):
 
         return 200, resp
 
-    def create(self, obj):
+    def create(self):
         """Create."""
+        obj = resource_requestctx.data
         self.db[obj["id"]] = obj["content"]
 
         return 201, self.db
@@ -56,6 +97,536 @@ class CustomResource(CollectionResource):
         return 200, {"id": id, "content": self.db[id]}
 
 
+class StreamedResourceConfig(ResourceConfig):
+    """Streamed resource configuration."""
+
+    item_route = "/streamed/<id>"
+    list_route = "/streamed/"
+    list_response_handlers = {
+        "application/json": ListResponse(
+            JSONSerializer(), stream=True, chunk_size=16, compression=Compression()
+        )
+    }
+
+
+class StreamedResource(CollectionResource):
+    """Resource streaming its search results."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(StreamedResource, self).__init__(
+            config=StreamedResourceConfig, *args, **kwargs
+        )
+
+    def search(self):
+        """Search."""
+        size = resource_requestctx.request_args["size"]
+        hits = ({"id": str(i)} for i in range(size))
+
+        return 200, {"hits": hits, "links": {"self": {"page": 1}}}
+
+
+class Record(SerializableMixin):
+    """Versioned record."""
+
+    def __init__(self, id, content, version=1):
+        """Constructor."""
+        self._id = id
+        self.content = content
+        self._version = version
+        self._last_modified = datetime(2020, 6, 17, 16, 21, 22, tzinfo=timezone.utc)
+
+    @property
+    def object(self):
+        """Returns the object itself."""
+        return {"id": self._id, "content": self.content}
+
+    @property
+    def id(self):
+        """Returns the object id."""
+        return self._id
+
+    @property
+    def version(self):
+        """Returns the object version or revision."""
+        return self._version
+
+    @property
+    def last_modified(self):
+        """Returns the date of the last modification."""
+        return self._last_modified
+
+
+class VersionedResourceConfig(ResourceConfig):
+    """Versioned resource configuration."""
+
+    item_route = "/versioned/<id>"
+    list_route = "/versioned/"
+    bulk_route = "/versioned/_bulk"
+    bulk_max_workers = 4
+    item_response_handlers = {
+        "application/json": ItemResponse(
+            JSONSerializer(),
+            cache=ResponseCache(),
+            compression=Compression(min_size=32),
+        )
+    }
+
+
+class VersionedResource(CollectionResource):
+    """Resource of versioned records."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(VersionedResource, self).__init__(
+            config=VersionedResourceConfig, *args, **kwargs
+        )
+        self.db = {}
+
+    def create(self):
+        """Create."""
+        obj = resource_requestctx.data
+        record = self.db[obj["id"]] = Record(obj["id"], obj["content"])
+
+        return 201, record
+
+    def read(self, id):
+        """Read."""
+        return 200, self.db[id]
+
+    def update(self, id):
+        """Update."""
+        record = self.db[id]
+        self.db[id] = Record(
+            id, resource_requestctx.data["content"], version=record.version + 1
+        )
+
+        return 200, self.db[id]
+
+    def delete(self, id):
+        """Delete."""
+        del self.db[id]
+
+        return 204, None
+
+    def bulk_create(self, data):
+        """Create an item from a bulk operation."""
+        record = self.db[data["id"]] = Record(data["id"], data["content"])
+
+        return 201, record
+
+    def bulk_read(self, id):
+        """Read an item from a bulk operation."""
+        if id not in self.db:
+            raise NotFound()
+
+        return 200, self.db[id]
+
+
+class PIDResourceConfig(ResourceConfig):
+    """Resource configuration with a persistent identifier route variable."""
+
+    item_route = "/pids/<pid_value>"
+    list_route = "/pids/"
+
+
+class PIDResource(CollectionResource):
+    """Resource of items identified by a persistent identifier."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(PIDResource, self).__init__(config=PIDResourceConfig, *args, **kwargs)
+
+    def read(self, pid_value):
+        """Read."""
+        return 200, {"pid": pid_value, "content": "c"}
+
+
+class AsyncResourceConfig(ResourceConfig):
+    """Async resource configuration."""
+
+    item_route = "/async/<id>"
+    list_route = "/async/"
+    search_request_parser = RequestParser(
+        fields=dict(
+            search_request_parser.fields, concurrency=Int(validate=Range(min=1))
+        ),
+        processors=search_request_parser.processors,
+        locations=("querystring",),
+    )
+
+
+class AsyncResource(CollectionResource):
+    """Resource with coroutine methods fanning out queries."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(AsyncResource, self).__init__(config=AsyncResourceConfig, *args, **kwargs)
+        self.running = 0
+        self.concurrency = 0
+
+    async def query(self, index):
+        """Query the backend, recording the number of queries running at once."""
+        self.running += 1
+        self.concurrency = max(self.concurrency, self.running)
+        await asyncio.sleep(0)
+        self.running -= 1
+        return {"id": str(index)}
+
+    async def search(self):
+        """Search, running at most ``concurrency`` queries at once."""
+        self.concurrency = 0
+        limit = resource_requestctx.request_args.get("concurrency")
+        hits = await gather(*[self.query(i) for i in range(5)], limit=limit)
+        return 200, {"hits": hits, "concurrency": self.concurrency}
+
+    async def read(self, id):
+        """Read."""
+        return 200, await self.query(id)
+
+
+class ListSink(object):
+    """Timings sink keeping the samples in a list."""
+
+    def __init__(self):
+        """Constructor."""
+        self.samples = []
+
+    def emit(self, sample):
+        """Keep a sample."""
+        self.samples.append(sample)
+
+
+sink = ListSink()
+
+
+class InstrumentedResourceConfig(ResourceConfig):
+    """Instrumented resource configuration."""
+
+    item_route = "/instrumented/<id>"
+    list_route = "/instrumented/"
+    instrumentation = Instrumentation([sink], server_timing=True)
+
+
+class InstrumentedResource(CollectionResource):
+    """Instrumented resource."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(InstrumentedResource, self).__init__(
+            config=InstrumentedResourceConfig, *args, **kwargs
+        )
+
+    def search(self):
+        """Search."""
+        return 200, [{"id": "1"}]
+
+    def create(self):
+        """Create."""
+        return 201, resource_requestctx.data
+
+
+class Counter(object):
+    """Callable counting its calls."""
+
+    def __init__(self, value):
+        """Constructor."""
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        """Return the value."""
+        self.calls += 1
+        return self.value
+
+
+search_total = Counter(1000)
+search_aggregations = Counter({"type": {"buckets": []}})
+
+
+class SearchResourceConfig(ResourceConfig):
+    """Search resource configuration."""
+
+    item_route = "/search/<id>"
+    list_route = "/search/"
+    list_response_handlers = {
+        "application/json": ListResponse(JSONSerializer()),
+        "application/vnd.hits+json": ListResponse(
+            JSONSerializer(envelope=["hits", "links"])
+        ),
+        "application/x-stream+json": ListResponse(JSONSerializer(), stream=True),
+    }
+
+
+class SearchResource(CollectionResource):
+    """Resource returning search results with a lazy total and aggregations."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(SearchResource, self).__init__(
+            config=SearchResourceConfig, *args, **kwargs
+        )
+
+    def search(self):
+        """Search."""
+        size = resource_requestctx.request_args["size"]
+        hits = ({"id": str(i), "content": "c"} for i in range(size))
+        return (
+            200,
+            SearchResult(hits, total=search_total, aggregations=search_aggregations),
+        )
+
+
+class BoundedResourceConfig(ResourceConfig):
+    """Resource configuration with payload limits."""
+
+    item_route = "/bounded/<id>"
+    list_route = "/bounded/"
+    max_content_length = 64
+    max_json_depth = 2
+    max_json_array_length = 3
+
+
+class SizedResourceConfig(ResourceConfig):
+    """Resource configuration with a maximum content length only."""
+
+    item_route = "/sized/<id>"
+    list_route = "/sized/"
+    max_content_length = 64
+
+
+class EchoResource(CollectionResource):
+    """Resource echoing the created items."""
+
+    def create(self):
+        """Create."""
+        return 201, resource_requestctx.data
+
+
+class PatchedResourceConfig(ResourceConfig):
+    """Patched resource configuration."""
+
+    item_route = "/patched/<id>"
+    list_route = "/patched/"
+
+
+class PatchedResource(CollectionResource):
+    """Resource applying JSON Patches to its items."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(PatchedResource, self).__init__(
+            config=PatchedResourceConfig, *args, **kwargs
+        )
+        self.db = {}
+
+    def get_item(self, id):
+        """Get an item, created on first access."""
+        return self.db.setdefault(id, {"id": id, "title": "Title", "tags": ["a"]})
+
+    def update(self, id):
+        """Update."""
+        self.get_item(id)
+        self.db[id] = resource_requestctx.data
+        return 200, self.db[id]
+
+    def partial_update(self, id):
+        """Partial update."""
+        self.db[id] = resource_requestctx.data.apply(self.get_item(id))
+        return 200, self.db[id]
+
+
+class SharedBackend(object):
+    """Local fake of a limits backend shared between workers."""
+
+    def __init__(self):
+        """Constructor."""
+        self.reset()
+
+    def reset(self):
+        """Reset the recorded calls and the limits."""
+        self.calls = []
+        self.backend = MemoryBackend()
+
+    def take(self, key, rate, burst, cost=1):
+        """Take tokens from a token bucket."""
+        self.calls.append(("take", key))
+        return self.backend.take(key, rate, burst, cost)
+
+    def acquire(self, key, limit):
+        """Acquire a slot."""
+        self.calls.append(("acquire", key))
+        return self.backend.acquire(key, limit)
+
+    def release(self, key):
+        """Release a slot."""
+        self.calls.append(("release", key))
+        self.backend.release(key)
+
+
+shared_backend = SharedBackend()
+searching = Event()
+unblock = Event()
+
+
+class ThrottledResourceConfig(ResourceConfig):
+    """Resource configuration with rate and concurrency limits."""
+
+    item_route = "/throttled/<id>"
+    list_route = "/throttled/"
+    rate_limits = {"read": RateLimit(rate=0.001, burst=2, backend=shared_backend)}
+    concurrency_limits = {"search": ConcurrencyLimit(1, retry_after=2)}
+
+
+class ThrottledResource(CollectionResource):
+    """Resource with rate and concurrency limits."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(ThrottledResource, self).__init__(
+            config=ThrottledResourceConfig, *args, **kwargs
+        )
+
+    def search(self):
+        """Search, waiting to be unblocked."""
+        searching.set()
+        unblock.wait(5)
+        return 200, []
+
+    def read(self, id):
+        """Read."""
+        return 200, {"id": id}
+
+
+class ExportResourceConfig(ResourceConfig):
+    """Export resource configuration."""
+
+    item_route = "/export/<id>"
+    list_route = "/export/"
+    list_response_handlers = {
+        "application/json": ListResponse(JSONSerializer()),
+        "text/csv": ListResponse(CSVSerializer(["id", "title"]), stream=True),
+        "application/x-ndjson": ListResponse(NDJSONSerializer(), stream=True),
+    }
+    response_formats = {
+        "json": "application/json",
+        "csv": "text/csv",
+        "ndjson": "application/x-ndjson",
+    }
+
+
+class ExportResource(CollectionResource):
+    """Resource exporting items."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(ExportResource, self).__init__(
+            config=ExportResourceConfig, *args, **kwargs
+        )
+
+    def count(self):
+        """Count the hits, which the exports must not do."""
+        raise AssertionError("The total must not be counted.")
+
+    def search(self):
+        """Search."""
+        size = resource_requestctx.request_args["size"]
+        hits = ({"id": str(i), "title": "T{}".format(i)} for i in range(size))
+        return 200, SearchResult(hits, total=self.count)
+
+
+def binary_resource_config():
+    """Binary resource configuration.
+
+    :raises ImportError: If a binary format package is not installed.
+    """
+    from flask_resources.loaders import CBORLoader, JSONLoader, MessagePackLoader
+    from flask_resources.serializers import CBORSerializer, MessagePackSerializer
+
+    class BinaryResourceConfig(ResourceConfig):
+        """Binary resource configuration."""
+
+        item_route = "/binary/<id>"
+        list_route = "/binary/"
+        item_request_loaders = {
+            "application/json": JSONLoader(),
+            "application/msgpack": MessagePackLoader(),
+            "application/cbor": CBORLoader(),
+        }
+        item_response_handlers = {
+            "application/json": ItemResponse(JSONSerializer()),
+            "application/msgpack": ItemResponse(MessagePackSerializer()),
+            "application/cbor": ItemResponse(CBORSerializer()),
+        }
+        list_response_handlers = {
+            "application/json": ListResponse(JSONSerializer()),
+            "application/msgpack": ListResponse(MessagePackSerializer()),
+            "application/cbor": ListResponse(CBORSerializer(), stream=True),
+        }
+
+    return BinaryResourceConfig
+
+
+class BinaryResource(CollectionResource):
+    """Resource negotiating the binary formats, echoing the created items."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(BinaryResource, self).__init__(
+            config=binary_resource_config(), *args, **kwargs
+        )
+
+    def search(self):
+        """Search."""
+        hits = iter([{"id": "1", "date": date(2020, 1, 1)}])
+        return 200, SearchResult(hits, total=1)
+
+    def create(self):
+        """Create."""
+        return 201, resource_requestctx.data
+
+
+class DeadlineResourceConfig(ResourceConfig):
+    """Deadline resource configuration."""
+
+    item_route = "/deadline/<id>"
+    list_route = "/deadline/"
+    bulk_route = "/deadline/_bulk"
+    request_timeout = 10
+    request_start_header = "X-Request-Start"
+
+
+class DeadlineResource(CollectionResource):
+    """Resource taking time on the deadline clock, and returning its budget."""
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super(DeadlineResource, self).__init__(
+            config=DeadlineResourceConfig, *args, **kwargs
+        )
+
+    def search(self):
+        """Search, taking as long as the requested ``size`` in milliseconds."""
+        remaining = resource_requestctx.remaining()
+        deadline_clock.sleep(resource_requestctx.request_args["size"] / 1000)
+        return 200, {"remaining": remaining}
+
+    def read(self, id):
+        """Read, taking ``id`` seconds and giving up once the deadline passed."""
+        deadline_clock.sleep(float(id))
+        resource_requestctx.check_deadline()
+        return 200, {"id": id}
+
+    def create(self):
+        """Create, taking 50 milliseconds."""
+        deadline_clock.sleep(0.05)
+        return 201, resource_requestctx.data
+
+    def bulk_create(self, data):
+        """Create from a bulk operation, taking 50 milliseconds."""
+        return self.create()
+
+
 @pytest.fixture(scope="module")
 def app():
     """Application factory fixture."""
@@ -65,5 +636,84 @@ def app():
     app_.register_blueprint(default_bp)
     custom_bp = CustomResource().as_blueprint("custom_resource")
     app_.register_blueprint(custom_bp)
+    streamed_bp = StreamedResource().as_blueprint("streamed_resource")
+    app_.register_blueprint(streamed_bp)
+    versioned_bp = VersionedResource().as_blueprint("versioned_resource")
+    app_.register_blueprint(versioned_bp)
+    pid_bp = PIDResource().as_blueprint("pid_resource")
+    app_.register_blueprint(pid_bp)
+    async_bp = AsyncResource().as_blueprint("async_resource")
+    app_.register_blueprint(async_bp)
+    instrumented_bp = InstrumentedResource().as_blueprint("instrumented_resource")
+    app_.register_blueprint(instrumented_bp)
+    search_bp = SearchResource().as_blueprint("search_resource")
+    app_.register_blueprint(search_bp)
+    bounded_bp = EchoResource(config=BoundedResourceConfig).as_blueprint(
+        "bounded_resource"
+    )
+    app_.register_blueprint(bounded_bp)
+    sized_bp = EchoResource(config=SizedResourceConfig).as_blueprint("sized_resource")
+    app_.register_blueprint(sized_bp)
+    patched_bp = PatchedResource().as_blueprint("patched_resource")
+    app_.register_blueprint(patched_bp)
+    throttled_bp = ThrottledResource().as_blueprint("throttled_resource")
+    app_.register_blueprint(throttled_bp)
+    export_bp = ExportResource().as_blueprint("export_resource")
+    app_.register_blueprint(export_bp)
+    try:
+        binary_bp = BinaryResource().as_blueprint("binary_resource")
+    except ImportError:
+        # The binary formats are optional.
+        pass
+    else:
+        app_.register_blueprint(binary_bp)
+    deadline_bp = DeadlineResource().as_blueprint("deadline_resource")
+    app_.register_blueprint(deadline_bp)
 
     return app_
+
+
+@pytest.fixture()
+def timings():
+    """Timing samples emitted by the instrumented resource."""
+    del sink.samples[:]
+    return sink.samples
+
+
+@pytest.fixture()
+def search_counters():
+    """Total and aggregations of the search resource, counting their calls."""
+    search_total.calls = 0
+    search_aggregations.calls = 0
+    return search_total, search_aggregations
+
+
+@pytest.fixture()
+def limits_backend():
+    """Backend of the rate limits of the throttled resource, reset."""
+    shared_backend.reset()
+    return shared_backend
+
+
+@pytest.fixture()
+def search_events():
+    """Events set when the throttled resource searches, and to unblock it."""
+    searching.clear()
+    unblock.clear()
+    yield searching, unblock
+    unblock.set()
+
+
+@pytest.fixture()
+def manual_clock():
+    """Manually advanced clock."""
+    return Clock()
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    """Deadline clock, replacing the monotonic clock of the deadlines."""
+    deadline_clock.now = 0.0
+    monkeypatch.setattr("flask_resources.context.monotonic", deadline_clock)
+    monkeypatch.setattr("flask_resources.deadlines.monotonic", deadline_clock)
+    return deadline_clock
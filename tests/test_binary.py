@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""MessagePack and CBOR serializers and loaders tests."""
+
+import json
+from datetime import date
+from uuid import UUID
+
+import pytest
+
+from flask_resources.serializers import (
+    CBORSerializer,
+    JSONSerializer,
+    MessagePackSerializer,
+    SearchResult,
+)
+
+msgpack = pytest.importorskip("msgpack")
+cbor2 = pytest.importorskip("cbor2")
+
+FORMATS = [
+    ("application/msgpack", msgpack.unpackb, msgpack.packb),
+    ("application/cbor", cbor2.loads, cbor2.dumps),
+]
+
+
+def test_same_values_as_json():
+    """Test that the values are converted like in JSON."""
+    obj = {
+        "id": UUID(int=1),
+        "date": date(2020, 1, 1),
+        "hits": iter([1, 2]),
+        "nested": {"list": [True, None, 1.5]},
+    }
+    expected = json.loads(JSONSerializer().serialize_object(dict(obj, hits=[1, 2])))
+    assert msgpack.unpackb(MessagePackSerializer().serialize_object(obj)) == expected
+    obj["hits"] = iter([1, 2])
+    assert cbor2.loads(CBORSerializer().serialize_object(obj)) == expected
+
+
+def test_cbor_stream():
+    """Test that CBOR lists are streamed as indefinite-length arrays."""
+    serializer = CBORSerializer(envelope=("hits", "total"))
+    chunks = list(serializer.serialize_object_list_stream(iter([{"a": 1}, {"b": 2}])))
+    assert chunks[0] == b"\x9f" and chunks[-1] == b"\xff"
+    assert cbor2.loads(b"".join(chunks)) == [{"a": 1}, {"b": 2}]
+
+    result = SearchResult(iter([{"a": 1}]), total=1)
+    data = b"".join(serializer.serialize_object_list_stream(result))
+    assert cbor2.loads(data) == {"hits": {"hits": [{"a": 1}], "total": 1}}
+
+
+@pytest.mark.parametrize("mimetype,loads,dumps", FORMATS)
+def test_list_negotiation(client, mimetype, loads, dumps):
+    """Test the negotiation of the binary formats of the list responses."""
+    resource_obj = client.get("/binary/", headers={"accept": mimetype})
+    assert resource_obj.status_code == 200
+    assert resource_obj.content_type == mimetype
+    assert loads(resource_obj.data)["hits"] == {
+        "hits": [{"id": "1", "date": "2020-01-01"}],
+        "total": 1,
+    }
+
+
+@pytest.mark.parametrize("mimetype,loads,dumps", FORMATS)
+def test_item_negotiation(client, mimetype, loads, dumps):
+    """Test the negotiation of the binary formats of the item requests."""
+    headers = {"content-type": mimetype, "accept": mimetype}
+    data = {"id": "2", "content": {"size": 2, "ratio": 0.5, "tags": ["a", None]}}
+    resource_obj = client.post("/binary/", data=dumps(data), headers=headers)
+    assert resource_obj.status_code == 201
+    assert resource_obj.content_type == mimetype
+    assert loads(resource_obj.data) == data
+
+
+@pytest.mark.parametrize("mimetype,loads,dumps", FORMATS)
+def test_invalid_payload(client, mimetype, loads, dumps):
+    """Test a payload which cannot be decoded."""
+    headers = {"content-type": mimetype, "accept": mimetype}
+    resource_obj = client.post("/binary/", data=b"\xc1", headers=headers)
+    assert resource_obj.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "mimetype,data",
+    [
+        ("application/cbor", b"\xa1\x80\x01"),  # {(): 1}
+        ("application/cbor", b"\xd9\x01\x02\x81\x01"),  # set([1])
+        ("application/cbor", b"\xc1\x01"),  # datetime
+        ("application/cbor", b"\xd9\x27\x0f\x01"),  # unknown tag
+        ("application/cbor", b"\x41\x00"),  # bytes
+        ("application/msgpack", b"\xd4\x01\x00"),  # extension type
+        ("application/msgpack", b"\xc4\x01\x00"),  # bytes
+        ("application/msgpack", b"\x81\x01\x01"),  # {1: 1}
+    ],
+)
+def test_non_json_payload(client, mimetype, data):
+    """Test that the values which JSON cannot represent are rejected."""
+    headers = {"content-type": mimetype, "accept": "application/json"}
+    resource_obj = client.post("/binary/", data=data, headers=headers)
+    assert resource_obj.status_code == 400
+    assert resource_obj.json["message"].startswith("Failed to decode")
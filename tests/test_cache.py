@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Response cache test module."""
+
+import json
+
+from flask import request
+
+from flask_resources.cache import LRUCache, ResponseCache
+from flask_resources.response import get_cache_id
+
+
+class FakeRedis(object):
+    """Minimal fake of a Redis client."""
+
+    def __init__(self):
+        """Constructor."""
+        self.data = {}
+
+    def get(self, name):
+        """Get."""
+        return self.data.get(name)
+
+    def set(self, name, value, ex=None):
+        """Set."""
+        self.data[name] = value
+        return True
+
+    def delete(self, *names):
+        """Delete."""
+        return len([self.data.pop(name) for name in names if name in self.data])
+
+
+def test_lru_cache_size_eviction():
+    cache = LRUCache(max_size=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    assert cache.get("a") == b"1234"
+
+    # "b" is the least recently used
+    cache.set("c", b"1234")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.size == 8
+
+    # Too big to be cached
+    assert not cache.set("d", b"12345678901")
+    assert cache.delete("a", "c", "d") == 2
+    assert cache.size == 0
+
+
+def test_response_cache_versions():
+    for backend in (LRUCache(), FakeRedis()):
+        cache = ResponseCache(backend)
+        cache.set("bp", "1", "2", "application/json", b'{"a":2}')
+
+        assert cache.get("bp", "1", "2", "application/json") == b'{"a":2}'
+        assert cache.get("bp", "1", "1", "application/json") is None
+        assert cache.get("bp", "1", "2", "application/xml") is None
+
+        cache.invalidate("bp", "1", ["application/json"])
+        assert cache.get("bp", "1", "2", "application/json") is None
+
+
+def test_cache_id(app):
+    """Test that the cache identifier is built from all the URL arguments."""
+    with app.test_request_context("/pids/abc"):
+        app.preprocess_request()
+        assert get_cache_id() == "pid_value=abc"
+
+    with app.test_request_context("/"):
+        assert get_cache_id() is None
+
+    with app.test_request_context():
+        request.view_args = {"pid_value": "1", "pid_type": "recid"}
+        assert get_cache_id() == "pid_type=recid,pid_value=1"
+
+
+def test_cached_item_response(app, client):
+    """Test the caching of the serialized responses of a resource."""
+    headers = {"content-type": "application/json", "accept": "application/json"}
+    backend = (
+        app.view_functions["versioned_resource.versioned_resource_item"]
+        .view_instance.response_handlers["application/json"]
+        .cache.backend
+    )
+
+    obj_json = json.dumps({"id": "cached", "content": "cached content"})
+    client.post("/versioned/", data=obj_json, headers=headers)
+    resource_obj = client.get("/versioned/cached", headers=headers)
+    assert resource_obj.json["content"] == "cached content"
+
+    key = "flask-resources:versioned_resource:id=cached:application/json"
+    assert backend.get(key) == b'1\n{"id":"cached","content":"cached content"}'
+
+    # Updates invalidate the cached responses
+    obj_json = json.dumps({"content": "new content"})
+    client.put("/versioned/cached", data=obj_json, headers=headers)
+    assert backend.get(key) is None
+
+    resource_obj = client.get("/versioned/cached", headers=headers)
+    assert resource_obj.json["content"] == "new content"
+    assert backend.get(key).startswith(b"2\n")
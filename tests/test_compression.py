@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Response compression test module."""
+
+import gzip
+import json
+import zlib
+
+from flask_resources.compression import Compression
+
+
+def test_encoding_negotiation():
+    compression = Compression(encodings=("gzip",))
+
+    assert compression.match_encoding("gzip, deflate") == "gzip"
+    assert compression.match_encoding("*") == "gzip"
+    assert compression.match_encoding("gzip;q=0, deflate") is None
+    assert compression.match_encoding(None) is None
+
+    compression = Compression()
+    if "br" in compression.encodings:
+        assert compression.match_encoding("gzip, br") == "br"
+        assert compression.match_encoding("gzip, br;q=0.5") == "gzip"
+
+
+def test_compression_min_size():
+    compression = Compression(encodings=("gzip",), min_size=100)
+
+    assert compression.compress(b"small", "gzip") == (b"small", None)
+    data, encoding = compression.compress(b"a" * 100, "gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(data) == b"a" * 100
+
+
+def test_compressed_item_response(client):
+    headers = {
+        "content-type": "application/json",
+        "accept": "application/json",
+        "accept-encoding": "gzip",
+    }
+    obj = {"id": "compressed", "content": "compressed content " * 10}
+    client.post("/versioned/", data=json.dumps(obj), headers=headers)
+
+    for _ in range(2):
+        resource_obj = client.get("/versioned/compressed", headers=headers)
+        assert resource_obj.headers["content-encoding"] == "gzip"
+        assert resource_obj.headers["vary"] == "Accept-Encoding"
+        assert resource_obj.headers["etag"] == '"1-gzip"'
+        assert json.loads(gzip.decompress(resource_obj.data)) == obj
+
+    # Either variant is validated
+    for etag in ('"1-gzip"', '"1"'):
+        resource_obj = client.get(
+            "/versioned/compressed", headers=dict(headers, **{"if-none-match": etag})
+        )
+        assert resource_obj.status_code == 304
+        assert resource_obj.headers["etag"] == etag
+
+    # Not accepted
+    del headers["accept-encoding"]
+    resource_obj = client.get("/versioned/compressed", headers=headers)
+    assert "content-encoding" not in resource_obj.headers
+    assert resource_obj.headers["etag"] == '"1"'
+    assert resource_obj.json == obj
+    resource_obj = client.get(
+        "/versioned/compressed", headers=dict(headers, **{"if-none-match": '"1-gzip"'})
+    )
+    assert resource_obj.status_code == 200
+
+    # The compressed variant is a precondition of the item
+    resource_obj = client.put(
+        "/versioned/compressed",
+        data=json.dumps({"content": "updated"}),
+        headers=dict(headers, **{"if-match": '"1-gzip"'}),
+    )
+    assert resource_obj.status_code == 200
+
+
+def test_compressed_stream_response(client):
+    headers = {"accept": "application/json", "accept-encoding": "gzip"}
+    resource_obj = client.get("/streamed/", headers=headers)
+    assert resource_obj.is_streamed
+    assert resource_obj.headers["content-encoding"] == "gzip"
+
+    data = zlib.decompress(resource_obj.data, 16 + zlib.MAX_WBITS)
+    assert len(json.loads(data)["hits"]) == 10
@@ -9,7 +9,7 @@
 from werkzeug.datastructures import MIMEAccept
 from werkzeug.http import parse_accept_header
 
-from flask_resources.content_negotiation import ContentNegotiator
+from flask_resources.content_negotiation import CompiledNegotiator, ContentNegotiator
 
 
 # Test content negotiation by Accept header
@@ -175,3 +175,45 @@ def test_choose_default_if_no_query_and_no_header():
     assert "application/json" == ContentNegotiator.match(
         server_mimetypes, client_mimetypes, formats_map, fmt, default="application/json"
     )
+
+
+# Test compiled negotiation
+def test_compiled_negotiator_matches_accept():
+    negotiator = CompiledNegotiator(
+        ["application/json", "application/marcxml+xml"],
+        ["application/json"],
+        formats_map={"marcxml": "application/marcxml+xml"},
+    )
+
+    assert "application/json" == negotiator.match_accept(
+        "text/plain, application/json;q=0.5, */*"
+    )
+    assert "application/marcxml+xml" == negotiator.match_accept(
+        "application/json", "marcxml"
+    )
+    # Wildcard and missing header fall back to the first served mimetype
+    assert "application/json" == negotiator.match_accept("*/*")
+    assert "application/json" == negotiator.match_accept(None)
+    assert negotiator.match_accept("text/plain") is None
+
+
+def test_compiled_negotiator_matches_content_type():
+    negotiator = CompiledNegotiator(["application/json"], ["application/json"])
+
+    assert "application/json" == negotiator.match_content_type(
+        "application/json; charset=utf-8"
+    )
+    assert "application/json" == negotiator.match_content_type(None)
+    assert negotiator.match_content_type("text/plain") is None
+
+
+def test_compiled_negotiator_caches_per_header():
+    negotiator = CompiledNegotiator(["application/json"], ["application/json"])
+
+    for _ in range(3):
+        negotiator.match_accept("application/json")
+    negotiator.match_accept("*/*")
+
+    info = negotiator.match_accept.cache_info()
+    assert info.misses == 2
+    assert info.hits == 2
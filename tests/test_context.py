@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Resource request context tests."""
+
+import json
+
+import pytest
+from flask import Flask
+
+from flask_resources.context import (
+    ResourceRequestCtx,
+    get_resource_requestctx,
+    resource_requestctx,
+)
+from flask_resources.coroutines import gather
+from flask_resources.resources import CollectionResource, ResourceConfig
+
+
+def test_resource_requestctx():
+    """Test the accessors of the resource request context."""
+    with pytest.raises(RuntimeError):
+        get_resource_requestctx()
+
+    with ResourceRequestCtx(accept_mimetype="application/json") as ctx:
+        assert get_resource_requestctx() is ctx
+        assert resource_requestctx.accept_mimetype == "application/json"
+
+        with ResourceRequestCtx() as nested_ctx:
+            assert get_resource_requestctx() is nested_ctx
+        assert get_resource_requestctx() is ctx
+
+        with pytest.raises(AttributeError):
+            ctx.unknown = True
+
+    with pytest.raises(RuntimeError):
+        resource_requestctx.accept_mimetype
+
+
+def test_resource_requestctx_propagation():
+    """Test the context in coroutines and bulk operations threads."""
+
+    class ContextResourceConfig(ResourceConfig):
+        """Context resource configuration."""
+
+        item_route = "/context/<id>"
+        list_route = "/context/"
+        bulk_route = "/context/_bulk"
+        bulk_max_workers = 2
+
+    class ContextResource(CollectionResource):
+        """Resource returning the negotiated mimetype."""
+
+        async def mimetype(self):
+            """Get the mimetype from a task."""
+            return resource_requestctx.accept_mimetype
+
+        async def search(self):
+            """Search."""
+            return 200, await gather(self.mimetype(), self.mimetype())
+
+        def bulk_read(self, id):
+            """Read an item from a bulk operation."""
+            return 200, resource_requestctx.accept_mimetype
+
+    app = Flask(__name__)
+    app.register_blueprint(
+        ContextResource(config=ContextResourceConfig).as_blueprint("context")
+    )
+    client = app.test_client()
+    headers = {"content-type": "application/json", "accept": "application/json"}
+
+    resource_obj = client.get("/context/", headers=headers)
+    assert resource_obj.json == ["application/json", "application/json"]
+
+    operations = [{"op": "read", "id": "1"}, {"op": "read", "id": "2"}]
+    resource_obj = client.post(
+        "/context/_bulk", data=json.dumps(operations), headers=headers
+    )
+    assert [result["data"] for result in resource_obj.json] == [
+        "application/json",
+        "application/json",
+    ]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Request deadlines tests."""
+
+import json
+
+import pytest
+
+from flask_resources.deadlines import DeadlinePolicy, mark_arrival
+
+HEADERS = {"content-type": "application/json", "accept": "application/json"}
+
+
+def timeout(seconds):
+    """Headers requesting a timeout."""
+    return dict(HEADERS, **{"X-Request-Timeout": str(seconds)})
+
+
+@pytest.mark.parametrize(
+    "headers,remaining",
+    [(HEADERS, 10), (timeout(2), 2), (timeout(20), 10), (timeout("invalid"), 10)],
+)
+def test_budget(client, clock, headers, remaining):
+    """Test that the budget is passed to the resource and can only be shortened."""
+    resource_obj = client.get("/deadline/?size=1", headers=headers)
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == {"remaining": remaining}
+
+
+def test_read_timeout(client, clock):
+    """Test that the reads whose deadline passed time out."""
+    resource_obj = client.get("/deadline/?size=50", headers=timeout(0.02))
+    assert resource_obj.status_code == 504
+    assert resource_obj.json["message"] == "The request deadline was exceeded."
+
+    resource_obj = client.get("/deadline/0.05", headers=timeout(0.02))
+    assert resource_obj.status_code == 504
+    resource_obj = client.get("/deadline/0.01", headers=timeout(0.02))
+    assert resource_obj.status_code == 200
+
+
+def test_write_deadline(client, clock):
+    """Test that writes are answered, but not the operations started late."""
+    resource_obj = client.post(
+        "/deadline/", data=json.dumps({"id": "1"}), headers=timeout(0.03)
+    )
+    assert resource_obj.status_code == 201
+
+    resource_obj = client.post(
+        "/deadline/_bulk",
+        data=json.dumps([{"op": "create", "data": {"id": str(i)}} for i in range(3)]),
+        headers=timeout(0.075),
+    )
+    assert resource_obj.status_code == 200
+    assert [result["status"] for result in resource_obj.json] == [201, 201, 503]
+
+
+@pytest.mark.parametrize(
+    "start,remaining",
+    [("t=1599999997.5", 7.5), ("1599999997500", 7.5), ("invalid", 10), ("t=2e9", 10)],
+)
+def test_request_start(client, clock, monkeypatch, start, remaining):
+    """Test that the deadline starts when the front-end proxy got the request."""
+    monkeypatch.setattr("flask_resources.deadlines.time", lambda: 1600000000.0)
+    headers = dict(HEADERS, **{"X-Request-Start": start})
+    resource_obj = client.get("/deadline/?size=1", headers=headers)
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == {"remaining": remaining}
+
+    headers["X-Request-Start"] = "t=1599999990"
+    assert client.get("/deadline/?size=1", headers=headers).status_code == 503
+
+
+def test_arrival(app, clock):
+    """Test that the deadline starts when the request arrived."""
+    with app.test_request_context("/deadline/"):
+        mark_arrival()
+        clock.sleep(3)
+        assert DeadlinePolicy(10).start() == 10
+
+    with app.test_request_context("/deadline/"):
+        assert DeadlinePolicy(10).start() == 13
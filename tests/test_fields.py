@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Sparse fieldsets tests."""
+
+import json
+
+from flask_resources.args.fields import parse_fields, project
+
+
+def test_parse_fields():
+    """Test the parsing of the fields query argument."""
+    assert parse_fields("id") == {"id": None}
+    assert parse_fields("id, metadata.title,metadata.creators.name") == {
+        "id": None,
+        "metadata": {"title": None, "creators": {"name": None}},
+    }
+    assert parse_fields("metadata,metadata.title") == {"metadata": None}
+    assert parse_fields(",.") is None
+
+
+def test_project():
+    """Test the projection of objects."""
+    obj = {
+        "id": "1",
+        "metadata": {"title": "Title", "creators": [{"name": "Doe", "id": "2"}]},
+    }
+    assert project(obj, None) is obj
+    assert project(obj, parse_fields("id,unknown")) == {"id": "1"}
+    assert project(obj, parse_fields("metadata.creators.name")) == {
+        "metadata": {"creators": [{"name": "Doe"}]}
+    }
+    assert project([obj, obj], {"id": None}) == [{"id": "1"}, {"id": "1"}]
+
+
+def test_sparse_fieldsets(client):
+    """Test the fields query argument on the item and list views."""
+    headers = {"content-type": "application/json", "accept": "application/json"}
+    client.post(
+        "/versioned/",
+        data=json.dumps({"id": "sparse", "content": "c"}),
+        headers=headers,
+    )
+
+    resource_obj = client.get("/versioned/sparse?fields=id", headers=headers)
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == {"id": "sparse"}
+    # The projection is neither validated against nor tagged with the ETag of
+    # the full representation
+    assert "ETag" not in resource_obj.headers
+    resource_obj = client.get(
+        "/versioned/sparse?fields=id", headers=dict(headers, **{"If-None-Match": '"1"'})
+    )
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == {"id": "sparse"}
+
+    # The projected representation is not served from (or stored in) the cache
+    resource_obj = client.get("/versioned/sparse", headers=headers)
+    assert resource_obj.json == {"id": "sparse", "content": "c"}
+    resource_obj = client.get("/versioned/sparse?fields=content", headers=headers)
+    assert resource_obj.json == {"content": "c"}
+
+    client.post(
+        "/custom/", data=json.dumps({"id": "1", "content": "c"}), headers=headers
+    )
+    resource_obj = client.get("/custom/?q=1&fields=id", headers=headers)
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == [{"id": "1"}]
+
+
+def test_item_route_variable(client):
+    """Test the fields query argument on an item route without an ``id``."""
+    headers = {"accept": "application/json"}
+    resource_obj = client.get("/pids/abc", headers=headers)
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == {"pid": "abc", "content": "c"}
+
+    resource_obj = client.get("/pids/abc?fields=pid", headers=headers)
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == {"pid": "abc"}
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Instrumentation tests."""
+
+import logging
+import socket
+
+from flask_resources.instrumentation import (
+    LoggingSink,
+    PrometheusSink,
+    StatsDSink,
+    TimingSample,
+)
+
+HEADERS = {"content-type": "application/json", "accept": "application/json"}
+
+
+def test_timings(client, timings):
+    """Test the timings of the request stages."""
+    resource_obj = client.post("/instrumented/", data='{"id": "1"}', headers=HEADERS)
+    assert resource_obj.status_code == 201
+
+    sample = timings[-1]
+    assert sample.endpoint == "instrumented_resource.instrumented_resource_list"
+    assert sample.method == "POST"
+    assert sample.status == 201
+    assert list(sample.timings) == [
+        "negotiation",
+        "parse",
+        "load",
+        "handler",
+        "serialize",
+        "response",
+        "total",
+    ]
+    assert sample.timings["response"] >= sample.timings["serialize"]
+
+
+def test_server_timing(client, timings):
+    """Test the Server-Timing header."""
+    resource_obj = client.post("/instrumented/", data='{"id": "1"}', headers=HEADERS)
+
+    server_timing = resource_obj.headers["Server-Timing"]
+    assert server_timing.startswith("negotiation;dur=")
+    assert "serialize;dur=" in server_timing
+    assert server_timing.index("serialize") < server_timing.index("response")
+
+
+def test_unsupported_mimetype_timings(client, timings):
+    """Test the timings of a request with an unsupported mimetype."""
+    resource_obj = client.get("/instrumented/", headers={"accept": "text/plain"})
+    assert resource_obj.status_code == 415
+    assert "Server-Timing" not in resource_obj.headers
+    assert timings[-1].status == 415
+    assert list(timings[-1].timings) == ["negotiation", "total"]
+
+
+def test_no_instrumentation(client):
+    """Test that no timings are recorded by default."""
+    resource_obj = client.get("/custom/", headers={"accept": "application/json"})
+    assert resource_obj.status_code == 200
+    assert "Server-Timing" not in resource_obj.headers
+
+
+def test_logging_sink(caplog):
+    """Test the logging sink."""
+    sink = LoggingSink()
+    with caplog.at_level(logging.INFO, logger="flask_resources.timings"):
+        sink.emit(TimingSample("bp.view", "GET", 200, {"total": 0.002}))
+    assert caplog.records[-1].getMessage() == "bp.view GET 200 total=2.000ms"
+
+
+def test_statsd_sink():
+    """Test the StatsD sink."""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.settimeout(1)
+    sink = StatsDSink(port=listener.getsockname()[1], prefix="app")
+
+    sink.emit(TimingSample("bp.view", "GET", 200, {"total": 0.002, "parse": 0.001}))
+    assert listener.recv(1024) == (
+        b"app.bp.view.GET.parse:1.000|ms\napp.bp.view.GET.total:2.000|ms"
+    )
+    listener.close()
+
+
+def test_prometheus_sink():
+    """Test the Prometheus sink."""
+    sink = PrometheusSink(buckets=[0.01, 0.1])
+    sink.emit(TimingSample("bp.view", "GET", 200, {"total": 0.005}))
+    sink.emit(TimingSample("bp.view", "GET", 200, {"total": 0.05}))
+
+    labels = 'endpoint="bp.view",method="GET",stage="total"'
+    lines = sink.render().splitlines()
+    assert lines[1] == "# TYPE flask_resources_stage_duration_seconds histogram"
+    assert lines[2:] == [
+        'flask_resources_stage_duration_seconds_bucket{%s,le="0.01"} 1' % labels,
+        'flask_resources_stage_duration_seconds_bucket{%s,le="0.1"} 2' % labels,
+        'flask_resources_stage_duration_seconds_bucket{%s,le="+Inf"} 2' % labels,
+        "flask_resources_stage_duration_seconds_sum{%s} 0.055" % labels,
+        "flask_resources_stage_duration_seconds_count{%s} 2" % labels,
+    ]
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""JSON backends test module."""
+
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from flask import Flask
+
+from flask_resources.ext import FlaskResources
+from flask_resources.json_backends import get_json_backend
+from flask_resources.serializers import JSONSerializer
+
+obj = {
+    "created": datetime(2020, 6, 17, 16, 21, 22, 123),
+    "date": date(2020, 6, 17),
+    "id": UUID(int=1),
+    "price": Decimal("1.10"),
+    "title": "Résumé",
+}
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "ujson", "rapidjson"])
+def test_backends_dumps_and_loads(name):
+    """Test that all the backends encode the same way."""
+    try:
+        backend = get_json_backend(name)
+    except ImportError:
+        pytest.skip("{} is not installed".format(name))
+
+    data = backend.dumps(dict(obj, nested=[{"price": Decimal("1.10")}]))
+    assert isinstance(data, bytes)
+    assert backend.loads(data) == {
+        "created": "2020-06-17T16:21:22.000123",
+        "date": "2020-06-17",
+        "id": "00000000-0000-0000-0000-000000000001",
+        "price": "1.10",
+        "title": "Résumé",
+        "nested": [{"price": "1.10"}],
+    }
+
+
+def test_backend_from_app_config():
+    """Test the backend selection with the application config."""
+    app = Flask(__name__)
+    FlaskResources(app)
+    assert app.config["FLASK_RESOURCES_JSON_BACKEND"] is None
+
+    app.config["FLASK_RESOURCES_JSON_BACKEND"] = "json"
+    with app.app_context():
+        assert get_json_backend().name == "json"
+        assert JSONSerializer().serialize_object({"a": 1}) == b'{"a":1}'
+
+
+def test_unknown_backend():
+    """Test that an unknown backend is a configuration error."""
+    app = Flask(__name__)
+    app.config["FLASK_RESOURCES_JSON_BACKEND"] = "unknown"
+    with app.app_context():
+        with pytest.raises(RuntimeError, match="FLASK_RESOURCES_JSON_BACKEND"):
+            get_json_backend()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""JSON Patch tests."""
+
+import json
+
+import pytest
+
+from flask_resources.errors import InvalidPatchRESTError, PatchConflictRESTError
+from flask_resources.loaders import JSONPatch
+from flask_resources.loaders.json_patch import json_equal, parse_pointer
+
+
+def test_parse_pointer():
+    """Test the parsing of JSON Pointers."""
+    assert parse_pointer("") == ()
+    assert parse_pointer("/a/0/") == ("a", "0", "")
+    assert parse_pointer("/a~1b/c~0d/~01") == ("a/b", "c~d", "~1")
+    for pointer in ("a", "/a~2", None):
+        with pytest.raises(ValueError):
+            parse_pointer(pointer)
+
+
+def test_invalid_patch():
+    """Test that all the invalid operations are reported."""
+    with pytest.raises(InvalidPatchRESTError):
+        JSONPatch({"op": "add"})
+
+    with pytest.raises(InvalidPatchRESTError) as error:
+        JSONPatch(
+            [
+                {"op": "add", "path": "/a", "value": 1},
+                {"op": "unknown", "path": "/a"},
+                {"op": "replace", "path": "a"},
+                {"op": "move", "from": "/a", "path": "/a/b"},
+                {"op": "remove", "path": ""},
+                "remove",
+            ]
+        )
+    assert [e["field"] for e in error.value.to_dict()["errors"]] == [
+        "/1/op",
+        "/2/value",
+        "/2/path",
+        "/3/from",
+        "/4/path",
+        "/5",
+    ]
+
+
+def test_apply():
+    """Test the application of the operations."""
+    doc = {"a": {"b": [1, 2, 3]}, "c": {"d": 1}, "e": "f"}
+    patch = JSONPatch(
+        [
+            {"op": "test", "path": "/e", "value": "f"},
+            {"op": "add", "path": "/a/b/1", "value": 4},
+            {"op": "add", "path": "/a/b/-", "value": 5},
+            {"op": "remove", "path": "/a/b/0"},
+            {"op": "replace", "path": "/e", "value": "g"},
+            {"op": "copy", "from": "/a/b", "path": "/h"},
+            {"op": "add", "path": "/h/0", "value": 6},
+            {"op": "move", "from": "/e", "path": "/i~1j"},
+        ]
+    )
+    patched = patch.apply(doc)
+    assert patched == {
+        "a": {"b": [4, 2, 3, 5]},
+        "c": {"d": 1},
+        "h": [6, 4, 2, 3, 5],
+        "i/j": "g",
+    }
+    # The document is not modified, and the untouched values are shared
+    assert doc == {"a": {"b": [1, 2, 3]}, "c": {"d": 1}, "e": "f"}
+    assert patched["c"] is doc["c"]
+
+    assert JSONPatch([{"op": "replace", "path": "", "value": 1}]).apply(doc) == 1
+
+
+def test_json_equal():
+    """Test the comparison of JSON values."""
+    assert json_equal({"a": [1, None, {"b": "c"}]}, {"a": [1.0, None, {"b": "c"}]})
+    assert not json_equal(True, 1)
+    assert not json_equal(0, False)
+    assert not json_equal([0], [False])
+    assert not json_equal({"a": 1}, {"a": True})
+    assert not json_equal({"a": 1}, {"a": 1, "b": 1})
+    assert not json_equal([1], [1, 2])
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "test", "path": "/a", "value": 2},
+        {"op": "test", "path": "/a", "value": True},
+        {"op": "test", "path": "/c", "value": [True]},
+        {"op": "replace", "path": "/b", "value": 2},
+        {"op": "remove", "path": "/c/5"},
+        {"op": "add", "path": "/c/01", "value": 2},
+        {"op": "add", "path": "/a/b", "value": 2},
+        {"op": "copy", "from": "/b", "path": "/d"},
+    ],
+)
+def test_apply_conflict(operation):
+    """Test the operations which cannot be applied."""
+    with pytest.raises(PatchConflictRESTError):
+        JSONPatch([operation]).apply({"a": 1, "c": [1]})
+
+
+def patch(client, id, operations, method="patch"):
+    """Send a JSON Patch."""
+    return getattr(client, method)(
+        "/patched/{}".format(id),
+        data=json.dumps(operations),
+        headers={
+            "content-type": "application/json-patch+json",
+            "accept": "application/json",
+        },
+    )
+
+
+def test_patch_view(client):
+    """Test a JSON Patch applied by the item view."""
+    resource_obj = patch(client, "1", [{"op": "add", "path": "/tags/-", "value": "b"}])
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == {"id": "1", "title": "Title", "tags": ["a", "b"]}
+
+
+def test_invalid_patch_view(client):
+    """Test an invalid JSON Patch sent to the item view."""
+    operations = [{"op": "add", "path": "tags"}, {"op": "nope"}]
+    resource_obj = patch(client, "2", operations)
+    assert resource_obj.status_code == 400
+    assert resource_obj.json["message"] == InvalidPatchRESTError.description
+    assert [error["field"] for error in resource_obj.json["errors"]] == [
+        "/0/value",
+        "/0/path",
+        "/1/op",
+    ]
+
+
+def test_conflicting_patch_view(client):
+    """Test a JSON Patch which cannot be applied to the item."""
+    resource_obj = patch(client, "3", [{"op": "remove", "path": "/unknown"}])
+    assert resource_obj.status_code == 409
+
+
+def test_patch_method(client):
+    """Test that patches are only accepted by PATCH requests."""
+    assert patch(client, "4", [], method="put").status_code == 415
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Payload limits tests."""
+
+import io
+import json
+
+import pytest
+
+from flask_resources.errors import InvalidPayloadRESTError
+from flask_resources.limits import check_json_structure
+
+
+def test_check_json_structure():
+    """Test the JSON structure checks."""
+    check_json_structure(b'{"a": [[1, 2], {"b": "[[[,,,"}]}', 3, 2)
+    check_json_structure(b'"escaped \\" [[[["', 1, 1)
+    check_json_structure(b"[[]]", 2, 1)
+
+    with pytest.raises(InvalidPayloadRESTError):
+        check_json_structure(b'{"a": [[1, 2]]}', max_depth=2)
+    with pytest.raises(InvalidPayloadRESTError):
+        check_json_structure(b'{"a": [1, 2, 3], "b": 1}', max_array_length=2)
+    # Object members are not array items
+    check_json_structure(b'[{"a": 1, "b": 2, "c": 3}]', max_array_length=1)
+    with pytest.raises(InvalidPayloadRESTError):
+        check_json_structure(b"[" * 100000 + b"]" * 100000, 32, 1)
+
+
+HEADERS = {"content-type": "application/json", "accept": "application/json"}
+
+
+def post_chunked(client, url, data):
+    """Post a body without a ``Content-Length`` (e.g. chunked)."""
+    return client.post(
+        url,
+        input_stream=io.BytesIO(data.encode("utf-8")),
+        headers=HEADERS,
+        environ_overrides={"CONTENT_LENGTH": "", "wsgi.input_terminated": True},
+    )
+
+
+def test_payload_within_limits(client):
+    """Test a payload within the limits."""
+    resource_obj = client.post(
+        "/bounded/", data=json.dumps({"a": [1, 2, 3]}), headers=HEADERS
+    )
+    assert resource_obj.status_code == 201
+
+
+def test_payload_too_large(client):
+    """Test a payload larger than the maximum content length."""
+    resource_obj = client.post(
+        "/bounded/", data=json.dumps({"a": "x" * 64}), headers=HEADERS
+    )
+    assert resource_obj.status_code == 413
+    assert resource_obj.json["message"] == "The request payload is too large."
+
+
+@pytest.mark.parametrize(
+    "data,message",
+    [
+        ({"a": [1, 2, 3, 4]}, "Arrays must not have more than 3 items."),
+        ({"a": [[1]]}, "The payload must not be nested deeper than 2 levels."),
+    ],
+)
+def test_json_structure_limits(client, data, message):
+    """Test payloads exceeding the JSON structure limits."""
+    resource_obj = client.post("/bounded/", data=json.dumps(data), headers=HEADERS)
+    assert resource_obj.status_code == 400
+    assert resource_obj.json["message"] == message
+
+
+@pytest.mark.parametrize("url", ["/bounded/", "/sized/"])
+def test_undeclared_content_length(client, url):
+    """Test the maximum length of a body without a ``Content-Length``."""
+    resource_obj = post_chunked(client, url, json.dumps({"a": "x" * 10000}))
+    assert resource_obj.status_code == 413
+
+    resource_obj = post_chunked(client, url, json.dumps({"a": "x"}))
+    assert resource_obj.status_code == 201
+    assert resource_obj.json == {"a": "x"}
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Loaders tests."""
+
+import pytest
+from flask import Flask
+
+from flask_resources.context import resource_requestctx
+from flask_resources.loaders import JSONLoader, NDJSONLoader
+from flask_resources.resources import CollectionResource, ResourceConfig
+
+
+class IngestResourceConfig(ResourceConfig):
+    """Ingest resource configuration."""
+
+    item_route = "/ingest/<id>"
+    list_route = "/ingest/"
+    item_request_loaders = {
+        "application/json": JSONLoader(),
+        "application/x-ndjson": NDJSONLoader(max_body_size=1024, max_item_size=32),
+    }
+
+
+class IngestResource(CollectionResource):
+    """Resource ingesting batches of items."""
+
+    def create(self):
+        """Create."""
+        ids = [item["id"] for item in resource_requestctx.data]
+        return 201, {"ids": ids}
+
+
+@pytest.fixture()
+def ingest_client():
+    """Test client of the ingest resource."""
+    app = Flask(__name__)
+    app.register_blueprint(
+        IngestResource(config=IngestResourceConfig).as_blueprint("ingest")
+    )
+    return app.test_client()
+
+
+def post(client, data):
+    """Post a NDJSON payload."""
+    return client.post(
+        "/ingest/",
+        data=data,
+        headers={"content-type": "application/x-ndjson", "accept": "application/json"},
+    )
+
+
+def test_ndjson_loader(ingest_client):
+    """Test the NDJSON loader."""
+    resource_obj = post(ingest_client, b'{"id": "1"}\n\n{"id": "2"}\n{"id": "3"}')
+    assert resource_obj.status_code == 201
+    assert resource_obj.json == {"ids": ["1", "2", "3"]}
+
+    resource_obj = post(ingest_client, b'{"id": "1"}\n{"id": \n')
+    assert resource_obj.status_code == 400
+    assert resource_obj.json == {
+        "status": 400,
+        "message": "Failed to decode JSON object on line 2.",
+    }
+
+    # Item too large
+    resource_obj = post(ingest_client, b'{"id": "1"}\n{"id": "' + b"x" * 32 + b'"}\n')
+    assert resource_obj.status_code == 413
+    assert resource_obj.json["message"] == "Item on line 2 is too large."
+
+    # Body too large
+    resource_obj = post(ingest_client, b'{"id": "1"}\n' * 100)
+    assert resource_obj.status_code == 413
+    assert resource_obj.json["message"] == "The request payload is too large."
+
+
+def test_load_request_stream():
+    """Test the default incremental loading of the JSON loader."""
+    app = Flask(__name__)
+    with app.test_request_context("/", data=b'[{"id": "1"}, {"id": "2"}]'):
+        assert list(JSONLoader().load_request_stream()) == [{"id": "1"}, {"id": "2"}]
+    with app.test_request_context("/", data=b'{"id": "1"}'):
+        assert list(JSONLoader().load_request_stream()) == [{"id": "1"}]
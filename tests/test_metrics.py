@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Metrics tests."""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+
+from flask_resources.ext import FlaskResources
+from flask_resources.metrics import CountedStream, Metrics
+from flask_resources.resources import CollectionResource, ResourceConfig
+from flask_resources.response import ListResponse
+from flask_resources.serializers import JSONSerializer
+
+
+class MeasuredResourceConfig(ResourceConfig):
+    """Measured resource configuration."""
+
+    item_route = "/measured/<id>"
+    list_route = "/measured/"
+
+
+class MeasuredResource(CollectionResource):
+    """Measured resource."""
+
+    def search(self):
+        """Search."""
+        return 200, [{"id": "1"}]
+
+
+class StreamedResourceConfig(MeasuredResourceConfig):
+    """Streamed resource configuration."""
+
+    item_route = "/streamed/<id>"
+    list_route = "/streamed/"
+    list_response_handlers = {
+        "application/json": ListResponse(JSONSerializer(), stream=True)
+    }
+
+
+def test_metrics_endpoint():
+    """Test the metrics endpoint of the extension."""
+    app = Flask(__name__)
+    app.config["FLASK_RESOURCES_METRICS_ENABLED"] = True
+    FlaskResources(app)
+    app.register_blueprint(
+        MeasuredResource(config=MeasuredResourceConfig).as_blueprint("measured")
+    )
+    app.register_blueprint(
+        MeasuredResource(config=StreamedResourceConfig).as_blueprint("streamed")
+    )
+    client = app.test_client()
+
+    resource_obj = client.get("/measured/", headers={"accept": "application/json"})
+    assert resource_obj.status_code == 200
+    size = len(resource_obj.data)
+    resource_obj = client.get("/measured/", headers={"accept": "text/plain"})
+    assert resource_obj.status_code == 415
+    resource_obj = client.get("/streamed/")
+    streamed_size = len(resource_obj.data)
+
+    resource_obj = client.get("/metrics")
+    assert resource_obj.status_code == 200
+    assert resource_obj.mimetype == "text/plain"
+    lines = resource_obj.data.decode("utf-8").splitlines()
+
+    assert "# TYPE flask_resources_requests_total counter" in lines
+    assert (
+        'flask_resources_requests_total{blueprint="measured",method="GET",status="200"}'
+        " 1" in lines
+    )
+    assert (
+        'flask_resources_requests_total{blueprint="measured",method="GET",status="415"}'
+        " 1" in lines
+    )
+    assert (
+        "flask_resources_request_duration_seconds_count"
+        '{blueprint="measured",method="GET"} 2' in lines
+    )
+    assert (
+        'flask_resources_negotiations_total{blueprint="measured",outcome="unsupported"}'
+        " 1" in lines
+    )
+    assert (
+        "flask_resources_negotiations_total"
+        '{blueprint="measured",outcome="application/json"} 1' in lines
+    )
+    assert (
+        "flask_resources_serialized_bytes_total"
+        '{blueprint="measured",mimetype="application/json"} %d' % size in lines
+    )
+    assert (
+        "flask_resources_serialized_bytes_total"
+        '{blueprint="streamed",mimetype="application/json"} %d' % streamed_size in lines
+    )
+    # The metrics endpoint itself is not measured
+    assert not [line for line in lines if "flask_resources_metrics" in line]
+
+
+def test_counted_stream():
+    """Test that a streamed body is counted once, unless never sent."""
+    sizes = []
+    stream = CountedStream(iter([b"ab", b"c"]), sizes.append)
+    assert b"".join(stream) == b"abc"
+    stream.close()
+    assert sizes == [3]
+
+    # A collected stream is not counted (the metrics lock may be held)
+    stream = CountedStream(iter([b"ab", b"c"]), sizes.append)
+    next(stream)
+    del stream
+    assert sizes == [3]
+
+
+def test_metrics_disabled():
+    """Test that the metrics endpoint is not registered by default."""
+    app = Flask(__name__)
+    ext = FlaskResources(app)
+    assert ext.metrics is None
+    assert app.test_client().get("/metrics").status_code == 404
+
+
+def test_multiprocess_metrics(tmpdir):
+    """Test the aggregation of the metrics of several processes."""
+    directory = str(tmpdir)
+    metrics = Metrics(directory=directory, flush_interval=0)
+    metrics.record_request("bp", "GET", 200, 0.01, "application/json")
+    metrics.record_size("bp", "GET", 150, "application/json")
+    assert os.path.exists(metrics.path)
+
+    # Counters dumped by another process
+    with open(os.path.join(directory, "metrics-1.json"), "w") as fp:
+        json.dump(metrics.snapshot(), fp)
+
+    metrics.record_request("bp", "GET", 200, 0.02, "application/json")
+    lines = metrics.render().splitlines()
+    assert (
+        'flask_resources_requests_total{blueprint="bp",method="GET",status="200"} 3'
+        in lines
+    )
+    assert (
+        'flask_resources_response_size_bytes_bucket{blueprint="bp",method="GET",'
+        'le="1000"} 2' in lines
+    )
+    assert (
+        "flask_resources_serialized_bytes_total"
+        '{blueprint="bp",mimetype="application/json"} 300' in lines
+    )
+
+
+def test_concurrent_flushes(tmpdir):
+    """Test that the threads of a process do not dump the metrics concurrently."""
+    metrics = Metrics(directory=str(tmpdir), flush_interval=0)
+
+    def record(i):
+        """Record a request."""
+        metrics.record_request("bp", "GET", 200, 0.01, "application/json")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(record, range(800)))
+    metrics.flush()
+
+    with open(metrics.path) as fp:
+        assert json.load(fp) == metrics.snapshot()
+    assert os.listdir(str(tmpdir)) == [os.path.basename(metrics.path)]
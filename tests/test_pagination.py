@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Pagination test module."""
+
+import pytest
+from flask import Flask
+
+from flask_resources.args.paginate import (
+    build_links,
+    build_pagination,
+    make_cursor,
+    next_cursor_link,
+)
+from flask_resources.errors import SearchPaginationRESTError
+
+
+@pytest.fixture()
+def secret_app():
+    """Application with a secret key."""
+    app_ = Flask(__name__)
+    app_.secret_key = "secret"
+    return app_
+
+
+def test_page_and_from_pagination():
+    request_args = {"size": 10, "page": 3}
+    build_pagination(request_args)
+    assert request_args["pagination"]["from_idx"] == 20
+    assert request_args["pagination"]["links"]["next"] == {"page": 4}
+
+    request_args = {"size": 10, "from": 5}
+    build_pagination(request_args)
+    assert request_args["pagination"]["from_idx"] == 4
+
+    with pytest.raises(SearchPaginationRESTError) as excinfo:
+        build_pagination({"size": 10, "page": 1, "from": 1})
+    assert {e["field"] for e in excinfo.value.get_errors()} == {"page", "from"}
+
+
+def test_cursor_pagination(secret_app):
+    with secret_app.test_request_context("/records/?q=title:a&sort=date"):
+        cursor = make_cursor([1592410882, "1234-ABCD"])
+        request_args = {"size": 10, "cursor": cursor}
+        build_pagination(request_args)
+
+        pagination = request_args["pagination"]
+        assert pagination["search_after"] == [1592410882, "1234-ABCD"]
+        assert pagination["links"]["self"] == {"cursor": cursor}
+        assert next_cursor_link([1, "a"]) != {"cursor": cursor}
+
+        # Tampered cursor
+        with pytest.raises(SearchPaginationRESTError):
+            build_pagination({"size": 10, "cursor": cursor[:-1] + "x"})
+
+        # Cursor mixed with offsets
+        with pytest.raises(SearchPaginationRESTError):
+            build_pagination({"size": 10, "cursor": cursor, "page": 2})
+
+    # Cursor replayed against another query or sort
+    for url in ("/records/?q=title:b&sort=date", "/records/?q=title:a"):
+        with secret_app.test_request_context(url):
+            with pytest.raises(SearchPaginationRESTError) as excinfo:
+                build_pagination({"size": 10, "cursor": cursor})
+            assert excinfo.value.get_errors() == [
+                {"field": "cursor", "message": "The cursor does not match the query."}
+            ]
+
+
+def test_cursor_pagination_disabled(client):
+    """Test a cursor sent to an app without a secret key."""
+    resource_obj = client.get(
+        "/custom/?cursor=abc", headers={"accept": "application/json"}
+    )
+    assert resource_obj.status_code == 400
+    assert resource_obj.json["errors"] == [
+        {"field": "cursor", "message": "Cursor pagination is not enabled."}
+    ]
+
+
+def test_pagination_links():
+    app = Flask(__name__)
+    url = "/records/?q=title:a&sort=-date&sort=id&size=10"
+
+    with app.test_request_context(url + "&page=2"):
+        request_args = {"size": 10, "page": 2}
+        build_pagination(request_args)
+        prefix = "http://localhost/records/?q=title%3Aa&sort=-date&sort=id&size=10&"
+        assert build_links(request_args) == {
+            "self": prefix + "page=2",
+            "first": prefix + "page=1",
+            "prev": prefix + "page=1",
+            "next": prefix + "page=3",
+        }
+        links = build_links(request_args, total=25)
+        assert links["last"] == prefix + "page=3"
+        assert build_links(request_args, total=20).keys() == {
+            "self",
+            "first",
+            "prev",
+            "last",
+        }
+
+    with app.test_request_context(url + "&page=1"):
+        request_args = {"size": 10, "page": 1}
+        build_pagination(request_args)
+        assert build_links(request_args, total=0).keys() == {"self", "first", "last"}
+
+    with app.test_request_context(url + "&from=11"):
+        request_args = {"size": 10, "from": 11}
+        build_pagination(request_args)
+        links = build_links(request_args, total=25)
+        assert links["prev"].endswith("&from=1")
+        assert links["next"].endswith("&from=21")
+        assert links["last"].endswith("&from=21")
+        assert "next" not in build_links(request_args, total=20)
+
+
+def test_invalid_pagination_response(client):
+    headers = {"accept": "application/json"}
+    resource_obj = client.get("/custom/?page=1&from=1", headers=headers)
+    assert resource_obj.status_code == 400
+    assert resource_obj.json["message"] == "Invalid pagination parameters."
+    assert len(resource_obj.json["errors"]) == 2
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Request parsers test module."""
+
+import pytest
+from flask import Flask
+from marshmallow.validate import Length
+from webargs.fields import Int, String
+from webargs.flaskparser import parser
+from werkzeug.exceptions import UnprocessableEntity
+
+from flask_resources.args.parsers import RequestParser, search_request_parser
+
+
+@pytest.mark.parametrize(
+    "query_string",
+    ["", "page=2&size=20", "from=5&q=title", "q=&size=1", "cursor=abc&unknown=1"],
+)
+def test_fast_path_matches_webargs(query_string):
+    app = Flask(__name__)
+    with app.test_request_context("/?" + query_string):
+        assert search_request_parser.fast_fields is not None
+        expected = parser.parse(
+            search_request_parser.schema, locations=("querystring",)
+        )
+        assert search_request_parser.fast_parse() == expected
+
+
+@pytest.mark.parametrize("query_string", ["page=0", "size=abc", "size="])
+def test_invalid_args_fall_back_to_webargs(query_string):
+    app = Flask(__name__)
+    with app.test_request_context("/?" + query_string):
+        assert search_request_parser.fast_parse() is None
+        with pytest.raises(UnprocessableEntity):
+            search_request_parser.parse()
+
+
+def test_fast_path_unsupported_fields():
+    assert (
+        RequestParser(fields={"q": String(validate=Length(max=2))}).fast_fields is None
+    )
+    assert RequestParser(fields={"n": Int()}, locations=("json",)).fast_fields is None
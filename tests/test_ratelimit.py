@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Request limits tests."""
+
+from threading import Thread
+
+from flask_resources import ratelimit
+from flask_resources.ratelimit import MemoryBackend, RedisBackend
+
+
+def test_memory_backend_token_bucket(manual_clock):
+    """Test the token buckets of the in-process backend."""
+    clock = manual_clock
+    backend = MemoryBackend(max_buckets=2, clock=clock)
+
+    assert backend.take("a", rate=1, burst=2) == 0
+    assert backend.take("a", rate=1, burst=2) == 0
+    assert backend.take("a", rate=1, burst=2) == 1
+    clock.now = 0.5
+    assert backend.take("a", rate=1, burst=2) == 0.5
+    clock.now = 1.0
+    assert backend.take("a", rate=1, burst=2) == 0
+
+    # Full buckets are pruned
+    backend.take("b", rate=1, burst=1)
+    clock.now = 10.0
+    backend.take("c", rate=1, burst=1)
+    assert set(backend._buckets) == {"c"}
+
+
+def test_memory_backend_slots():
+    """Test the concurrency slots of the in-process backend."""
+    backend = MemoryBackend()
+    assert backend.acquire("a", 2)
+    assert backend.acquire("a", 2)
+    assert not backend.acquire("a", 2)
+    backend.release("a")
+    assert backend.acquire("a", 2)
+    backend.release("a")
+    backend.release("a")
+    assert backend._slots == {}
+
+
+class FakeRedis(object):
+    """Redis client running the scripts of the Redis backend in Python."""
+
+    def __init__(self):
+        """Constructor."""
+        self.data = {}
+        self.now = 0.0
+        self.scripts = {
+            ratelimit._TAKE_SCRIPT: self.take,
+            ratelimit._ACQUIRE_SCRIPT: self.acquire,
+            ratelimit._RELEASE_SCRIPT: self.release,
+        }
+
+    def eval(self, script, numkeys, *args):
+        """Run a script, with its arguments as strings like Redis."""
+        keys = args[:numkeys]
+        argv = [str(arg) for arg in args[numkeys:]]
+        return self.scripts[script](keys, argv)
+
+    def expire(self):
+        """Expire all the keys."""
+        self.data.clear()
+
+    def take(self, keys, argv):
+        """Take tokens from a token bucket."""
+        rate, burst, cost = map(float, argv)
+        tokens, last = self.data.get(keys[0], (burst, self.now))
+        tokens = min(burst, tokens + max(0, self.now - last) * rate)
+        wait = 0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        self.data[keys[0]] = (tokens, self.now)
+        return str(wait)
+
+    def acquire(self, keys, argv):
+        """Acquire a slot."""
+        count = self.data[keys[0]] = self.data.get(keys[0], 0) + 1
+        if count > int(argv[0]):
+            self.data[keys[0]] -= 1
+            return 0
+        return 1
+
+    def release(self, keys, argv):
+        """Release a slot."""
+        count = self.data.pop(keys[0], 0)
+        if count > 1:
+            self.data[keys[0]] = count - 1
+            return count - 1
+        return 0
+
+
+def test_redis_backend():
+    """Test the Redis backend."""
+    client = FakeRedis()
+    backend = RedisBackend(client, prefix="p:")
+
+    assert backend.take("a", rate=1, burst=1) == 0
+    assert backend.take("a", rate=1, burst=1) == 1
+    client.now = 1.0
+    assert backend.take("a", rate=1, burst=1) == 0
+
+    assert backend.acquire("a", 2)
+    assert backend.acquire("a", 2)
+    assert not backend.acquire("a", 2)
+    assert client.data["p:slots:a"] == 2
+
+    # The slots expired while the requests were served
+    client.expire()
+    backend.release("a")
+    backend.release("a")
+    assert "p:slots:a" not in client.data
+    assert backend.acquire("a", 2)
+    assert backend.acquire("a", 2)
+    assert not backend.acquire("a", 2)
+
+
+class FakeRedis(object):
+    """Redis client running the scripts of the Redis backend in Python."""
+
+    def __init__(self):
+        """Constructor."""
+        self.data = {}
+        self.now = 0.0
+        self.scripts = {
+            ratelimit._TAKE_SCRIPT: self.take,
+            ratelimit._ACQUIRE_SCRIPT: self.acquire,
+            ratelimit._RELEASE_SCRIPT: self.release,
+        }
+
+    def eval(self, script, numkeys, *args):
+        """Run a script, with its arguments as strings like Redis."""
+        keys = args[:numkeys]
+        argv = [str(arg) for arg in args[numkeys:]]
+        return self.scripts[script](keys, argv)
+
+    def expire(self):
+        """Expire all the keys."""
+        self.data.clear()
+
+    def take(self, keys, argv):
+        """Take tokens from a token bucket."""
+        rate, burst, cost = map(float, argv)
+        tokens, last = self.data.get(keys[0], (burst, self.now))
+        tokens = min(burst, tokens + max(0, self.now - last) * rate)
+        wait = 0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        self.data[keys[0]] = (tokens, self.now)
+        return str(wait)
+
+    def acquire(self, keys, argv):
+        """Acquire a slot."""
+        count = self.data[keys[0]] = self.data.get(keys[0], 0) + 1
+        if count > int(argv[0]):
+            self.data[keys[0]] -= 1
+            return 0
+        return 1
+
+    def release(self, keys, argv):
+        """Release a slot."""
+        count = self.data.pop(keys[0], 0)
+        if count > 1:
+            self.data[keys[0]] = count - 1
+            return count - 1
+        return 0
+
+
+def test_redis_backend():
+    """Test the Redis backend."""
+    client = FakeRedis()
+    backend = RedisBackend(client, prefix="p:")
+
+    assert backend.take("a", rate=1, burst=1) == 0
+    assert backend.take("a", rate=1, burst=1) == 1
+    client.now = 1.0
+    assert backend.take("a", rate=1, burst=1) == 0
+
+    assert backend.acquire("a", 2)
+    assert backend.acquire("a", 2)
+    assert not backend.acquire("a", 2)
+    assert client.data["p:slots:a"] == 2
+
+    # The slots expired while the requests were served
+    client.expire()
+    backend.release("a")
+    backend.release("a")
+    assert "p:slots:a" not in client.data
+    assert backend.acquire("a", 2)
+    assert backend.acquire("a", 2)
+    assert not backend.acquire("a", 2)
+
+
+class SharedBackend(object):
+    """Local fake of a backend shared between workers."""
+
+    def __init__(self):
+        """Constructor."""
+        self.calls = []
+        self.backend = MemoryBackend()
+
+    def take(self, key, rate, burst, cost=1):
+        """Take tokens from a token bucket."""
+        self.calls.append(("take", key))
+        return self.backend.take(key, rate, burst, cost)
+
+    def acquire(self, key, limit):
+        """Acquire a slot."""
+        self.calls.append(("acquire", key))
+        return self.backend.acquire(key, limit)
+
+    def release(self, key):
+        """Release a slot."""
+        self.calls.append(("release", key))
+        self.backend.release(key)
+
+
+HEADERS = {"accept": "application/json"}
+
+
+def test_rate_limit(client, limits_backend):
+    """Test the rate limit of an action."""
+    assert client.get("/throttled/1", headers=HEADERS).status_code == 200
+    assert client.get("/throttled/2", headers=HEADERS).status_code == 200
+    resource_obj = client.get("/throttled/3", headers=HEADERS)
+    assert resource_obj.status_code == 429
+    assert resource_obj.json["message"] == "Too many requests."
+    assert int(resource_obj.headers["Retry-After"]) > 0
+
+
+def test_rate_limit_scope(client, limits_backend):
+    """Test that the rate limits are per view, action and client."""
+    client.get("/throttled/1", headers=HEADERS)
+    client.head("/throttled/1", headers=HEADERS)
+    key = "throttled_resource.throttled_resource_item:read:127.0.0.1"
+    assert limits_backend.calls == [("take", key), ("take", key)]
+
+
+def test_concurrency_limit(app, client, search_events):
+    """Test that a search in flight rejects the other searches only."""
+    searching, unblock = search_events
+
+    def search():
+        """Search in another thread."""
+        with app.test_client() as other_client:
+            other_client.get("/throttled/", headers=HEADERS)
+
+    thread = Thread(target=search)
+    thread.start()
+    try:
+        assert searching.wait(5)
+        resource_obj = client.get("/throttled/", headers=HEADERS)
+        assert resource_obj.status_code == 503
+        assert resource_obj.headers["Retry-After"] == "2"
+        assert client.delete("/throttled/1", headers=HEADERS).status_code == 405
+    finally:
+        unblock.set()
+        thread.join()
+    assert client.get("/throttled/", headers=HEADERS).status_code == 200
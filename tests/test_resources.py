@@ -70,3 +70,167 @@ def test_custom_resource(client):
 
     resource_obj_json = resource_obj.json
     assert resource_obj_json["id"] == "1234-ABCD"
+
+
+def test_content_negotiation(client):
+    """Test the negotiation of the request and response mimetypes."""
+    # Unsupported Accept header
+    resource_obj = client.get("/custom/", headers={"accept": "text/plain"})
+    assert resource_obj.status_code == 415
+
+    # Unsupported Content-Type header
+    resource_obj = client.post(
+        "/custom/", data="id,content", headers={"content-type": "text/csv"}
+    )
+    assert resource_obj.status_code == 415
+
+    # Wildcard or format query argument
+    resource_obj = client.get("/custom/", headers={"accept": "*/*"})
+    assert resource_obj.status_code == 200
+    assert resource_obj.headers["content-type"] == "application/json"
+
+    resource_obj = client.get("/custom/?format=json", headers={"accept": "text/plain"})
+    assert resource_obj.status_code == 200
+
+
+def test_compiled_dispatch(app, client):
+    """Test that the views are instantiated once and reused."""
+    view_func = app.view_functions["custom_resource.custom_resource_list"]
+    view = view_func.view_instance
+    decorated_dispatch = view.decorated_dispatch
+
+    headers = {"accept": "application/json"}
+    for _ in range(2):
+        resource_obj = client.get("/custom/", headers=headers)
+        assert resource_obj.status_code == 200
+
+    assert view_func.view_instance is view
+    assert view.decorated_dispatch is decorated_dispatch
+
+
+def test_streamed_list(client):
+    """Test a resource streaming its search results."""
+    headers = {"accept": "application/json"}
+
+    resource_obj = client.get("/streamed/", headers=headers)
+    assert resource_obj.status_code == 200
+    assert resource_obj.is_streamed
+    assert "content-length" not in resource_obj.headers
+
+    resource_obj_json = resource_obj.json
+    assert len(resource_obj_json["hits"]) == 10
+    assert resource_obj_json["hits"][-1] == {"id": "9"}
+    assert resource_obj_json["links"] == {"self": {"page": 1}}
+
+
+def test_conditional_requests(client):
+    """Test the ETag/Last-Modified headers and the conditional requests."""
+    headers = {"content-type": "application/json", "accept": "application/json"}
+    obj_json = json.dumps({"id": "1234-ABCD", "content": "versioned content"})
+    resource_obj = client.post("/versioned/", data=obj_json, headers=headers)
+    assert resource_obj.status_code == 201
+
+    resource_obj = client.get("/versioned/1234-ABCD", headers=headers)
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == {"id": "1234-ABCD", "content": "versioned content"}
+    assert resource_obj.headers["etag"] == '"1"'
+    last_modified = resource_obj.headers["last-modified"]
+    assert last_modified == "Wed, 17 Jun 2020 16:21:22 GMT"
+
+    # Not modified
+    for conditional_headers in (
+        {"if-none-match": '"1"'},
+        {"if-modified-since": last_modified},
+    ):
+        conditional_headers.update(headers)
+        resource_obj = client.get("/versioned/1234-ABCD", headers=conditional_headers)
+        assert resource_obj.status_code == 304
+        assert resource_obj.data == b""
+        assert resource_obj.headers["etag"] == '"1"'
+
+    # Modified
+    resource_obj = client.get(
+        "/versioned/1234-ABCD", headers=dict(headers, **{"if-none-match": '"0"'})
+    )
+    assert resource_obj.status_code == 200
+
+    # Preconditions
+    obj_json = json.dumps({"content": "new content"})
+    resource_obj = client.put(
+        "/versioned/1234-ABCD",
+        data=obj_json,
+        headers=dict(headers, **{"if-match": '"0"'}),
+    )
+    assert resource_obj.status_code == 412
+
+    resource_obj = client.put(
+        "/versioned/1234-ABCD",
+        data=obj_json,
+        headers=dict(headers, **{"if-match": '"1"'}),
+    )
+    assert resource_obj.status_code == 200
+    assert resource_obj.headers["etag"] == '"2"'
+
+    resource_obj = client.delete(
+        "/versioned/1234-ABCD", headers=dict(headers, **{"if-match": '"1"'})
+    )
+    assert resource_obj.status_code == 412
+    resource_obj = client.delete(
+        "/versioned/1234-ABCD", headers=dict(headers, **{"if-match": '"2"'})
+    )
+    assert resource_obj.status_code == 204
+
+
+def test_async_resource(client):
+    """Test a resource with coroutine methods fanning out queries."""
+    headers = {"accept": "application/json"}
+    resource_obj = client.get("/async/", headers=headers)
+    assert resource_obj.status_code == 200
+    assert [hit["id"] for hit in resource_obj.json["hits"]] == ["0", "1", "2", "3", "4"]
+    # The queries ran concurrently, up to the limit
+    assert resource_obj.json["concurrency"] == 5
+    resource_obj = client.get("/async/?concurrency=2", headers=headers)
+    assert resource_obj.json["concurrency"] == 2
+
+    resource_obj = client.get("/async/1", headers=headers)
+    assert resource_obj.status_code == 200
+    assert resource_obj.json == {"id": "1"}
+
+
+def test_bulk_operations(client):
+    """Test the bulk endpoint."""
+    headers = {"content-type": "application/json", "accept": "application/json"}
+    operations = [
+        {"op": "create", "data": {"id": "bulk-1", "content": "first"}},
+        {"op": "create", "data": {"id": "bulk-2", "content": "second"}},
+        {"op": "read", "id": "bulk-3"},
+        {"op": "update", "id": "bulk-1", "data": {"content": "updated"}},
+        {"op": "unknown"},
+        {"op": "delete"},
+    ]
+
+    resource_obj = client.post(
+        "/versioned/_bulk", data=json.dumps(operations), headers=headers
+    )
+    assert resource_obj.status_code == 200
+    results = resource_obj.json
+    assert results[0] == {"status": 201, "data": {"id": "bulk-1", "content": "first"}}
+    assert results[1]["status"] == 201
+    assert results[2]["status"] == 404
+    assert results[3] == {"status": 405, "message": method_not_allowed_str}
+    assert results[4]["status"] == 400
+    assert results[4]["errors"] == [{"field": "op", "message": "Unknown operation."}]
+    assert results[5]["errors"] == [
+        {"field": "id", "message": "Missing data for required field."}
+    ]
+
+    resource_obj = client.post(
+        "/versioned/_bulk",
+        data=json.dumps([{"op": "read", "id": "bulk-2"}]),
+        headers=headers,
+    )
+    assert resource_obj.json[0]["data"]["content"] == "second"
+
+    # The payload must be a list
+    resource_obj = client.post("/versioned/_bulk", data="{}", headers=headers)
+    assert resource_obj.status_code == 400
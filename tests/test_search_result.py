@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Search result tests."""
+
+import json
+
+from flask_resources.serializers import JSONSerializer, SearchResult
+
+
+def test_envelope_parts(search_counters):
+    """Test that the parts not rendered are not evaluated."""
+    total, aggregations = search_counters
+    result = SearchResult([{"id": "1"}], total=total, aggregations=aggregations)
+
+    data = json.loads(JSONSerializer(envelope=["hits"]).serialize_object_list(result))
+    assert data == {"hits": {"hits": [{"id": "1"}]}}
+    assert total.calls == 0
+    assert aggregations.calls == 0
+
+
+def test_envelope_evaluated_once(search_counters):
+    """Test that the total and aggregations are evaluated at most once."""
+    total, aggregations = search_counters
+    result = SearchResult([{"id": "1"}], total=total, aggregations=aggregations)
+
+    data = json.loads(JSONSerializer().serialize_object_list(result))
+    assert data == {
+        "hits": {"hits": [{"id": "1"}], "total": 1000},
+        "aggregations": {"type": {"buckets": []}},
+    }
+    JSONSerializer().serialize_object_list(result)
+    assert total.calls == 1
+    assert aggregations.calls == 1
+
+
+def test_sparse_fieldset_envelope(search_counters):
+    """Test that neither part is evaluated for a sparse fieldset."""
+    total, aggregations = search_counters
+    result = SearchResult([{"id": "1", "a": 1}], total=total, aggregations=aggregations)
+
+    envelope = JSONSerializer().make_envelope(result, fields={"id": None})
+    assert envelope == {"hits": {"hits": [{"id": "1"}]}}
+    assert total.calls == 0
+    assert aggregations.calls == 0
+
+
+def test_hits_response(client, search_counters):
+    """Test a search response rendering the hits and links only."""
+    total, _ = search_counters
+    resource_obj = client.get(
+        "/search/?size=1", headers={"accept": "application/vnd.hits+json"}
+    )
+    assert resource_obj.json["hits"] == {"hits": [{"id": "0", "content": "c"}]}
+    assert resource_obj.json["links"] == {
+        "self": "http://localhost/search/?size=1&page=1",
+        "first": "http://localhost/search/?size=1&page=1",
+        "next": "http://localhost/search/?size=1&page=2",
+    }
+    assert total.calls == 0
+
+
+def test_full_response(client, search_counters):
+    """Test a search response rendering the whole envelope."""
+    total, aggregations = search_counters
+    resource_obj = client.get("/search/?size=2", headers={"accept": "application/json"})
+    assert resource_obj.json["hits"]["total"] == 1000
+    assert resource_obj.json["aggregations"] == {"type": {"buckets": []}}
+    assert resource_obj.json["links"]["last"] == (
+        "http://localhost/search/?size=2&page=500"
+    )
+    assert total.calls == 1
+    assert aggregations.calls == 1
+
+
+def test_streamed_response(client, search_counters):
+    """Test a streamed search response rendering the whole envelope."""
+    total, _ = search_counters
+    resource_obj = client.get(
+        "/search/?size=2&fields=id", headers={"accept": "application/x-stream+json"}
+    )
+    assert resource_obj.json["hits"] == {"hits": [{"id": "0"}, {"id": "1"}]}
+    assert total.calls == 0
+
+    resource_obj = client.get(
+        "/search/?size=2", headers={"accept": "application/x-stream+json"}
+    )
+    assert resource_obj.json["hits"]["total"] == 1000
+    assert total.calls == 1
+
+
+def test_sparse_fieldset_response(client, search_counters):
+    """Test that a sparse fieldset request does not count the total."""
+    total, aggregations = search_counters
+    resource_obj = client.get(
+        "/search/?size=2&fields=id", headers={"accept": "application/json"}
+    )
+    assert resource_obj.json["hits"] == {"hits": [{"id": "0"}, {"id": "1"}]}
+    assert "aggregations" not in resource_obj.json
+    assert "last" not in resource_obj.json["links"]
+    assert total.calls == 0
+    assert aggregations.calls == 0
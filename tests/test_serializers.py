@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 CERN.
+#
+# Flask-Resources is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""CSV and NDJSON serializers tests."""
+
+import json
+from datetime import date
+
+from flask_resources.serializers import CSVSerializer
+
+COLUMNS = [
+    "id",
+    ("Title", "metadata.title"),
+    ("Creators", lambda obj: [c["name"] for c in obj.get("creators", [])]),
+    "public",
+    "date",
+]
+
+
+def test_csv_serializer():
+    """Test the CSV serialization of an object list."""
+    serializer = CSVSerializer(COLUMNS, batch_size=2)
+    objects = [
+        {
+            "id": str(i),
+            "metadata": {"title": 'Title, "{}"'.format(i)},
+            "creators": [{"name": "Doe"}],
+            "public": i % 2 == 0,
+            "date": date(2020, 1, i + 1),
+        }
+        for i in range(3)
+    ]
+
+    chunks = list(serializer.serialize_object_list_stream(iter(objects)))
+    assert len(chunks) == 2
+    assert b"".join(chunks).decode("utf-8").splitlines() == [
+        "id,Title,Creators,public,date",
+        '0,"Title, ""0""","[""Doe""]",true,2020-01-01',
+        '1,"Title, ""1""","[""Doe""]",false,2020-01-02',
+        '2,"Title, ""2""","[""Doe""]",true,2020-01-03',
+    ]
+
+
+def test_csv_missing_values():
+    """Test that the missing values are left empty."""
+    serializer = CSVSerializer(COLUMNS)
+    assert serializer.serialize_object({"id": "1"}).decode("utf-8").splitlines() == [
+        "id,Title,Creators,public,date",
+        "1,,[],,",
+    ]
+
+
+def test_csv_formulas():
+    """Test that the values evaluated as formulas by spreadsheets are escaped."""
+    obj = {"id": "=1+1", "metadata": {"title": "@SUM(A1)"}, "public": "-2"}
+    serializer = CSVSerializer(COLUMNS)
+    assert serializer.serialize_object(obj).decode("utf-8").splitlines()[1] == (
+        "'=1+1,'@SUM(A1),[],'-2,"
+    )
+
+    obj = {"id": "+1", "public": -1}
+    serializer = CSVSerializer(COLUMNS, escape_formulas=False)
+    assert serializer.serialize_object(obj).decode("utf-8").splitlines()[1] == (
+        "+1,,[],-1,"
+    )
+
+
+def test_csv_export(client):
+    """Test a CSV list response."""
+    resource_obj = client.get("/export/?size=3", headers={"accept": "text/csv"})
+    assert resource_obj.status_code == 200
+    assert resource_obj.content_type == "text/csv"
+    assert resource_obj.get_data(as_text=True).splitlines() == [
+        "id,title",
+        "0,T0",
+        "1,T1",
+        "2,T2",
+    ]
+
+
+def test_ndjson_export(client):
+    """Test an NDJSON list response with a sparse fieldset."""
+    resource_obj = client.get("/export/?size=2&format=ndjson&fields=id")
+    assert resource_obj.status_code == 200
+    assert resource_obj.content_type == "application/x-ndjson"
+    lines = resource_obj.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": "0"}, {"id": "1"}]